@@ -1,13 +1,20 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from .database import get_async_db
 from .models import User
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,9 +23,14 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # Security scheme
 security = HTTPBearer()
@@ -31,6 +43,82 @@ def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
 
+class PasswordHashExecutor:
+    """Bounded, dedicated thread pool for bcrypt work.
+
+    Hashing runs off the event loop and off Starlette's shared threadpool, so a
+    login storm cannot starve regular API traffic. Once ``max_pending`` jobs are
+    queued or running, new requests are rejected with 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_run_time = 0.0
+
+    def _timed(self, submitted_at: float, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                waited = started - submitted_at
+                self.completed += 1
+                self.total_queue_wait += waited
+                self.max_queue_wait = max(self.max_queue_wait, waited)
+                self.total_run_time += finished - started
+
+    async def run(self, func, *args):
+        """Run ``func(*args)`` on the hashing pool, or raise 503 when saturated."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, time.perf_counter(), func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queued": max(self._pending - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(self.total_queue_wait / self.completed * 1000, 3) if self.completed else 0.0,
+                "max_queue_wait_ms": round(self.max_queue_wait * 1000, 3),
+                "avg_hash_ms": round(self.total_run_time / self.completed * 1000, 3) if self.completed else 0.0,
+            }
+
+
+password_hasher = PasswordHashExecutor()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the dedicated hashing pool."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the dedicated hashing pool."""
+    return await password_hasher.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -53,26 +141,130 @@ def verify_token(token: str) -> Optional[str]:
     except JWTError:
         return None
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    token = credentials.credentials
+class AuthUserCache:
+    """Bounded TTL/LRU cache of user rows keyed by token subject (username).
+
+    Column values are cached rather than ORM instances; on a hit they are
+    attached to the request's session without a query, so routes can still
+    modify and commit the user as before. Credential columns are left out:
+    the password hash is never kept in memory beyond the request that loaded
+    it, and is only loaded again if a route reads it.
+    """
+
+    excluded_columns = frozenset({"hashed_password"})
+
+    def __init__(self, max_size: int = AUTH_USER_CACHE_SIZE, ttl: float = AUTH_USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user: User):
+        if self.max_size <= 0:
+            return
+        values = {
+            column.key: getattr(user, column.key)
+            for column in User.__table__.columns
+            if column.key not in self.excluded_columns
+        }
+        with self._lock:
+            self._entries[user.username] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *usernames: str):
+        with self._lock:
+            for username in usernames:
+                self._entries.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+user_cache = AuthUserCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    """Remember usernames of users changed in this transaction."""
+    changed = session.info.setdefault("auth_cache_evict", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.username)
+            changed.update(inspect(obj).attrs.username.history.deleted or ())
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    """Evict changed users once their update is visible to other sessions."""
+    changed = session.info.pop("auth_cache_evict", None)
+    if changed:
+        user_cache.invalidate(*changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("auth_cache_evict", None)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> Optional[User]:
+    """Resolve a bearer token to its user (cached), or None if it is invalid."""
     username = verify_token(token)
     if username is None:
-        raise credentials_exception
+        return None
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
+    cached = user_cache.get(username)
+    if cached is not None:
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
     
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+    if user is not None:
+        user_cache.put(user)
+    return user
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get the current authenticated user."""
+    user = await authenticate_token(credentials.credentials, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
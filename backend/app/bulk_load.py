@@ -0,0 +1,208 @@
+"""
+Bulk-insert fast path for seeding and data loading.
+
+Rows are streamed in fixed-size batches. On PostgreSQL each batch is sent
+with ``COPY FROM STDIN``; when conflicts must be handled the batch is copied
+into a temporary staging table and merged with a single
+``INSERT ... SELECT ... ON CONFLICT``. Other databases use Core ``insert()``
+executemany with the dialect's ON CONFLICT clause. Either way there is no
+per-row existence query and no ORM object per row.
+"""
+
+import io
+import os
+import time
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional, Sequence
+
+from dotenv import load_dotenv
+from sqlalchemy import column, insert, select, table as table_clause, text
+from sqlalchemy.engine import Connection
+
+load_dotenv()
+
+BULK_LOAD_BATCH_SIZE = int(os.getenv("BULK_LOAD_BATCH_SIZE", "5000"))
+
+ON_CONFLICT_MODES = ("error", "ignore", "update")
+
+
+def print_progress(label: str, rows: int, elapsed: float):
+    """Default progress reporter."""
+    rate = rows / elapsed if elapsed else 0
+    print(f"   {label}: {rows:,} rows ({rate:,.0f} rows/s)", flush=True)
+
+
+def _copy_value(value) -> str:
+    """Encode one value in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class BulkLoader:
+    """Loads iterables of row dicts into tables in batches on one connection.
+
+    The caller owns the transaction: pass a connection from ``engine.begin()``
+    (or ``session.connection()``) and commit as usual.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        batch_size: int = BULK_LOAD_BATCH_SIZE,
+        use_copy: bool = True,
+        progress: Optional[Callable[[str, int, float], None]] = print_progress,
+        progress_every: int = 100_000,
+    ):
+        self.connection = connection
+        self.batch_size = batch_size
+        # COPY needs psycopg2's copy_expert; other drivers (asyncpg) use executemany
+        self.use_copy = use_copy and connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+        self.progress = progress
+        self.progress_every = progress_every
+
+    def load(
+        self,
+        model,
+        rows: Iterable[dict],
+        on_conflict: str = "error",
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        label: Optional[str] = None,
+    ) -> int:
+        """Insert ``rows`` into ``model`` (an ORM class or Table) and return how many were sent.
+
+        ``on_conflict`` is ``"error"`` (plain insert), ``"ignore"`` (skip rows
+        that violate a unique constraint, optionally only ``conflict_columns``)
+        or ``"update"`` (upsert ``update_columns`` on ``conflict_columns``).
+        """
+        if on_conflict not in ON_CONFLICT_MODES:
+            raise ValueError(f"on_conflict must be one of {ON_CONFLICT_MODES}")
+        if on_conflict == "update" and not conflict_columns:
+            raise ValueError("on_conflict='update' requires conflict_columns")
+        table = getattr(model, "__table__", model)
+        label = label or table.name
+
+        started = time.perf_counter()
+        loaded = 0
+        next_report = self.progress_every
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._load_batch(table, batch, on_conflict, conflict_columns, update_columns)
+                loaded += len(batch)
+                batch = []
+                if self.progress and loaded >= next_report:
+                    self.progress(label, loaded, time.perf_counter() - started)
+                    next_report += self.progress_every
+        if batch:
+            self._load_batch(table, batch, on_conflict, conflict_columns, update_columns)
+            loaded += len(batch)
+        if self.progress:
+            self.progress(label, loaded, time.perf_counter() - started)
+        return loaded
+
+    def _load_batch(self, table, batch, on_conflict, conflict_columns, update_columns):
+        columns = list(batch[0].keys())
+        if self.use_copy:
+            self._copy_batch(table, batch, columns, on_conflict, conflict_columns, update_columns)
+        else:
+            stmt = self._insert_statement(table, columns, on_conflict, conflict_columns, update_columns)
+            self.connection.execute(stmt, batch)
+
+    def _dialect_insert(self, table):
+        dialect = self.connection.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"ON CONFLICT loading is not supported on {dialect}")
+        return dialect_insert(table)
+
+    def _on_conflict(self, stmt, columns, on_conflict, conflict_columns, update_columns):
+        if on_conflict == "ignore":
+            return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        update_columns = update_columns or [c for c in columns if c not in conflict_columns]
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={name: stmt.excluded[name] for name in update_columns},
+        )
+
+    def _insert_statement(self, table, columns, on_conflict, conflict_columns, update_columns):
+        if on_conflict == "error":
+            return insert(table)
+        stmt = self._dialect_insert(table)
+        return self._on_conflict(stmt, columns, on_conflict, conflict_columns, update_columns)
+
+    def _copy_rows(self, table, batch, columns):
+        """Render a batch as COPY text, applying column types and scalar defaults.
+
+        Returns the buffer and the column list it was written for.
+        """
+        defaults = {
+            c.name: c.default.arg
+            for c in table.columns
+            if c.name not in columns and c.default is not None and c.default.is_scalar
+        }
+        copy_columns = columns + list(defaults)
+        dialect = self.connection.dialect
+        processors = [table.c[name].type.bind_processor(dialect) for name in copy_columns]
+        buffer = io.StringIO()
+        for row in batch:
+            values = []
+            for name, process in zip(copy_columns, processors):
+                value = row[name] if name in row else defaults.get(name)
+                if process is not None and value is not None:
+                    value = process(value)
+                values.append(_copy_value(value))
+            buffer.write("\t".join(values))
+            buffer.write("\n")
+        buffer.seek(0)
+        return buffer, copy_columns
+
+    def _copy_batch(self, table, batch, columns, on_conflict, conflict_columns, update_columns):
+        buffer, copy_columns = self._copy_rows(table, batch, columns)
+        column_list = ", ".join(f'"{name}"' for name in copy_columns)
+        cursor = self.connection.connection.cursor()
+        try:
+            if on_conflict == "error":
+                cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN', buffer)
+                return
+
+            staging = f"_bulk_{table.name}"
+            self.connection.execute(text(
+                f'CREATE TEMP TABLE IF NOT EXISTS "{staging}" '
+                f'(LIKE "{table.name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+            ))
+            self.connection.execute(text(f'TRUNCATE "{staging}"'))
+            cursor.copy_expert(f'COPY "{staging}" ({column_list}) FROM STDIN', buffer)
+            source = table_clause(staging, *(column(name) for name in copy_columns))
+            stmt = self._dialect_insert(table).from_select(copy_columns, select(*source.c))
+            stmt = self._on_conflict(stmt, columns, on_conflict, conflict_columns, update_columns)
+            self.connection.execute(stmt)
+        finally:
+            cursor.close()
+
+
+def reset_id_sequences(connection: Connection, *models):
+    """Move PostgreSQL id sequences past explicitly inserted ids."""
+    if connection.dialect.name != "postgresql":
+        return
+    for model in models:
+        name = model.__tablename__
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {name}), 1))"
+        ))
@@ -0,0 +1,156 @@
+"""
+Durable email outbox.
+
+Notification emails are written to the ``email_outbox`` table in the same
+transaction as the task change that triggers them, so a crash or restart
+cannot lose them. A background dispatcher drains due messages in batches over
+a single SMTP connection per batch, retries failures with exponential backoff
+and dead-letters messages that keep failing.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .email_service import EMAIL_KINDS, build_email_message, smtp_client
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "30"))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "3600"))
+
+
+def enqueue_email(db: AsyncSession, kind: str, recipient: str, **context) -> EmailOutbox:
+    """Queue a notification email as part of the caller's transaction."""
+    if kind not in EMAIL_KINDS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    message = EmailOutbox(
+        kind=kind,
+        recipient=recipient,
+        payload=json.dumps(context),
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+class OutboxDispatcher:
+    """Sends pending outbox messages in batches with retry and dead-lettering."""
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        smtp_factory=smtp_client,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+    ):
+        self.session_factory = session_factory
+        self.smtp_factory = smtp_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+
+    def wake(self):
+        """Ask the dispatcher to look for new messages without waiting for the next poll."""
+        self._wakeup.set()
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        seconds = min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS)
+        return timedelta(seconds=seconds)
+
+    def _record_failure(self, message: EmailOutbox, error: Exception):
+        message.attempts += 1
+        message.last_error = str(error)[:1000]
+        if message.attempts >= self.max_attempts:
+            message.status = "dead"
+            self.dead += 1
+            logger.error(f"Email {message.id} to {message.recipient} dead-lettered after {message.attempts} attempts: {error}")
+        else:
+            message.next_attempt_at = datetime.utcnow() + self._retry_delay(message.attempts)
+            self.failed += 1
+            logger.warning(f"Email {message.id} to {message.recipient} failed (attempt {message.attempts}): {error}")
+
+    async def dispatch_once(self) -> int:
+        """Send one batch of due messages; returns how many were processed."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(EmailOutbox)
+                .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= datetime.utcnow())
+                .order_by(EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = result.scalars().all()
+            if not messages:
+                return 0
+
+            smtp = self.smtp_factory()
+            try:
+                await smtp.connect()
+            except Exception as e:
+                for message in messages:
+                    self._record_failure(message, e)
+                await db.commit()
+                return len(messages)
+
+            try:
+                for message in messages:
+                    try:
+                        email = build_email_message(message.kind, message.recipient, json.loads(message.payload))
+                        await smtp.send_message(email)
+                    except Exception as e:
+                        self._record_failure(message, e)
+                        continue
+                    message.attempts += 1
+                    message.status = "sent"
+                    message.sent_at = datetime.now(timezone.utc)
+                    self.sent += 1
+            finally:
+                try:
+                    await smtp.quit()
+                except Exception:
+                    pass
+
+            await db.commit()
+            return len(messages)
+
+    async def run(self):
+        """Drain the outbox forever, sleeping between polls when it is empty."""
+        while True:
+            try:
+                processed = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Email outbox dispatch failed: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "failed_attempts": self.failed, "dead_lettered": self.dead}
+
+
+outbox_dispatcher = OutboxDispatcher()
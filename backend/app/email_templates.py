@@ -0,0 +1,103 @@
+"""
+Precompiled notification email templates.
+
+Templates under ``templates/email`` are compiled once when the module is
+imported. The HTML layout around each message (header, call-to-action button
+and footer) is the same for every recipient, so it is rendered once per email
+kind and cached as a prefix/suffix pair; sending a notification only renders
+the small per-recipient body, subject and plain-text alternative. HTML output
+is autoescaped, so user-supplied task and project names cannot inject markup.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from markupsafe import Markup
+
+load_dotenv()
+
+TEMPLATE_DIR = Path(__file__).parent / "templates" / "email"
+FRONTEND_URL = os.getenv("FRONTEND_URL", "https://project-management-dashboard-dno2.vercel.app")
+
+_BODY_MARKER = "\x00body\x00"
+
+# Subject line and layout theme per email kind
+EMAIL_KINDS = {
+    "task_assignment": {
+        "subject": "New Task Assigned: {{ task_title }}",
+        "theme": {
+            "heading": "🎯 New Task Assignment",
+            "gradient_from": "#667eea",
+            "gradient_to": "#764ba2",
+            "accent": "#667eea",
+            "button_label": "View Task",
+        },
+    },
+    "task_update": {
+        "subject": "Task Updated: {{ task_title }}",
+        "theme": {
+            "heading": "📝 Task Update",
+            "gradient_from": "#28a745",
+            "gradient_to": "#20c997",
+            "accent": "#28a745",
+            "button_label": "View Task",
+        },
+    },
+    "task_completion": {
+        "subject": "Task Completed: {{ task_title }}",
+        "theme": {
+            "heading": "🎉 Task Completed",
+            "gradient_from": "#ffc107",
+            "gradient_to": "#fd7e14",
+            "accent": "#ffc107",
+            "button_label": "View Project",
+        },
+    },
+    "task_digest": {
+        "subject": "Task Digest: {{ summary }}",
+        "theme": {
+            "heading": "📋 Task Digest",
+            "gradient_from": "#17a2b8",
+            "gradient_to": "#6f42c1",
+            "accent": "#17a2b8",
+            "button_label": "View Tasks",
+        },
+    },
+}
+
+
+class EmailTemplates:
+    """Compiled subject, HTML and text templates for every email kind."""
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR, frontend_url: str = FRONTEND_URL):
+        loader = FileSystemLoader(str(template_dir))
+        html_env = Environment(loader=loader, autoescape=True, undefined=StrictUndefined, auto_reload=False)
+        text_env = Environment(loader=loader, autoescape=False, undefined=StrictUndefined, auto_reload=False)
+        html_env.globals["frontend_url"] = text_env.globals["frontend_url"] = frontend_url
+
+        layout = html_env.get_template("layout.html")
+        self._subjects = {}
+        self._html = {}
+        self._text = {}
+        self._layouts: Dict[str, Tuple[str, str]] = {}
+        for kind, spec in EMAIL_KINDS.items():
+            self._subjects[kind] = text_env.from_string(spec["subject"])
+            self._html[kind] = html_env.get_template(f"{kind}.html")
+            self._text[kind] = text_env.get_template(f"{kind}.txt")
+            shell = layout.render(theme=spec["theme"], body=Markup(_BODY_MARKER))
+            prefix, suffix = shell.split(_BODY_MARKER)
+            self._layouts[kind] = (prefix, suffix)
+
+    def render(self, kind: str, context: dict) -> Tuple[str, str, str]:
+        """Render ``(subject, html, text)`` for one recipient."""
+        prefix, suffix = self._layouts[kind]
+        subject = " ".join(self._subjects[kind].render(context).split())
+        html_content = prefix + self._html[kind].render(context) + suffix
+        text_content = self._text[kind].render(context)
+        return subject, html_content, text_content
+
+
+email_templates = EmailTemplates()
@@ -0,0 +1,74 @@
+"""
+Streaming CSV / NDJSON exports.
+
+Rows are read from a server-side cursor (``stream_results`` with
+``yield_per``) and written to the response one partition at a time, so
+memory use stays flat however many rows the export covers. The export opens
+its own session because the response body is produced after the endpoint
+has returned.
+"""
+
+import csv
+import enum
+import io
+import json
+import os
+from datetime import date, datetime
+from typing import AsyncIterator, Sequence
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from .database import AsyncSessionLocal
+
+load_dotenv()
+
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def stream_rows(stmt, columns: Sequence[str], format: str, session_factory=None) -> AsyncIterator[str]:
+    """Yield the rows of ``stmt`` rendered as CSV or NDJSON, one chunk per partition."""
+    async with (session_factory or AsyncSessionLocal)() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for partition in result.partitions():
+                writer.writerows([_plain(value) for value in row] for row in partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            async for partition in result.partitions():
+                yield "".join(
+                    json.dumps({name: _plain(value) for name, value in zip(columns, row)}) + "\n"
+                    for row in partition
+                )
+
+
+def export_response(stmt, columns: Sequence[str], format: str, filename: str) -> StreamingResponse:
+    """Stream ``stmt`` as a downloadable CSV or NDJSON file."""
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+    return StreamingResponse(
+        stream_rows(stmt, columns, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
@@ -0,0 +1,385 @@
+"""
+Live change events.
+
+Routes publish a small event right after each committed task, comment or
+time log change. Clients subscribe to projects and/or to their own user over
+WebSocket (``/live/ws``) or Server-Sent Events (``/live/events``) instead of
+polling. Events carry ids and the fields a board needs (status, assignee,
+hours); the full resource is one cheap ETag request away.
+
+Every client gets a bounded queue. A client that falls ``LIVE_QUEUE_SIZE``
+events behind is sent a single ``resync`` event and disconnected, so a slow
+reader never holds memory or slows down publishers; it reloads over REST and
+subscribes again.
+
+Fan-out goes through a backend. ``local`` (the default) delivers within this
+process. ``postgres`` sends every event through PostgreSQL LISTEN/NOTIFY on
+dedicated connections, so all workers see the events of all workers.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterable, Optional, Set, Tuple
+
+import orjson
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+LIVE_EVENTS_BACKEND = os.getenv("LIVE_EVENTS_BACKEND", "local").lower()
+LIVE_EVENTS_CHANNEL = os.getenv("LIVE_EVENTS_CHANNEL", "live_events")
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "100"))
+LIVE_PUBLISH_MAX_PENDING = int(os.getenv("LIVE_PUBLISH_MAX_PENDING", "10000"))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+LIVE_RECONNECT_SECONDS = float(os.getenv("LIVE_RECONNECT_SECONDS", "5"))
+
+RESYNC = {"type": "resync"}
+
+
+def live_event(
+    event_type: str,
+    project_id: Optional[int] = None,
+    user_ids: Iterable[Optional[int]] = (),
+    actor_id: Optional[int] = None,
+    **data,
+) -> dict:
+    """Build an event for ``project_id`` subscribers and the users in ``user_ids``."""
+    return {
+        "type": event_type,
+        "project_id": project_id,
+        "user_ids": sorted({user_id for user_id in user_ids if user_id is not None}),
+        "actor_id": actor_id,
+        "at": datetime.utcnow(),
+        **data,
+    }
+
+
+def task_event(
+    event_type: str,
+    task,
+    actor_id: Optional[int] = None,
+    previous_project_id: Optional[int] = None,
+    previous_assignee_id: Optional[int] = None,
+    **data,
+) -> dict:
+    """Event for a task (an ORM object or a row with the event's task columns)."""
+    if previous_project_id is not None and previous_project_id != task.project_id:
+        data["previous_project_id"] = previous_project_id
+    return live_event(
+        event_type,
+        task.project_id,
+        (task.assignee_id, previous_assignee_id),
+        actor_id,
+        task_id=task.id,
+        status=task.status,
+        assignee_id=task.assignee_id,
+        **data,
+    )
+
+
+def comment_event(
+    event_type: str,
+    comment,
+    project_id: Optional[int],
+    assignee_id: Optional[int] = None,
+) -> dict:
+    """Event for a task or project comment; the task's assignee is told too."""
+    return live_event(
+        event_type,
+        project_id,
+        (comment.user_id, assignee_id),
+        comment.user_id,
+        comment_id=comment.id,
+        task_id=comment.task_id,
+    )
+
+
+def time_log_event(
+    event_type: str,
+    time_log,
+    project_id: Optional[int],
+    assignee_id: Optional[int] = None,
+) -> dict:
+    """Event for a time log; the task's assignee is told too."""
+    return live_event(
+        event_type,
+        project_id,
+        (time_log.user_id, assignee_id),
+        time_log.user_id,
+        time_log_id=time_log.id,
+        task_id=time_log.task_id,
+        user_id=time_log.user_id,
+        hours=time_log.hours,
+        date=time_log.date,
+    )
+
+
+async def task_audience(
+    db: AsyncSession, task_id: Optional[int]
+) -> Tuple[Optional[int], Optional[int]]:
+    """(project_id, assignee_id) of a task, for events about rows of the task."""
+    if task_id is None:
+        return None, None
+    row = (
+        await db.execute(
+            select(Task.project_id, Task.assignee_id).where(Task.id == task_id)
+        )
+    ).first()
+    return (row.project_id, row.assignee_id) if row else (None, None)
+
+
+class Subscription:
+    """One client's filter and bounded event queue."""
+
+    def __init__(
+        self,
+        project_ids: Set[int],
+        user_id: Optional[int],
+        queue_size: int = LIVE_QUEUE_SIZE,
+    ):
+        self.project_ids = project_ids
+        self.user_id = user_id
+        self.queue = asyncio.Queue(
+            maxsize=queue_size + 1
+        )  # + room for the resync marker
+        self.queue_size = queue_size
+        self.lagged = False
+
+    def wants(self, event: dict) -> bool:
+        if event is RESYNC:
+            return True
+        if (
+            event.get("project_id") in self.project_ids
+            or event.get("previous_project_id") in self.project_ids
+        ):
+            return True
+        return self.user_id is not None and self.user_id in event.get("user_ids", ())
+
+    def offer(self, event: dict) -> bool:
+        """Queue ``event``; returns False once the client has fallen too far behind."""
+        if self.lagged:
+            return False
+        if event is not RESYNC and self.queue.qsize() < self.queue_size:
+            self.queue.put_nowait(event)
+            return True
+        # Drop the backlog: the client must reload anyway
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESYNC)
+        self.lagged = True
+        return False
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next event, or None when ``timeout`` passes without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBackend:
+    """Delivers events to the subscribers of this process only."""
+
+    name = "local"
+
+    def attach(self, deliver: Callable[[dict], None]):
+        self.deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def publish(self, event: dict):
+        self.deliver(event)
+
+    def stats(self) -> dict:
+        return {}
+
+
+class PostgresBackend:
+    """Fans events out to every worker through PostgreSQL LISTEN/NOTIFY.
+
+    Publishing only queues the payload; a sender task issues the NOTIFYs on
+    its own connection, and a second connection listens and hands incoming
+    events (including this worker's own) to the local subscribers. After a
+    lost connection subscribers get a ``resync``, as events may have been
+    missed meanwhile.
+    """
+
+    name = "postgres"
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = LIVE_EVENTS_CHANNEL,
+        max_pending: int = LIVE_PUBLISH_MAX_PENDING,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self._outgoing = asyncio.Queue(maxsize=max_pending)
+        self._runner = None
+        self.connected = False
+        self.dropped = 0
+        self.reconnects = 0
+
+    def attach(self, deliver: Callable[[dict], None]):
+        self.deliver = deliver
+
+    async def start(self):
+        self._runner = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+
+    def publish(self, event: dict):
+        try:
+            self._outgoing.put_nowait(orjson.dumps(event).decode())
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(
+                f"Live event dropped, {self._outgoing.qsize()} events await NOTIFY"
+            )
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.deliver(orjson.loads(payload))
+
+    async def run(self):
+        """Keep the listener and sender connections up, reconnecting after failures."""
+        while True:
+            try:
+                await self._listen_and_send()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live event backend connection lost: {e}")
+            if self.connected:
+                self.connected = False
+                self.deliver(RESYNC)
+            self.reconnects += 1
+            await asyncio.sleep(LIVE_RECONNECT_SECONDS)
+
+    async def _listen_and_send(self):
+        import asyncpg
+
+        listener = await asyncpg.connect(self.dsn)
+        try:
+            sender = await asyncpg.connect(self.dsn)
+            try:
+                await listener.add_listener(self.channel, self._on_notify)
+                self.connected = True
+                while not listener.is_closed():
+                    try:
+                        payloads = [
+                            await asyncio.wait_for(
+                                self._outgoing.get(), timeout=LIVE_HEARTBEAT_SECONDS
+                            )
+                        ]
+                    except asyncio.TimeoutError:
+                        continue
+                    while not self._outgoing.empty() and len(payloads) < 500:
+                        payloads.append(self._outgoing.get_nowait())
+                    await sender.executemany(
+                        "SELECT pg_notify($1, $2)",
+                        [(self.channel, payload) for payload in payloads],
+                    )
+            finally:
+                await sender.close()
+        finally:
+            await listener.close()
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "pending_notify": self._outgoing.qsize(),
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+
+def make_backend(name: str = LIVE_EVENTS_BACKEND):
+    """Build the fan-out backend selected by ``LIVE_EVENTS_BACKEND``."""
+    if name == "local":
+        return LocalBackend()
+    if name == "postgres":
+        from .database import DATABASE_URL
+
+        url = make_url(DATABASE_URL)
+        if url.get_backend_name() != "postgresql":
+            raise ValueError(
+                "LIVE_EVENTS_BACKEND=postgres needs a PostgreSQL DATABASE_URL"
+            )
+        return PostgresBackend(
+            url.set(drivername="postgresql").render_as_string(hide_password=False)
+        )
+    raise ValueError(f"Unknown LIVE_EVENTS_BACKEND: {name}")
+
+
+class LiveEventBroadcaster:
+    """Publishes committed changes and fans them out to subscribed clients."""
+
+    def __init__(self, backend=None, queue_size: int = LIVE_QUEUE_SIZE):
+        self.backend = backend or LocalBackend()
+        self.backend.attach(self._deliver)
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self.published = 0
+        self.delivered = 0
+        self.lagged = 0
+
+    async def start(self):
+        await self.backend.start()
+
+    async def stop(self):
+        await self.backend.stop()
+
+    def publish(self, *events: dict):
+        """Publish events; call after the change is committed."""
+        for event in events:
+            self.published += 1
+            self.backend.publish(event)
+
+    def _deliver(self, event: dict):
+        for subscription in list(self._subscriptions):
+            if subscription.wants(event):
+                if subscription.offer(event):
+                    self.delivered += 1
+                elif event is not RESYNC:
+                    self.lagged += 1
+                    self._subscriptions.discard(subscription)
+
+    @contextmanager
+    def subscribe(self, project_ids: Iterable[int] = (), user_id: Optional[int] = None):
+        """Register a client for the duration of the ``with`` block."""
+        subscription = Subscription(set(project_ids), user_id, self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "subscribers": len(self._subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "lagged_clients": self.lagged,
+            **self.backend.stats(),
+        }
+
+
+live_events = LiveEventBroadcaster(make_backend())
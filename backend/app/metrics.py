@@ -0,0 +1,155 @@
+"""
+Dashboard performance metrics.
+
+Every figure returned by ``/performance-metrics`` is computed from a fixed
+number of grouped SQL statements, so the cost of a dashboard load does not
+grow with the number of projects or tasks.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import Integer, case, cast, func, select
+from sqlalchemy.orm import Session
+
+from .models import Project, Task, TaskStatus, TimeLog, TimeLogDailyRollup
+from .time_rollups import TIME_ROLLUP_REPORTS
+
+TREND_DAYS = 7
+
+
+def _elapsed_days(db: Session, start, end):
+    """SQL expression for the (fractional) number of days between two timestamps."""
+    if db.get_bind().dialect.name == "sqlite":
+        return func.julianday(end) - func.julianday(start)
+    return func.extract("epoch", end - start) / 86400
+
+
+def _whole_days(db: Session, elapsed):
+    """Round a non-negative day interval down, like ``timedelta.days``."""
+    if db.get_bind().dialect.name == "sqlite":
+        return cast(elapsed, Integer)
+    return func.floor(elapsed)
+
+
+def _as_date(value) -> date:
+    """Normalise a ``date()`` result (a string on SQLite) to a ``date``."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def trend_window(today: date):
+    """Return the calendar days covered by the weekly trend, oldest first."""
+    return [today - timedelta(days=offset) for offset in range(TREND_DAYS - 1, -1, -1)]
+
+
+def load_metrics_snapshot(db: Session, today: Optional[date] = None) -> Dict:
+    """Load the raw aggregates behind the dashboard metrics in three queries."""
+    today = today or datetime.utcnow().date()
+    is_closed = Task.status == TaskStatus.CLOSED
+
+    # 1. Task totals, completion intervals and logged hours
+    elapsed = _elapsed_days(db, Task.created_at, Task.updated_at)
+    valid_completion = is_closed & (elapsed >= 0)
+    logged_hours = TimeLogDailyRollup.hours if TIME_ROLLUP_REPORTS else TimeLog.hours
+    total_hours = select(func.coalesce(func.sum(logged_hours), 0)).scalar_subquery()
+    totals = db.execute(
+        select(
+            func.count(Task.id),
+            func.coalesce(func.sum(case((is_closed, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((valid_completion, _whole_days(db, elapsed)), else_=0)), 0),
+            func.coalesce(func.sum(case((valid_completion, 1), else_=0)), 0),
+            total_hours,
+        )
+    ).one()
+
+    # 2. Per-project task counts
+    project_rows = db.execute(
+        select(
+            Project.id,
+            Project.title,
+            func.count(Task.id),
+            func.coalesce(func.sum(case((is_closed, 1), else_=0)), 0),
+        )
+        .select_from(Project)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .group_by(Project.id, Project.title)
+        .order_by(Project.id)
+    ).all()
+
+    # 3. Completions bucketed by calendar day
+    window_start = datetime.combine(trend_window(today)[0], time.min)
+    completion_day = func.date(Task.updated_at)
+    daily_rows = db.execute(
+        select(completion_day, func.count(Task.id))
+        .where(is_closed, Task.updated_at >= window_start)
+        .group_by(completion_day)
+    ).all()
+
+    return {
+        "total_tasks": int(totals[0]),
+        "closed_tasks": int(totals[1]),
+        "completion_days_sum": int(totals[2]),
+        "completion_count": int(totals[3]),
+        "total_logged_hours": int(totals[4]),
+        "projects": {
+            row[0]: {"title": row[1], "total_tasks": int(row[2]), "closed_tasks": int(row[3])}
+            for row in project_rows
+        },
+        "daily_completions": {_as_date(day): int(count) for day, count in daily_rows if day is not None},
+    }
+
+
+def build_performance_metrics(snapshot: Dict, today: Optional[date] = None) -> Dict:
+    """Shape raw aggregates into the ``/performance-metrics`` response."""
+    today = today or datetime.utcnow().date()
+    total_tasks = snapshot["total_tasks"]
+    closed_tasks = snapshot["closed_tasks"]
+    completion_count = snapshot["completion_count"]
+    total_logged_hours = snapshot["total_logged_hours"]
+
+    project_health = []
+    for project_id in sorted(snapshot["projects"]):
+        project = snapshot["projects"][project_id]
+        total_project_tasks = project["total_tasks"]
+        completed_project_tasks = project["closed_tasks"]
+        if total_project_tasks > 0:
+            completion_rate = round((completed_project_tasks / total_project_tasks * 100), 1)
+            health_status = "healthy" if completion_rate >= 70 else "warning" if completion_rate >= 40 else "critical"
+        else:
+            completion_rate = 0
+            health_status = "no_tasks"
+        project_health.append({
+            "project_id": project_id,
+            "project_title": project["title"],
+            "completion_rate": completion_rate,
+            "total_tasks": total_project_tasks,
+            "completed_tasks": completed_project_tasks,
+            "health_status": health_status
+        })
+
+    weekly_trends = [
+        {"day": day.strftime("%A"), "completed": snapshot["daily_completions"].get(day, 0)}
+        for day in trend_window(today)
+    ]
+
+    return {
+        "tasks_completed_this_week": sum(entry["completed"] for entry in weekly_trends),
+        "avg_completion_days": round(snapshot["completion_days_sum"] / completion_count, 1) if completion_count > 0 else 0,
+        "productivity_score": round((closed_tasks / total_tasks * 100), 1) if total_tasks > 0 else 0,
+        "project_health": project_health,
+        "total_logged_hours": total_logged_hours,
+        "avg_hours_per_task": round(total_logged_hours / total_tasks, 1) if total_tasks > 0 else 0,
+        "weekly_trends": weekly_trends,
+        "total_tasks": total_tasks,
+        "completed_tasks": closed_tasks
+    }
+
+
+def compute_performance_metrics(db: Session, today: Optional[date] = None) -> Dict:
+    """Compute the full dashboard metrics response directly from the database."""
+    today = today or datetime.utcnow().date()
+    return build_performance_metrics(load_metrics_snapshot(db, today), today)
@@ -0,0 +1,167 @@
+"""
+Incrementally maintained dashboard metrics.
+
+The store keeps the raw aggregates from ``metrics.load_metrics_snapshot`` in
+memory and applies deltas from task, project and time-log writes once they are
+committed, so ``/performance-metrics`` is served in O(projects) without
+touching the database.
+
+Each worker process keeps its own store and only sees its own writes as
+they happen. Writes made by other workers or outside the API show up at the
+next full reconcile, so a worker's figures can lag the database by up to
+``METRICS_RECONCILE_SECONDS``; if the periodic reconcile stalls, a read
+reloads the store once it is twice that old.
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from .models import TaskStatus
+from .metrics import build_performance_metrics, load_metrics_snapshot
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+METRICS_RECONCILE_SECONDS = int(os.getenv("METRICS_RECONCILE_SECONDS", "300"))
+
+# The parts of a task that feed into the dashboard metrics
+TaskState = namedtuple("TaskState", ["project_id", "status", "created_at", "updated_at"])
+
+
+def task_state(task) -> TaskState:
+    """Capture the metric-relevant fields of a task."""
+    return TaskState(task.project_id, task.status, task.created_at, task.updated_at)
+
+
+def _utc_date(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+class DashboardMetricsStore:
+    """In-memory dashboard aggregates updated in place by committed writes."""
+
+    def __init__(self, reconcile_interval: int = METRICS_RECONCILE_SECONDS):
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict] = None
+        self._loaded_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def reconcile(self, db: Session):
+        """Replace the in-memory aggregates with a fresh load from the database."""
+        snapshot = load_metrics_snapshot(db)
+        with self._lock:
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Drop the aggregates so the next read reloads them."""
+        with self._lock:
+            self._snapshot = None
+
+    def get_metrics(self, db: Session) -> Dict:
+        """Return the dashboard metrics, reloading only if never loaded or overdue."""
+        with self._lock:
+            stale = (
+                self._snapshot is None
+                or time.monotonic() - self._loaded_at > self.reconcile_interval * 2
+            )
+        if stale:
+            self.reconcile(db)
+        with self._lock:
+            snapshot = copy.deepcopy(self._snapshot)
+        return build_performance_metrics(snapshot)
+
+    # Write hooks (call after the transaction has committed)
+
+    def task_changed(self, before: Optional[TaskState], after: Optional[TaskState]):
+        """Apply a task create (before=None), update, or delete (after=None)."""
+        with self._lock:
+            if self._snapshot is None:
+                return
+            if before is not None:
+                self._apply_task(before, -1)
+            if after is not None:
+                self._apply_task(after, 1)
+
+    def project_changed(self, project_id: int, title: str):
+        """Record a created or renamed project."""
+        with self._lock:
+            if self._snapshot is None:
+                return
+            project = self._snapshot["projects"].setdefault(
+                project_id, {"title": title, "total_tasks": 0, "closed_tasks": 0}
+            )
+            project["title"] = title
+
+    def project_deleted(self, project_id: int):
+        """Drop a deleted project; its tasks are kept without one, so task totals stay."""
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot["projects"].pop(project_id, None)
+
+    def hours_logged(self, delta: int):
+        """Record a change in total logged hours."""
+        with self._lock:
+            if self._snapshot is not None and delta:
+                self._snapshot["total_logged_hours"] += delta
+
+    def _apply_task(self, state: TaskState, sign: int):
+        snapshot = self._snapshot
+        closed = state.status == TaskStatus.CLOSED
+        snapshot["total_tasks"] += sign
+        project = snapshot["projects"].get(state.project_id)
+        if project is not None:
+            project["total_tasks"] += sign
+            if closed:
+                project["closed_tasks"] += sign
+        if not closed:
+            return
+
+        snapshot["closed_tasks"] += sign
+        if state.updated_at is None:
+            return
+        if state.created_at is not None:
+            elapsed = state.updated_at - state.created_at
+            if elapsed.total_seconds() >= 0:
+                snapshot["completion_days_sum"] += sign * elapsed.days
+                snapshot["completion_count"] += sign
+
+        day = _utc_date(state.updated_at)
+        count = snapshot["daily_completions"].get(day, 0) + sign
+        if count > 0:
+            snapshot["daily_completions"][day] = count
+        else:
+            snapshot["daily_completions"].pop(day, None)
+
+    async def run_periodic_reconcile(self, session_factory):
+        """Reconcile the store from the database every ``reconcile_interval`` seconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            db = session_factory()
+            try:
+                await loop.run_in_executor(None, self.reconcile, db)
+            except Exception as e:
+                logger.error(f"Failed to reconcile dashboard metrics: {e}")
+            finally:
+                db.close()
+            await asyncio.sleep(self.reconcile_interval)
+
+
+metrics_store = DashboardMetricsStore()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import DDL, Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, Enum, Index, event, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -52,6 +52,10 @@ class Project(Base):
     tasks = relationship("Task", back_populates="project")
     comments = relationship("Comment", back_populates="project")
 
+    __table_args__ = (
+        Index("ix_projects_owner_id", "owner_id"),
+    )
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -73,6 +77,13 @@ class Task(Base):
     time_logs = relationship("TimeLog", back_populates="task")
     comments = relationship("Comment", back_populates="task")
 
+    # Board, "my tasks" and dashboard queries filter on these
+    __table_args__ = (
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_assignee_id_status", "assignee_id", "status"),
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+    )
+
 
 class TimeLog(Base):
     __tablename__ = "time_logs"
@@ -89,6 +100,11 @@ class TimeLog(Base):
     task = relationship("Task", back_populates="time_logs")
     user = relationship("User")
 
+    __table_args__ = (
+        Index("ix_time_logs_task_id_date", "task_id", "date"),
+        Index("ix_time_logs_user_id_date", "user_id", "date"),
+    )
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -103,4 +119,123 @@ class Comment(Base):
     # Relationships
     user = relationship("User")
     task = relationship("Task", back_populates="comments")
-    project = relationship("Project", back_populates="comments") 
\ No newline at end of file
+    project = relationship("Project", back_populates="comments")
+
+    # Comment threads are listed newest first per task or project
+    __table_args__ = (
+        Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+        Index("ix_comments_project_id_created_at", "project_id", "created_at"),
+    )
+
+
+class EmailOutbox(Base):
+    """Notification email queued in the same transaction as the change that caused it."""
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # task_assignment, task_update, task_completion
+    recipient = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON template context
+    status = Column(String, nullable=False, default="pending")  # pending, sent, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)  # UTC
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True))
+
+    # The dispatcher polls for due pending messages
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+
+class TimeLogDailyRollup(Base):
+    """Hours logged per user, task and day, kept in step with time_logs for reporting."""
+    __tablename__ = "time_log_daily_rollups"
+
+    # No foreign keys: rows outlive deleted tasks and projects, like their logs
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    task_id = Column(Integer)  # NULL once the task is deleted
+    project_id = Column(Integer)
+    day = Column(Date, nullable=False)
+    hours = Column(Integer, nullable=False, default=0)
+    log_count = Column(Integer, nullable=False, default=0)
+
+    # Upserts target the unique key (NULL task_id keyed as 0 so detached rows
+    # conflict too); reports filter by user, project or day
+    __table_args__ = (
+        Index(
+            "ux_time_log_daily_rollups_user_task_day",
+            user_id, func.coalesce(task_id, literal_column("0")), day,
+            unique=True,
+        ),
+        Index("ix_time_log_daily_rollups_user_id_day", "user_id", "day"),
+        Index("ix_time_log_daily_rollups_project_id_day", "project_id", "day"),
+        Index("ix_time_log_daily_rollups_day", "day"),
+    )
+
+
+# Full-text search. On PostgreSQL each searchable table has a GIN index over a
+# weighted tsvector document; on SQLite an external-content FTS5 table mirrors
+# the same columns and is kept in sync by triggers. Both are created by
+# migration 0005 and by create_all; app/search.py queries them. A SQLite batch
+# migration that recreates one of these tables must recreate its triggers.
+
+def search_vector(*weighted_columns):
+    """English tsvector over ``(column, weight)`` pairs; weight 'A' ranks highest.
+
+    Queries must build the document with this function (literals, no bind
+    parameters) so PostgreSQL can match it to the expression index.
+    """
+    document = None
+    for column, weight in weighted_columns:
+        vector = func.setweight(
+            func.to_tsvector(literal_column("'english'::regconfig"), func.coalesce(column, literal_column("''"))),
+            literal_column(f"'{weight}'"),
+        )
+        document = vector if document is None else document.op("||")(vector)
+    return document
+
+
+task_search_vector = search_vector((Task.title, "A"), (Task.description, "B"))
+project_search_vector = search_vector((Project.title, "A"), (Project.description, "B"))
+comment_search_vector = search_vector((Comment.content, "B"))
+
+for _model, _name, _vector in (
+    (Task, "ix_tasks_search", task_search_vector),
+    (Project, "ix_projects_search", project_search_vector),
+    (Comment, "ix_comments_search", comment_search_vector),
+):
+    _model.__table__.append_constraint(Index(_name, _vector, postgresql_using="gin").ddl_if(dialect="postgresql"))
+
+# table -> indexed columns of its SQLite FTS5 mirror "<table>_fts"
+SQLITE_SEARCH_COLUMNS = {
+    "tasks": ("title", "description"),
+    "projects": ("title", "description"),
+    "comments": ("content",),
+}
+
+
+def sqlite_search_ddl(table: str, columns) -> list:
+    """Statements creating ``<table>_fts`` and the triggers that keep it in sync."""
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    remove = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    add = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {add} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {remove} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {remove} {add} END",
+    ]
+
+
+for _table, _columns in SQLITE_SEARCH_COLUMNS.items():
+    for _statement in sqlite_search_ddl(_table, _columns):
+        event.listen(Base.metadata.tables[_table], "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(
+        Base.metadata.tables[_table], "before_drop", DDL(f"DROP TABLE IF EXISTS {_table}_fts").execute_if(dialect="sqlite")
+    )
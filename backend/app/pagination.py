@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints.
+
+A cursor is an opaque, URL-safe token holding the sort key values of the last
+row on a page. The next page is fetched with ``WHERE (keys) > (cursor)``, so
+it is served from the index no matter how deep it is and does not shift when
+rows are inserted. The token for the following page is returned in the
+``X-Next-Cursor`` response header; response bodies stay plain lists.
+
+Pages hold at most ``MAX_PAGE_SIZE`` rows; a larger ``limit`` is cut down to
+it rather than rejected, and the cursor leads on to the remaining rows.
+"""
+
+import base64
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode sort key values into an opaque cursor token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _matches_key(key, value) -> bool:
+    """Whether a decoded cursor value has the Python type of its key column."""
+    expected = key.type.python_type
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> list:
+    """Decode a cursor token for ``keys``, rejecting anything that was not issued by us."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not all(_matches_key(key, value) for key, value in zip(keys, values)):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
+
+
+def after_keys(keys: Sequence, values: Sequence):
+    """Build ``(k1, k2, ...) > (v1, v2, ...)`` portably as OR-ed prefixes."""
+    clauses = []
+    for position, key in enumerate(keys):
+        equal_prefix = [keys[i] == values[i] for i in range(position)]
+        clauses.append(and_(*equal_prefix, key > values[position]))
+    return or_(*clauses)
+
+
+def page_statement(stmt, keys: Sequence, cursor: Optional[str] = None, skip: int = 0, limit: int = 100):
+    """Order, position and limit ``stmt`` to one page plus the look-ahead row."""
+    limit = min(limit, MAX_PAGE_SIZE)
+    stmt = stmt.order_by(*keys)
+    if cursor:
+        stmt = stmt.where(after_keys(keys, decode_cursor(cursor, keys)))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt,
+    keys: Sequence,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    scalars: bool = True,
+):
+    """Return one page of ``stmt`` ordered by ``keys`` and set the next cursor.
+
+    ``keys`` must end with a unique column (normally the primary key). When no
+    cursor is given, ``skip`` keeps the legacy offset behaviour. Pass
+    ``scalars=False`` for column projections to get rows instead of entities.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    result = await db.execute(page_statement(stmt, keys, cursor, skip, limit))
+    rows = result.scalars().unique().all() if scalars else result.all()
+    if limit > 0 and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, key.key) for key in keys]
+        )
+    return rows
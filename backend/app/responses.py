@@ -0,0 +1,75 @@
+"""
+Fast response encoding.
+
+Every route renders through ``ORJSONResponse`` (set as the app's default
+response class). The hot list and detail endpoints go further: their ORM rows
+are validated once by a prebuilt Pydantic ``TypeAdapter`` and dumped straight
+to bytes by pydantic-core, skipping FastAPI's ``response_model`` revalidation
+and ``jsonable_encoder`` pass. Clients that send ``Accept: application/msgpack``
+get the same payload as MessagePack.
+"""
+
+from typing import Any, List
+
+import msgpack
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from .schemas.project import Project as ProjectSchema
+from .schemas.task import Task as TaskSchema
+from .schemas.user import User as UserSchema
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+# Built once: constructing a TypeAdapter compiles its validator and serializer
+task_adapter = TypeAdapter(TaskSchema)
+task_list_adapter = TypeAdapter(List[TaskSchema])
+project_adapter = TypeAdapter(ProjectSchema)
+project_list_adapter = TypeAdapter(List[ProjectSchema])
+user_list_adapter = TypeAdapter(List[UserSchema])
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Whether the client's Accept header asks for MessagePack."""
+    for entry in request.headers.get("accept", "").split(","):
+        media_type, _, params = entry.partition(";")
+        if media_type.strip().lower() in _MSGPACK_MEDIA_TYPES and _quality(params) > 0:
+            return True
+    return False
+
+
+def negotiated_media_type(request: Request) -> str:
+    """The media type ``render`` answers ``request`` with."""
+    return MSGPACK_MEDIA_TYPE if wants_msgpack(request) else "application/json"
+
+
+def render(request: Request, response: Response, adapter: TypeAdapter, value: Any) -> Response:
+    """Validate ``value`` once with ``adapter`` and encode it as JSON or MessagePack.
+
+    Headers already set on the endpoint's ``response`` (cursor, ETag) are kept.
+    """
+    validated = adapter.validate_python(value, from_attributes=True)
+    media_type = negotiated_media_type(request)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        body = msgpack.packb(adapter.dump_python(validated, mode="json"))
+    else:
+        body = adapter.dump_json(validated)
+    headers = {
+        name: header for name, header in response.headers.items()
+        if name not in ("content-length", "content-type")
+    }
+    rendered = Response(content=body, media_type=media_type, headers=headers)
+    rendered.headers.append("Vary", "Accept")
+    return rendered
@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List
-from ..database import get_db
+from ..database import get_async_db
 from ..models import Comment, User, Task, Project
 from ..schemas.task import CommentCreate, Comment as CommentSchema, CommentUpdate
 from ..auth import get_current_active_user
+from ..live_events import comment_event, live_events, task_audience
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
 @router.post("/", response_model=CommentSchema)
-def create_comment(
+async def create_comment(
     comment: CommentCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new comment on a task or project."""
     # Validate that either task_id or project_id is provided
@@ -24,19 +27,19 @@ def create_comment(
     
     # Verify task/project ownership if commenting on task
     if comment.task_id:
-        task = db.query(Task).join(Project).filter(
+        task = await db.scalar(select(Task).join(Project).where(
             Task.id == comment.task_id,
             Project.owner_id == current_user.id
-        ).first()
+        ))
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
     
     # Verify project ownership if commenting on project
     if comment.project_id:
-        project = db.query(Project).filter(
+        project = await db.scalar(select(Project).where(
             Project.id == comment.project_id,
             Project.owner_id == current_user.id
-        ).first()
+        ))
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
     
@@ -47,58 +50,61 @@ def create_comment(
         project_id=comment.project_id
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    if comment.task_id:
+        live_events.publish(comment_event("comment.created", db_comment, task.project_id, task.assignee_id))
+    else:
+        live_events.publish(comment_event("comment.created", db_comment, comment.project_id))
     
     # Fetch the comment with user information
-    db_comment_with_user = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.id == db_comment.id).first()
+    db_comment_with_user = await db.scalar(select(Comment).options(joinedload(Comment.user)).where(Comment.id == db_comment.id))
     return db_comment_with_user
 
 @router.get("/task/{task_id}", response_model=List[CommentSchema])
-def get_task_comments(
+async def get_task_comments(
     task_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all comments for a specific task."""
     # Verify task ownership
-    task = db.query(Task).join(Project).filter(
+    task = await db.scalar(select(Task).join(Project).where(
         Task.id == task_id,
         Project.owner_id == current_user.id
-    ).first()
+    ))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    comments = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.task_id == task_id).order_by(Comment.created_at.desc()).all()
-    return comments
+    result = await db.execute(select(Comment).options(joinedload(Comment.user)).where(Comment.task_id == task_id).order_by(Comment.created_at.desc()))
+    return result.scalars().all()
 
 @router.get("/project/{project_id}", response_model=List[CommentSchema])
-def get_project_comments(
+async def get_project_comments(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all comments for a specific project."""
     # Verify project ownership
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).where(
         Project.id == project_id,
         Project.owner_id == current_user.id
-    ).first()
+    ))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    comments = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.project_id == project_id).order_by(Comment.created_at.desc()).all()
-    return comments
+    result = await db.execute(select(Comment).options(joinedload(Comment.user)).where(Comment.project_id == project_id).order_by(Comment.created_at.desc()))
+    return result.scalars().all()
 
 @router.put("/{comment_id}", response_model=CommentSchema)
-def update_comment(
+async def update_comment(
     comment_id: int,
     comment_update: CommentUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a comment."""
-    db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    db_comment = await db.get(Comment, comment_id)
     if not db_comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     
@@ -107,21 +113,23 @@ def update_comment(
         raise HTTPException(status_code=403, detail="Not authorized to update this comment")
     
     db_comment.content = comment_update.content
-    db.commit()
-    db.refresh(db_comment)
+    project_id, assignee_id = await task_audience(db, db_comment.task_id)
+    await db.commit()
+    await db.refresh(db_comment)
+    live_events.publish(comment_event("comment.updated", db_comment, db_comment.project_id or project_id, assignee_id))
     
     # Fetch the comment with user information
-    db_comment_with_user = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.id == db_comment.id).first()
+    db_comment_with_user = await db.scalar(select(Comment).options(joinedload(Comment.user)).where(Comment.id == db_comment.id))
     return db_comment_with_user
 
 @router.delete("/{comment_id}")
-def delete_comment(
+async def delete_comment(
     comment_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a comment."""
-    db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    db_comment = await db.get(Comment, comment_id)
     if not db_comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     
@@ -129,6 +137,8 @@ def delete_comment(
     if db_comment.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
     
-    db.delete(db_comment)
-    db.commit()
+    project_id, assignee_id = await task_audience(db, db_comment.task_id)
+    await db.delete(db_comment)
+    await db.commit()
+    live_events.publish(comment_event("comment.deleted", db_comment, db_comment.project_id or project_id, assignee_id))
     return {"message": "Comment deleted successfully"} 
\ No newline at end of file
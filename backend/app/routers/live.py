@@ -0,0 +1,137 @@
+"""
+Live updates over Server-Sent Events (``/live/events``) and WebSocket (``/live/ws``).
+
+Clients subscribe to projects and/or to their own user and receive the events
+published by ``live_events`` after each committed change. A client that falls
+behind is sent ``resync`` and disconnected.
+"""
+
+import asyncio
+from typing import List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.websockets import WebSocket, WebSocketDisconnect
+
+from ..auth import authenticate_token
+from ..database import AsyncSessionLocal
+from ..live_events import LIVE_HEARTBEAT_SECONDS, RESYNC, Subscription, live_events
+from ..models import User
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+# Browsers' EventSource and WebSocket cannot send an Authorization header,
+# so the token may also come as ?access_token=
+optional_bearer = HTTPBearer(auto_error=False)
+
+
+async def _live_user(token: Optional[str]) -> Optional[User]:
+    """Authenticate on a short-lived session; a stream must not hold a connection."""
+    if not token:
+        return None
+    async with AsyncSessionLocal() as db:
+        user = await authenticate_token(token, db)
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+def _check_filters(project_ids: List[int], mine: bool):
+    if not project_ids and not mine:
+        raise HTTPException(
+            status_code=400,
+            detail="Subscribe to at least one project_id or to mine=true",
+        )
+
+
+async def _event_stream(request: Request, subscription: Subscription):
+    yield b"retry: 3000\n\n"
+    while True:
+        event = await subscription.next(timeout=LIVE_HEARTBEAT_SECONDS)
+        if event is None:
+            if await request.is_disconnected():
+                return
+            yield b": keepalive\n\n"
+            continue
+        yield b"data: " + orjson.dumps(event) + b"\n\n"
+        if event is RESYNC:
+            return
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    project_id: List[int] = Query(default=[]),
+    mine: bool = False,
+    access_token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+):
+    """Stream task, comment and time log events for projects and/or the user (SSE)."""
+    user = await _live_user(credentials.credentials if credentials else access_token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    _check_filters(project_id, mine)
+
+    async def stream():
+        with live_events.subscribe(
+            project_id, user.id if mine else None
+        ) as subscription:
+            async for chunk in _event_stream(request, subscription):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription):
+    while True:
+        event = await subscription.next()
+        await websocket.send_text(orjson.dumps(event).decode())
+        if event is RESYNC:
+            return
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    # Clients only listen; anything they send is ignored
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    project_id: List[int] = Query(default=[]),
+    mine: bool = False,
+    access_token: Optional[str] = None,
+):
+    """Push task, comment and time log events for projects and/or the current user."""
+    user = await _live_user(access_token)
+    if user is None or (not project_id and not mine):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    with live_events.subscribe(project_id, user.id if mine else None) as subscription:
+        sender = asyncio.create_task(_send_events(websocket, subscription))
+        receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+        done, pending = await asyncio.wait(
+            {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        try:
+            for task in done:
+                task.result()
+        except WebSocketDisconnect:
+            return
+        if sender in done:
+            await websocket.close()
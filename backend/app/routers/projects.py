@@ -1,62 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from ..database import get_async_db
 from ..models import Project, User, Task
 from ..schemas.project import ProjectCreate, Project as ProjectSchema, ProjectUpdate
 from ..schemas.task import Task as TaskSchema
 from ..auth import get_current_active_user
+from ..metrics_store import metrics_store
+from ..etags import not_modified, page_etag, row_etag
+from ..pagination import paginate
+from ..responses import project_adapter, project_list_adapter, render, task_list_adapter
+from ..time_rollups import detach_project_rollups
+from ..live_events import comment_event, live_events
+from ..task_stats import task_status_histogram
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.get("/", response_model=List[ProjectSchema])
-def get_projects(
-    skip: int = 0,
-    limit: int = 100,
+async def get_projects(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all projects in the system (globally visible)."""
-    projects = db.query(Project).offset(skip).limit(limit).all()
-    return projects
+    etag = await page_etag(db, request, select(Project), (Project.id,), cursor=cursor, skip=skip, limit=limit)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    projects = await paginate(db, select(Project), (Project.id,), response, cursor=cursor, skip=skip, limit=limit)
+    return render(request, response, project_list_adapter, projects)
 
 @router.post("/", response_model=ProjectSchema)
-def create_project(
+async def create_project(
     project: ProjectCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project."""
     db_project = Project(**project.dict(), owner_id=current_user.id)
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
+    metrics_store.project_changed(db_project.id, db_project.title)
     return db_project
 
 @router.get("/{project_id}", response_model=ProjectSchema)
-def get_project(
+async def get_project(
     project_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific project by ID (globally visible)."""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    etag = await row_etag(db, request, Project, project_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    project = await db.get(Project, project_id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return render(request, response, project_adapter, project)
 
 @router.put("/{project_id}", response_model=ProjectSchema)
-def update_project(
+async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project (only project owner can update)."""
-    db_project = db.query(Project).filter(
+    db_project = await db.scalar(select(Project).where(
         Project.id == project_id,
         Project.owner_id == current_user.id
-    ).first()
+    ))
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found or you don't have permission to update it")
     
@@ -64,146 +91,125 @@ def update_project(
     for field, value in update_data.items():
         setattr(db_project, field, value)
     
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
+    metrics_store.project_changed(db_project.id, db_project.title)
     return db_project
 
 @router.delete("/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project (only project owner can delete)."""
-    db_project = db.query(Project).filter(
+    db_project = await db.scalar(select(Project).where(
         Project.id == project_id,
         Project.owner_id == current_user.id
-    ).first()
+    ))
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found or you don't have permission to delete it")
     
-    db.delete(db_project)
-    db.commit()
+    await db.delete(db_project)
+    await detach_project_rollups(db, project_id)
+    await db.commit()
+    metrics_store.project_deleted(project_id)
     return {"message": "Project deleted successfully"}
 
 @router.get("/{project_id}/tasks", response_model=List[TaskSchema])
-def get_project_tasks(
+async def get_project_tasks(
     project_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all tasks for a specific project."""
     # Verify project ownership
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).where(
         Project.id == project_id,
         Project.owner_id == current_user.id
-    ).first()
+    ))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    tasks = db.query(Task).filter(
-        Task.project_id == project_id
-    ).offset(skip).limit(limit).all()
-    
-    return tasks
+    stmt = select(Task).where(Task.project_id == project_id)
+    tasks = await paginate(db, stmt, (Task.id,), response, cursor=cursor, skip=skip, limit=limit)
+    return render(request, response, task_list_adapter, tasks)
 
 @router.get("/{project_id}/summary")
-def get_project_summary(
+async def get_project_summary(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get project summary with task statistics."""
     # Verify project ownership
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).where(
         Project.id == project_id,
         Project.owner_id == current_user.id
-    ).first()
+    ))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get task statistics
-    total_tasks = db.query(Task).filter(Task.project_id == project_id).count()
-    todo_tasks = db.query(Task).filter(
-        Task.project_id == project_id,
-        Task.status == "todo"
-    ).count()
-    in_progress_tasks = db.query(Task).filter(
-        Task.project_id == project_id,
-        Task.status == "in_progress"
-    ).count()
-    review_tasks = db.query(Task).filter(
-        Task.project_id == project_id,
-        Task.status == "review"
-    ).count()
-    ready_to_test_tasks = db.query(Task).filter(
-        Task.project_id == project_id,
-        Task.status == "ready_to_test"
-    ).count()
-    in_test_tasks = db.query(Task).filter(
-        Task.project_id == project_id,
-        Task.status == "in_test"
-    ).count()
-    closed_tasks = db.query(Task).filter(
-        Task.project_id == project_id,
-        Task.status == "closed"
-    ).count()
-    
-    # Calculate total estimated and actual hours
-    tasks = db.query(Task).filter(Task.project_id == project_id).all()
-    total_estimated_hours = sum(task.estimated_hours or 0 for task in tasks)
-    total_actual_hours = sum(task.actual_hours or 0 for task in tasks)
+    # Get task statistics and hour totals in one grouped query
+    stats = await task_status_histogram(db, project_id=project_id)
+    counts = stats["counts"]
+    total_tasks = stats["total_tasks"]
+    closed_tasks = counts["closed"]
     
     return {
         "project_id": project_id,
         "project_title": project.title,
         "total_tasks": total_tasks,
-        "todo_tasks": todo_tasks,
-        "in_progress_tasks": in_progress_tasks,
-        "review_tasks": review_tasks,
-        "ready_to_test_tasks": ready_to_test_tasks,
-        "in_test_tasks": in_test_tasks,
+        "todo_tasks": counts["todo"],
+        "in_progress_tasks": counts["in_progress"],
+        "review_tasks": counts["review"],
+        "ready_to_test_tasks": counts["ready_to_test"],
+        "in_test_tasks": counts["in_test"],
         "closed_tasks": closed_tasks,
         "completion_percentage": round((closed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2),
-        "total_estimated_hours": total_estimated_hours,
-        "total_actual_hours": total_actual_hours
+        "total_estimated_hours": stats["total_estimated_hours"],
+        "total_actual_hours": stats["total_actual_hours"]
     }
 
 # Comment endpoints for projects
 from ..schemas.task import Comment as CommentSchema, CommentCreate as CommentCreateSchema
 
 @router.get("/{project_id}/comments", response_model=List[CommentSchema])
-def get_project_comments(
+async def get_project_comments(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all comments for a specific project (globally visible)."""
     # Verify project exists
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     from ..models import Comment
-    from sqlalchemy.orm import joinedload
     
-    comments = db.query(Comment).options(joinedload(Comment.user)).filter(
-        Comment.project_id == project_id
-    ).order_by(Comment.created_at.desc()).all()
-    return comments
+    result = await db.execute(
+        select(Comment).options(joinedload(Comment.user)).where(
+            Comment.project_id == project_id
+        ).order_by(Comment.created_at.desc())
+    )
+    return result.scalars().all()
 
 @router.post("/{project_id}/comments", response_model=CommentSchema)
-def create_project_comment(
+async def create_project_comment(
     project_id: int,
     comment_data: CommentCreateSchema,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new comment on a project (anyone can comment on any project)."""
     # Verify project exists
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -215,12 +221,11 @@ def create_project_comment(
         project_id=project_id
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    live_events.publish(comment_event("comment.created", db_comment, project_id))
     
     # Fetch the comment with user information
-    from sqlalchemy.orm import joinedload
-    db_comment_with_user = db.query(Comment).options(joinedload(Comment.user)).filter(
-        Comment.id == db_comment.id
-    ).first()
+    db_comment_with_user = await db.scalar(
+        select(Comment).options(joinedload(Comment.user)).where(Comment.id == db_comment.id)
+    )
     return db_comment_with_user 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ..database import get_async_db
+from ..models import TaskStatus, User
+from ..schemas.search import SearchHit
+from ..auth import get_current_active_user
+from ..search import SEARCH_MAX_LIMIT, search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/", response_model=List[SearchHit])
+async def search_everything(
+    q: str,
+    types: Optional[str] = None,
+    project_id: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over tasks, projects and comments (globally visible), best matches first."""
+    return await search(
+        db, q, types=types, project_id=project_id, status=status, assignee_id=assignee_id, skip=skip, limit=limit
+    )
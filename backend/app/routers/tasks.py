@@ -1,68 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Security, Request, Query
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List
-import asyncio
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Dict, List, Optional
+import os
 from datetime import datetime, timedelta
-from ..database import get_db
-from ..models import Task, User, TimeLog, Project
+from ..database import get_async_db
+from ..models import Task, User, TimeLog, Project, Comment
 from ..schemas.task import TaskCreate, Task as TaskSchema, TaskUpdate, TimeLogCreate, TimeLog as TimeLogSchema
+from ..schemas.task import TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkResult, TaskBulkResponse
 from ..auth import get_current_active_user
-from ..email_service import send_task_assignment_email, send_task_update_email, send_task_completion_email
+from ..etags import not_modified, page_etag, row_etag
+from ..pagination import paginate
+from ..responses import render, task_adapter, task_list_adapter
+from ..time_accounting import apply_time_log_changes, log_change
+from ..time_rollups import detach_task_rollups, move_task_rollups
+from ..task_stats import task_status_histogram
+from ..metrics_store import metrics_store, task_state
+from ..email_outbox import enqueue_email, outbox_dispatcher
+from ..export import export_response
+from ..live_events import comment_event, live_events, task_event, time_log_event
 
 security = HTTPBearer()
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Largest batch accepted by the bulk endpoints, and most tasks listed in one digest email
+TASK_BULK_MAX_ITEMS = int(os.getenv("TASK_BULK_MAX_ITEMS", "1000"))
+TASK_DIGEST_MAX_ITEMS = 50
+
+# Columns of the Task response schema, assignee fields included
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.estimated_hours,
+    Task.actual_hours,
+    Task.project_id,
+    Task.assignee_id,
+    Task.created_at,
+    Task.updated_at,
+    User.full_name.label("assignee_name"),
+    User.username.label("assignee_username"),
+)
+
+def _select_task_rows():
+    """Select the Task schema columns (assignee outer-joined) as plain rows, not ORM objects."""
+    return select(*TASK_COLUMNS).select_from(Task).outerjoin(User, User.id == Task.assignee_id)
+
+# Columns written by the task export
+TASK_EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.estimated_hours,
+    Task.actual_hours,
+    Task.project_id,
+    Task.assignee_id,
+    User.username.label("assignee_username"),
+    Task.created_at,
+    Task.updated_at,
+)
+
 @router.get("/", response_model=List[TaskSchema])
-def get_tasks(
-    skip: int = 0,
-    limit: int = 100,
+async def get_tasks(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     project_id: int = None,
     assignee_id: int = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all tasks in the system (globally visible)."""
-    from sqlalchemy.orm import joinedload
-    
-    query = db.query(Task).options(joinedload(Task.assignee))
+    query = _select_task_rows()
     
     # Filter by project if specified
     if project_id:
         # Check if project exists (no ownership restriction)
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await db.get(Project, project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
-        query = query.filter(Task.project_id == project_id)
+        query = query.where(Task.project_id == project_id)
     
     # Filter by assignee if specified
     if assignee_id:
-        query = query.filter(Task.assignee_id == assignee_id)
+        query = query.where(Task.assignee_id == assignee_id)
     
-    tasks = query.offset(skip).limit(limit).all()
+    etag = await page_etag(db, request, query, (Task.id,), cursor=cursor, skip=skip, limit=limit, related=[(User, "assignee_id")])
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    # Add assignee information to each task
-    for task in tasks:
-        if task.assignee:
-            task.assignee_name = task.assignee.full_name
-            task.assignee_username = task.assignee.username
-        else:
-            task.assignee_name = None
-            task.assignee_username = None
-    
-    return tasks
+    tasks = await paginate(db, query, (Task.id,), response, cursor=cursor, skip=skip, limit=limit, scalars=False)
+    return render(request, response, task_list_adapter, tasks)
 
 @router.post("/", response_model=TaskSchema)
 async def create_task(
     task: TaskCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new task in any project."""
     # Verify project exists (no ownership restriction)
-    project = db.query(Project).filter(Project.id == task.project_id).first()
+    project = await db.get(Project, task.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -73,48 +121,326 @@ async def create_task(
     
     db_task = Task(**task_data)
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
     
-    # Send email notification if task is assigned to someone other than the creator
+    # Queue email notification if task is assigned to someone other than the creator
     if db_task.assignee_id and db_task.assignee_id != current_user.id:
-        assignee = db.query(User).filter(User.id == db_task.assignee_id).first()
+        assignee = await db.get(User, db_task.assignee_id)
         if assignee and assignee.email:
-            # Send email notification asynchronously
-            asyncio.create_task(
-                send_task_assignment_email(
-                    user_email=assignee.email,
-                    user_name=assignee.full_name or assignee.username,
-                    task_title=db_task.title,
-                    project_name=project.name,
-                    assigned_by=current_user.full_name or current_user.username
-                )
+            enqueue_email(
+                db,
+                "task_assignment",
+                assignee.email,
+                user_name=assignee.full_name or assignee.username,
+                task_title=db_task.title,
+                project_name=project.title,
+                assigned_by=current_user.full_name or current_user.username
             )
     
+    await db.commit()
+    await db.refresh(db_task)
+    metrics_store.task_changed(None, task_state(db_task))
+    outbox_dispatcher.wake()
+    live_events.publish(task_event("task.created", db_task, current_user.id))
+    
     return db_task
 
+# Bulk task operations
+def _check_bulk_size(count: int):
+    if count > TASK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {TASK_BULK_MAX_ITEMS} tasks per bulk request")
+
+async def _existing_ids(db: AsyncSession, model, ids) -> set:
+    """Return which of ``ids`` exist, in one query."""
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return set((await db.scalars(select(model.id).where(model.id.in_(ids)))).all())
+
+async def _load_tasks_with_assignees(db: AsyncSession, ids) -> Dict[int, Task]:
+    """Load tasks by id with assignee display fields filled in."""
+    tasks = (await db.scalars(
+        select(Task)
+        .options(joinedload(Task.assignee))
+        .where(Task.id.in_(ids))
+        .execution_options(populate_existing=True)
+    )).unique().all()
+    for task in tasks:
+        task.assignee_name = task.assignee.full_name if task.assignee else None
+        task.assignee_username = task.assignee.username if task.assignee else None
+    return {task.id: task for task in tasks}
+
+def _describe_changes(changes: dict) -> str:
+    parts = []
+    for field, value in changes.items():
+        if field in ("title", "description"):
+            parts.append(f"Task {field.title()}")
+        elif field != "id":
+            parts.append(f"{field.replace('_', ' ').title()} to {getattr(value, 'value', value)}")
+    return ", ".join(parts) or "No changes"
+
+def _enqueue_digest(db: AsyncSession, recipient: User, summary: str, items: list, changed_by: str):
+    """Queue one email summarising a whole batch for one recipient."""
+    if not recipient.email or not items:
+        return
+    enqueue_email(
+        db,
+        "task_digest",
+        recipient.email,
+        user_name=recipient.full_name or recipient.username,
+        summary=summary,
+        changed_by=changed_by,
+        items=items[:TASK_DIGEST_MAX_ITEMS],
+        more=max(len(items) - TASK_DIGEST_MAX_ITEMS, 0)
+    )
+
+async def _enqueue_assignment_digests(db: AsyncSession, assigned: Dict[int, list], current_user: User, changed_by: str):
+    """Send each new assignee (other than the caller) one digest of their tasks."""
+    assigned.pop(current_user.id, None)
+    if not assigned:
+        return
+    assignees = (await db.scalars(select(User).where(User.id.in_(assigned.keys())))).all()
+    for assignee in assignees:
+        items = assigned[assignee.id]
+        _enqueue_digest(db, assignee, f"{len(items)} task(s) assigned to you", items, changed_by)
+
+def _bulk_response(results: List[TaskBulkResult]) -> TaskBulkResponse:
+    results.sort(key=lambda result: result.index)
+    failed = sum(1 for result in results if result.status == "error")
+    return TaskBulkResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def create_tasks_bulk(
+    batch: TaskBulkCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many tasks in one transaction; invalid items are reported, not applied."""
+    _check_bulk_size(len(batch.tasks))
+    project_ids = await _existing_ids(db, Project, (item.project_id for item in batch.tasks))
+    assignee_ids = await _existing_ids(db, User, (item.assignee_id for item in batch.tasks))
+    
+    results = []
+    rows = []
+    row_indexes = []
+    for index, item in enumerate(batch.tasks):
+        task_data = item.dict()
+        if not task_data.get('assignee_id'):
+            task_data['assignee_id'] = current_user.id
+        if item.project_id not in project_ids:
+            results.append(TaskBulkResult(index=index, status="error", error="Project not found"))
+        elif item.assignee_id and item.assignee_id not in assignee_ids:
+            results.append(TaskBulkResult(index=index, status="error", error="Assignee not found"))
+        else:
+            rows.append(task_data)
+            row_indexes.append(index)
+    
+    if rows:
+        created_ids = (await db.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        )).all()
+        tasks = await _load_tasks_with_assignees(db, created_ids)
+        project_titles = dict((await db.execute(
+            select(Project.id, Project.title).where(Project.id.in_(project_ids))
+        )).all())
+        
+        # Queue one email per assignee for the whole batch
+        changed_by = current_user.full_name or current_user.username
+        assigned = {}
+        for task_id in created_ids:
+            task = tasks[task_id]
+            assigned.setdefault(task.assignee_id, []).append({
+                "task_title": task.title,
+                "project_name": project_titles.get(task.project_id),
+                "change": "New task assigned",
+            })
+        await _enqueue_assignment_digests(db, assigned, current_user, changed_by)
+        
+        await db.commit()
+        for index, task_id in zip(row_indexes, created_ids):
+            task = tasks[task_id]
+            metrics_store.task_changed(None, task_state(task))
+            results.append(TaskBulkResult(index=index, id=task_id, status="created", task=task))
+        outbox_dispatcher.wake()
+        live_events.publish(*(task_event("task.created", tasks[task_id], current_user.id) for task_id in created_ids))
+    
+    return _bulk_response(results)
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def update_tasks_bulk(
+    batch: TaskBulkUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update many tasks in one transaction; invalid items are reported, not applied."""
+    _check_bulk_size(len(batch.tasks))
+    task_ids = {item.id for item in batch.tasks}
+    existing = {
+        row.id: row for row in (await db.execute(
+            select(Task.id, Task.title, Task.project_id, Task.assignee_id, Task.status, Task.created_at, Task.updated_at)
+            .where(Task.id.in_(task_ids))
+        )).all()
+    }
+    project_ids = await _existing_ids(db, Project, (item.project_id for item in batch.tasks))
+    assignee_ids = await _existing_ids(db, User, (item.assignee_id for item in batch.tasks))
+    
+    results = []
+    rows = []
+    row_indexes = []
+    seen = set()
+    for index, item in enumerate(batch.tasks):
+        changes = item.dict(exclude_unset=True)
+        if item.id not in existing:
+            results.append(TaskBulkResult(index=index, id=item.id, status="error", error="Task not found"))
+        elif item.id in seen:
+            results.append(TaskBulkResult(index=index, id=item.id, status="error", error="Task appears more than once in the batch"))
+        elif 'project_id' in changes and changes['project_id'] not in project_ids:
+            results.append(TaskBulkResult(index=index, id=item.id, status="error", error="Project not found"))
+        elif changes.get('assignee_id') and changes['assignee_id'] not in assignee_ids:
+            results.append(TaskBulkResult(index=index, id=item.id, status="error", error="Assignee not found"))
+        else:
+            seen.add(item.id)
+            rows.append(changes)
+            row_indexes.append(index)
+    
+    if rows:
+        # Bulk UPDATE by primary key; rows with the same set of fields share one statement
+        changed_rows = [row for row in rows if len(row) > 1]
+        if changed_rows:
+            await db.execute(update(Task), changed_rows)
+        moved = {
+            row['id']: row['project_id'] for row in rows
+            if 'project_id' in row and row['project_id'] != existing[row['id']].project_id
+        }
+        await move_task_rollups(db, moved)
+        updated_ids = [row['id'] for row in rows]
+        tasks = await _load_tasks_with_assignees(db, updated_ids)
+        project_titles = dict((await db.execute(
+            select(Project.id, Project.title).where(Project.id.in_({task.project_id for task in tasks.values()}))
+        )).all())
+        
+        # Coalesce notifications: one digest for the caller, one per new assignee
+        changed_by = current_user.full_name or current_user.username
+        changed_items = []
+        assigned = {}
+        for row in rows:
+            task = tasks[row['id']]
+            item = {
+                "task_title": task.title,
+                "project_name": project_titles.get(task.project_id),
+                "change": _describe_changes(row),
+            }
+            changed_items.append(item)
+            if 'assignee_id' in row and task.assignee_id != existing[task.id].assignee_id:
+                assigned.setdefault(task.assignee_id, []).append(dict(item, change="Task assigned to you"))
+        _enqueue_digest(db, current_user, f"{len(changed_items)} task(s) updated", changed_items, changed_by)
+        await _enqueue_assignment_digests(db, assigned, current_user, changed_by)
+        
+        await db.commit()
+        for index, row in zip(row_indexes, rows):
+            task = tasks[row['id']]
+            metrics_store.task_changed(task_state(existing[task.id]), task_state(task))
+            results.append(TaskBulkResult(index=index, id=task.id, status="updated", task=task))
+        outbox_dispatcher.wake()
+        live_events.publish(*(
+            task_event(
+                "task.updated", tasks[row['id']], current_user.id,
+                previous_project_id=existing[row['id']].project_id,
+                previous_assignee_id=existing[row['id']].assignee_id,
+                changed=[field for field in row if field != 'id'],
+            )
+            for row in rows
+        ))
+    
+    return _bulk_response(results)
+
+@router.post("/bulk/delete", response_model=TaskBulkResponse)
+async def delete_tasks_bulk(
+    batch: TaskBulkDelete,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete many tasks in one transaction (only the project owner can delete)."""
+    _check_bulk_size(len(batch.ids))
+    existing = {
+        row.id: row for row in (await db.execute(
+            select(Task.id, Task.project_id, Task.assignee_id, Task.status, Task.created_at, Task.updated_at, Project.owner_id)
+            .join(Project, Project.id == Task.project_id, isouter=True)
+            .where(Task.id.in_(batch.ids))
+        )).all()
+    }
+    
+    results = []
+    deletable = {}
+    seen = set()
+    for index, task_id in enumerate(batch.ids):
+        task = existing.get(task_id)
+        if task is None:
+            results.append(TaskBulkResult(index=index, id=task_id, status="error", error="Task not found"))
+        elif task_id in seen:
+            results.append(TaskBulkResult(index=index, id=task_id, status="error", error="Task appears more than once in the batch"))
+        elif task.owner_id != current_user.id:
+            results.append(TaskBulkResult(index=index, id=task_id, status="error", error="You don't have permission to delete this task"))
+        else:
+            deletable[index] = task_id
+            seen.add(task_id)
+    
+    if deletable:
+        ids = list(deletable.values())
+        # Detach dependent rows the same way an ORM delete would
+        await db.execute(update(TimeLog).where(TimeLog.task_id.in_(ids)).values(task_id=None))
+        await db.execute(update(Comment).where(Comment.task_id.in_(ids)).values(task_id=None))
+        await db.execute(delete(Task).where(Task.id.in_(ids)))
+        await detach_task_rollups(db, ids)
+        await db.commit()
+        for index, task_id in deletable.items():
+            metrics_store.task_changed(task_state(existing[task_id]), None)
+            results.append(TaskBulkResult(index=index, id=task_id, status="deleted"))
+        live_events.publish(*(task_event("task.deleted", existing[task_id], current_user.id) for task_id in ids))
+    
+    return _bulk_response(results)
+
+@router.get("/export")
+async def export_tasks(
+    format: str = "csv",
+    project_id: int = None,
+    assignee_id: int = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream tasks as CSV or NDJSON (same filters as the list endpoint)."""
+    query = select(*TASK_EXPORT_COLUMNS).select_from(Task).outerjoin(User, User.id == Task.assignee_id)
+    
+    if project_id:
+        project = await db.get(Project, project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        query = query.where(Task.project_id == project_id)
+    if assignee_id:
+        query = query.where(Task.assignee_id == assignee_id)
+    
+    return export_response(query.order_by(Task.id), [column.key for column in TASK_EXPORT_COLUMNS], format, "tasks")
+
 @router.get("/{task_id}", response_model=TaskSchema)
-def get_task(
+async def get_task(
     task_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific task by ID (globally visible)."""
-    from sqlalchemy.orm import joinedload
+    etag = await row_etag(db, request, Task, task_id, related=[(User, Task.assignee_id)])
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    task = db.query(Task).options(joinedload(Task.assignee)).filter(Task.id == task_id).first()
+    task = (await db.execute(_select_task_rows().where(Task.id == task_id))).first()
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Add assignee information
-    if task.assignee:
-        task.assignee_name = task.assignee.full_name
-        task.assignee_username = task.assignee.username
-    else:
-        task.assignee_name = None
-        task.assignee_username = None
-    
-    return task
+    return render(request, response, task_adapter, task)
 
 @router.post("/test-update", response_model=dict)
 def test_task_update(
@@ -137,16 +463,16 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a task (project owner or task assignee can update)."""
     try:
-        db_task = db.query(Task).filter(Task.id == task_id).first()
+        db_task = await db.get(Task, task_id)
         if db_task is None:
             raise HTTPException(status_code=404, detail="Task not found")
         
         # Check if user can update this task (project owner or task assignee)
-        project = db.query(Project).filter(Project.id == db_task.project_id).first()
+        project = await db.get(Project, db_task.project_id)
         can_update = (project.owner_id == current_user.id or db_task.assignee_id == current_user.id)
         
         # For global visibility, allow anyone to update tasks
@@ -159,6 +485,7 @@ async def update_task(
         # Store old values for comparison
         old_assignee_id = db_task.assignee_id
         old_status = db_task.status
+        old_state = task_state(db_task)
         
         update_data = task_update.dict(exclude_unset=True)
         
@@ -169,11 +496,8 @@ async def update_task(
             if hasattr(db_task, field):
                 setattr(db_task, field, value)
         
-        db.commit()
-        db.refresh(db_task)
-        
-        # Send email notifications for different update types
-        # Send email to the logged-in user for all updates
+        # Queue email notifications for different update types; they are
+        # committed together with the task change
         
         if current_user.email:
             # Determine update type based on what actually changed
@@ -184,15 +508,15 @@ async def update_task(
             if 'status' in update_data:
                 if db_task.status == "completed":
                     update_type = "Task Completed"
-                    # Send completion email
-                    asyncio.create_task(
-                        send_task_completion_email(
-                            user_email=current_user.email,
-                            user_name=current_user.full_name or current_user.username,
-                            task_title=db_task.title,
-                            project_name=project.title,
-                            completed_by=current_user.full_name or current_user.username
-                        )
+                    # Queue completion email
+                    enqueue_email(
+                        db,
+                        "task_completion",
+                        current_user.email,
+                        user_name=current_user.full_name or current_user.username,
+                        task_title=db_task.title,
+                        project_name=project.title,
+                        completed_by=current_user.full_name or current_user.username
                     )
                 else:
                     changed_fields.append(f"Status to {db_task.status}")
@@ -214,15 +538,15 @@ async def update_task(
             
             if 'assignee_id' in update_data and old_assignee_id != db_task.assignee_id:
                 update_type = "Task Reassigned"
-                # Send assignment email to new assignee
-                asyncio.create_task(
-                    send_task_assignment_email(
-                        user_email=current_user.email,
-                        user_name=current_user.full_name or current_user.username,
-                        task_title=db_task.title,
-                        project_name=project.title,
-                        assigned_by=current_user.full_name or current_user.username
-                    )
+                # Queue assignment email to new assignee
+                enqueue_email(
+                    db,
+                    "task_assignment",
+                    current_user.email,
+                    user_name=current_user.full_name or current_user.username,
+                    task_title=db_task.title,
+                    project_name=project.title,
+                    assigned_by=current_user.full_name or current_user.username
                 )
             
             # Create update type from all changed fields
@@ -232,20 +556,32 @@ async def update_task(
                 else:
                     update_type = f"Multiple fields updated: {', '.join(changed_fields)}"
             
-            # Send general update email for all other cases
+            # Queue general update email for all other cases
             if update_type != "Task Completed" and update_type != "Task Reassigned":
-
-                email_task = asyncio.create_task(
-                    send_task_update_email(
-                        user_email=current_user.email,
-                        user_name=current_user.full_name or current_user.username,
-                        task_title=db_task.title,
-                        project_name=project.title,
-                        update_type=update_type,
-                        updated_by=current_user.full_name or current_user.username
-                    )
+                enqueue_email(
+                    db,
+                    "task_update",
+                    current_user.email,
+                    user_name=current_user.full_name or current_user.username,
+                    task_title=db_task.title,
+                    project_name=project.title,
+                    update_type=update_type,
+                    updated_by=current_user.full_name or current_user.username
                 )
-
+        
+        if db_task.project_id != old_state.project_id:
+            await move_task_rollups(db, {db_task.id: db_task.project_id})
+        
+        await db.commit()
+        await db.refresh(db_task)
+        metrics_store.task_changed(old_state, task_state(db_task))
+        outbox_dispatcher.wake()
+        live_events.publish(task_event(
+            "task.updated", db_task, current_user.id,
+            previous_project_id=old_state.project_id,
+            previous_assignee_id=old_assignee_id,
+            changed=list(update_data),
+        ))
         
         return db_task
     except Exception as e:
@@ -255,81 +591,72 @@ async def update_task(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.delete("/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a task (only project owner can delete)."""
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    db_task = await db.get(Task, task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check if user can delete this task (only project owner)
-    project = db.query(Project).filter(Project.id == db_task.project_id).first()
+    project = await db.get(Project, db_task.project_id)
     if project.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="You don't have permission to delete this task")
     
-    db.delete(db_task)
-    db.commit()
+    old_state = task_state(db_task)
+    deleted = task_event("task.deleted", db_task, current_user.id)
+    await db.delete(db_task)
+    await detach_task_rollups(db, [task_id])
+    await db.commit()
+    metrics_store.task_changed(old_state, None)
+    live_events.publish(deleted)
     return {"message": "Task deleted successfully"}
 
 @router.get("/my-tasks", response_model=List[TaskSchema])
-def get_my_tasks(
-    skip: int = 0,
-    limit: int = 100,
+async def get_my_tasks(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all tasks assigned to the current user."""
-    tasks = db.query(Task).filter(
-        Task.assignee_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return tasks
+    query = select(Task).where(Task.assignee_id == current_user.id)
+    tasks = await paginate(db, query, (Task.id,), response, cursor=cursor, skip=skip, limit=limit)
+    return render(request, response, task_list_adapter, tasks)
 
 @router.get("/my-tasks/stats")
-def get_my_task_stats(
+async def get_my_task_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get task statistics for the current user by status."""
-    # Get tasks assigned to current user
-    user_tasks = db.query(Task).filter(Task.assignee_id == current_user.id)
-    
-    # Count by status using enum values
-    from ..models import TaskStatus
-    todo_count = user_tasks.filter(Task.status == TaskStatus.TODO).count()
-    in_progress_count = user_tasks.filter(Task.status == TaskStatus.IN_PROGRESS).count()
-    review_count = user_tasks.filter(Task.status == TaskStatus.REVIEW).count()
-    ready_to_test_count = user_tasks.filter(Task.status == TaskStatus.READY_TO_TEST).count()
-    in_test_count = user_tasks.filter(Task.status == TaskStatus.IN_TEST).count()
-    closed_count = user_tasks.filter(Task.status == TaskStatus.CLOSED).count()
-    
-    total_tasks = todo_count + in_progress_count + review_count + ready_to_test_count + in_test_count + closed_count
+    # Count tasks assigned to current user by status in one grouped query
+    counts = (await task_status_histogram(db, assignee_id=current_user.id))["counts"]
     
     return {
         "user_id": current_user.id,
         "username": current_user.username,
-        "total_tasks": total_tasks,
-        "todo": todo_count,
-        "in_progress": in_progress_count,
-        "review": review_count,
-        "ready_to_test": ready_to_test_count,
-        "in_test": in_test_count,
-        "closed": closed_count
+        "total_tasks": sum(counts.values()),
+        **counts
     }
 
 # Time logging endpoints
 @router.post("/{task_id}/time-logs", response_model=TimeLogSchema)
-def create_time_log(
+async def create_time_log(
     task_id: int,
     time_log: TimeLogCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Log time for a task (anyone can log time for any task)."""
     # Verify task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -341,62 +668,62 @@ def create_time_log(
         date=time_log.date
     )
     db.add(db_time_log)
-    
-    # Update task's actual hours
-    task.actual_hours += time_log.hours
-    
-    db.commit()
-    db.refresh(db_time_log)
+    await apply_time_log_changes(db, [log_change(db_time_log)])
+    await db.commit()
+    await db.refresh(db_time_log)
+    metrics_store.hours_logged(db_time_log.hours)
+    live_events.publish(time_log_event("time_log.created", db_time_log, task.project_id, task.assignee_id))
     return db_time_log
 
 @router.get("/{task_id}/time-logs", response_model=List[TimeLogSchema])
-def get_task_time_logs(
+async def get_task_time_logs(
     task_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get time logs for a specific task (globally visible)."""
     # Verify task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    time_logs = db.query(TimeLog).filter(TimeLog.task_id == task_id).all()
-    return time_logs
+    result = await db.execute(select(TimeLog).where(TimeLog.task_id == task_id))
+    return result.scalars().all()
 
 # Comment endpoints for tasks
 from ..schemas.task import Comment as CommentSchema, CommentCreate as CommentCreateSchema
 
 @router.get("/{task_id}/comments", response_model=List[CommentSchema])
-def get_task_comments(
+async def get_task_comments(
     task_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all comments for a specific task (globally visible)."""
     # Verify task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     from ..models import Comment
-    from sqlalchemy.orm import joinedload
     
-    comments = db.query(Comment).options(joinedload(Comment.user)).filter(
-        Comment.task_id == task_id
-    ).order_by(Comment.created_at.desc()).all()
-    return comments
+    result = await db.execute(
+        select(Comment).options(joinedload(Comment.user)).where(
+            Comment.task_id == task_id
+        ).order_by(Comment.created_at.desc())
+    )
+    return result.scalars().all()
 
 @router.post("/{task_id}/comments", response_model=CommentSchema)
-def create_task_comment(
+async def create_task_comment(
     task_id: int,
     comment_data: CommentCreateSchema,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new comment on a task (anyone can comment on any task)."""
     # Verify task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -408,12 +735,11 @@ def create_task_comment(
         task_id=task_id
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    live_events.publish(comment_event("comment.created", db_comment, task.project_id, task.assignee_id))
     
     # Fetch the comment with user information
-    from sqlalchemy.orm import joinedload
-    db_comment_with_user = db.query(Comment).options(joinedload(Comment.user)).filter(
-        Comment.id == db_comment.id
-    ).first()
+    db_comment_with_user = await db.scalar(
+        select(Comment).options(joinedload(Comment.user)).where(Comment.id == db_comment.id)
+    )
     return db_comment_with_user 
\ No newline at end of file
@@ -1,24 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, date
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_async_db
 from ..models import TimeLog, Task, Project, User
-from ..schemas.timelog import TimeLogCreate, TimeLogUpdate, TimeLog as TimeLogSchema, TimeLogWithTask
+from ..schemas.timelog import TimeLogCreate, TimeLogUpdate, TimeLog as TimeLogSchema, TimeLogWithTask, TimeLogImportResult
 from ..auth import get_current_user
+from ..metrics_store import metrics_store
+from ..pagination import paginate
+from ..time_accounting import apply_time_log_changes, log_change
+from ..time_summary import date_range_filters, summarize_user_time
+from ..export import export_response
+from ..live_events import live_event, live_events, task_audience, time_log_event
+from ..timelog_import import TimeLogImporter, import_format, iter_csv_records, iter_lines, iter_ndjson_records
 
 router = APIRouter(prefix="/timelog", tags=["time tracking"])
 
+# Columns returned by the time log list
+TIME_LOG_LIST_COLUMNS = (
+    TimeLog.id,
+    TimeLog.hours,
+    TimeLog.description,
+    TimeLog.date,
+    TimeLog.task_id,
+    Task.title.label("task_title"),
+    Project.title.label("project_title"),
+    TimeLog.created_at,
+)
+
+# Columns written by the time log export
+TIME_LOG_EXPORT_COLUMNS = (
+    TimeLog.id,
+    TimeLog.task_id,
+    Task.title.label("task_title"),
+    Project.title.label("project_title"),
+    TimeLog.user_id,
+    TimeLog.hours,
+    TimeLog.date,
+    TimeLog.description,
+    TimeLog.created_at,
+)
+
 @router.post("/", response_model=TimeLogSchema)
-def create_time_log(
+async def create_time_log(
     time_log: TimeLogCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new time log entry."""
     # Verify task exists and user has access
-    task = db.query(Task).filter(Task.id == time_log.task_id).first()
+    task = await db.get(Task, time_log.task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -26,7 +58,7 @@ def create_time_log(
         )
     
     # Check if user is assigned to the task or is project owner
-    project = db.query(Project).filter(Project.id == task.project_id).first()
+    project = await db.get(Project, task.project_id)
     if task.assignee_id != current_user.id and project.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -41,72 +73,109 @@ def create_time_log(
         date=time_log.date
     )
     db.add(db_time_log)
-    db.commit()
-    db.refresh(db_time_log)
-    
-    # Update task actual hours
-    task.actual_hours = db.query(func.sum(TimeLog.hours)).filter(
-        TimeLog.task_id == task.id
-    ).scalar() or 0
-    db.commit()
+    await apply_time_log_changes(db, [log_change(db_time_log)])
+    await db.commit()
+    await db.refresh(db_time_log)
+    metrics_store.hours_logged(db_time_log.hours)
+    live_events.publish(time_log_event("time_log.created", db_time_log, task.project_id, task.assignee_id))
     
     return db_time_log
 
-@router.get("/", response_model=List[TimeLogWithTask])
-def get_time_logs(
-    task_id: int = None,
-    user_id: int = None,
-    start_date: date = None,
-    end_date: date = None,
-    db: Session = Depends(get_db),
+@router.post("/import", response_model=TimeLogImportResult)
+async def import_time_logs(
+    request: Request,
+    format: Optional[str] = None,
+    dry_run: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get time logs with optional filtering."""
-    query = db.query(TimeLog).join(Task).join(Project)
+    """Import time logs from a streamed CSV or NDJSON request body.
+    
+    CSV needs a header with task_id, hours and date (description and user_id
+    are optional); NDJSON has one object with the same fields per line.
+    """
+    fmt = import_format(format, request.headers.get("content-type"))
+    lines = iter_lines(request.stream())
+    records = iter_csv_records(lines) if fmt == "csv" else iter_ndjson_records(lines)
+    
+    importer = TimeLogImporter(db, current_user, dry_run=dry_run)
+    result = await importer.run(records)
+    if not dry_run:
+        tasks = (await db.execute(
+            select(Task.id, Task.project_id, Task.assignee_id).where(Task.id.in_(importer.affected_tasks))
+        )).all() if importer.affected_tasks else []
+        await db.commit()
+        metrics_store.hours_logged(result["total_hours"])
+        # One event per touched task rather than one per imported row
+        live_events.publish(*(
+            live_event("time_log.imported", task.project_id, (current_user.id, task.assignee_id), current_user.id, task_id=task.id)
+            for task in tasks
+        ))
     
-    # Apply filters
+    return result
+
+def _filter_time_logs(query, current_user: User, task_id: int = None, user_id: int = None,
+                      start_date: date = None, end_date: date = None):
+    """Apply the time log list filters shared by listing and export."""
     if task_id:
-        query = query.filter(TimeLog.task_id == task_id)
+        query = query.where(TimeLog.task_id == task_id)
     if user_id:
-        query = query.filter(TimeLog.user_id == user_id)
-    if start_date:
-        query = query.filter(func.date(TimeLog.date) >= start_date)
-    if end_date:
-        query = query.filter(func.date(TimeLog.date) <= end_date)
+        query = query.where(TimeLog.user_id == user_id)
+    # Compare the raw column so the (user_id, date) index can serve the range
+    query = query.where(*date_range_filters(TimeLog.date, start_date, end_date))
     
     # If not admin, only show user's own logs or logs for tasks they're assigned to
     if not current_user.is_active:  # Assuming admin check
-        query = query.filter(
+        query = query.where(
             (TimeLog.user_id == current_user.id) |
             (Task.assignee_id == current_user.id)
         )
+    return query
+
+@router.get("/", response_model=List[TimeLogWithTask])
+async def get_time_logs(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    task_id: int = None,
+    user_id: int = None,
+    start_date: date = None,
+    end_date: date = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get time logs with optional filtering."""
+    # Select only the response columns so task and project titles come from the join
+    query = select(*TIME_LOG_LIST_COLUMNS).select_from(TimeLog).join(Task).join(Project)
+    query = _filter_time_logs(query, current_user, task_id, user_id, start_date, end_date)
     
-    time_logs = query.all()
-    
-    # Convert to response format with task and project info
-    result = []
-    for log in time_logs:
-        result.append(TimeLogWithTask(
-            id=log.id,
-            hours=log.hours,
-            description=log.description,
-            date=log.date,
-            task_id=log.task_id,
-            task_title=log.task.title,
-            project_title=log.task.project.title,
-            created_at=log.created_at
-        ))
+    return await paginate(db, query, (TimeLog.id,), response, cursor=cursor, skip=skip, limit=limit, scalars=False)
+
+@router.get("/export")
+async def export_time_logs(
+    format: str = "csv",
+    task_id: int = None,
+    user_id: int = None,
+    start_date: date = None,
+    end_date: date = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream time logs as CSV or NDJSON (same filters as the list endpoint)."""
+    query = select(*TIME_LOG_EXPORT_COLUMNS).select_from(TimeLog).join(Task).join(Project)
+    query = _filter_time_logs(query, current_user, task_id, user_id, start_date, end_date)
+    query = query.order_by(TimeLog.id)
     
-    return result
+    return export_response(query, [column.key for column in TIME_LOG_EXPORT_COLUMNS], format, "time_logs")
 
 @router.get("/{time_log_id}", response_model=TimeLogSchema)
-def get_time_log(
+async def get_time_log(
     time_log_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific time log entry."""
-    time_log = db.query(TimeLog).filter(TimeLog.id == time_log_id).first()
+    time_log = await db.get(TimeLog, time_log_id)
     if not time_log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,8 +184,8 @@ def get_time_log(
     
     # Check authorization
     if time_log.user_id != current_user.id:
-        task = db.query(Task).filter(Task.id == time_log.task_id).first()
-        project = db.query(Project).filter(Project.id == task.project_id).first()
+        task = await db.get(Task, time_log.task_id)
+        project = await db.get(Project, task.project_id)
         if project.owner_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -126,14 +195,14 @@ def get_time_log(
     return time_log
 
 @router.put("/{time_log_id}", response_model=TimeLogSchema)
-def update_time_log(
+async def update_time_log(
     time_log_id: int,
     time_log_update: TimeLogUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update a time log entry."""
-    time_log = db.query(TimeLog).filter(TimeLog.id == time_log_id).first()
+    time_log = await db.get(TimeLog, time_log_id)
     if not time_log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -147,31 +216,47 @@ def update_time_log(
             detail="Not authorized to update this time log"
         )
     
-    # Update fields
     update_data = time_log_update.dict(exclude_unset=True)
+    
+    # Moving the log to another task needs the same access as logging on it
+    if update_data.get("task_id", time_log.task_id) != time_log.task_id:
+        task = await db.get(Task, update_data["task_id"])
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        project = await db.get(Project, task.project_id)
+        if task.assignee_id != current_user.id and (project is None or project.owner_id != current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to log time for this task"
+            )
+    
+    old_hours = time_log.hours or 0
+    removed = log_change(time_log, -1)
+    
+    # Update fields
     for field, value in update_data.items():
         setattr(time_log, field, value)
     
-    db.commit()
-    db.refresh(time_log)
-    
-    # Update task actual hours
-    task = db.query(Task).filter(Task.id == time_log.task_id).first()
-    task.actual_hours = db.query(func.sum(TimeLog.hours)).filter(
-        TimeLog.task_id == task.id
-    ).scalar() or 0
-    db.commit()
+    await apply_time_log_changes(db, [removed, log_change(time_log)])
+    project_id, assignee_id = await task_audience(db, time_log.task_id)
+    await db.commit()
+    await db.refresh(time_log)
+    metrics_store.hours_logged((time_log.hours or 0) - old_hours)
+    live_events.publish(time_log_event("time_log.updated", time_log, project_id, assignee_id))
     
     return time_log
 
 @router.delete("/{time_log_id}")
-def delete_time_log(
+async def delete_time_log(
     time_log_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a time log entry."""
-    time_log = db.query(TimeLog).filter(TimeLog.id == time_log_id).first()
+    time_log = await db.get(TimeLog, time_log_id)
     if not time_log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -185,64 +270,30 @@ def delete_time_log(
             detail="Not authorized to delete this time log"
         )
     
-    task_id = time_log.task_id
-    db.delete(time_log)
-    db.commit()
-    
-    # Update task actual hours
-    task = db.query(Task).filter(Task.id == task_id).first()
-    task.actual_hours = db.query(func.sum(TimeLog.hours)).filter(
-        TimeLog.task_id == task.id
-    ).scalar() or 0
-    db.commit()
+    old_hours = time_log.hours or 0
+    project_id, assignee_id = await task_audience(db, time_log.task_id)
+    await db.delete(time_log)
+    await apply_time_log_changes(db, [log_change(time_log, -1)])
+    await db.commit()
+    metrics_store.hours_logged(-old_hours)
+    live_events.publish(time_log_event("time_log.deleted", time_log, project_id, assignee_id))
     
     return {"message": "Time log deleted successfully"}
 
 @router.get("/summary/user/{user_id}")
-def get_user_time_summary(
+async def get_user_time_summary(
     user_id: int,
     start_date: date = None,
     end_date: date = None,
-    db: Session = Depends(get_db),
+    group_by: str = "task",
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get time summary for a specific user."""
+    """Get time summary for a specific user, grouped by task, project, day or week."""
     # Check authorization
     if user_id != current_user.id:
         # Check if current user is admin or project owner
         # For now, allow if user_id matches current_user
         pass
     
-    query = db.query(TimeLog).filter(TimeLog.user_id == user_id)
-    
-    if start_date:
-        query = query.filter(func.date(TimeLog.date) >= start_date)
-    if end_date:
-        query = query.filter(func.date(TimeLog.date) <= end_date)
-    
-    total_hours = db.query(func.sum(TimeLog.hours)).filter(
-        TimeLog.user_id == user_id
-    ).scalar() or 0
-    
-    time_logs = query.all()
-    
-    # Group by task
-    task_summary = {}
-    for log in time_logs:
-        if log.task_id not in task_summary:
-            task_summary[log.task_id] = {
-                "task_title": log.task.title,
-                "project_title": log.task.project.title,
-                "total_hours": 0
-            }
-        task_summary[log.task_id]["total_hours"] += log.hours
-    
-    return {
-        "user_id": user_id,
-        "total_hours": total_hours,
-        "task_summary": list(task_summary.values()),
-        "period": {
-            "start_date": start_date,
-            "end_date": end_date
-        }
-    } 
\ No newline at end of file
+    return await summarize_user_time(db, user_id, start_date, end_date, group_by)
@@ -1,47 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Security, Query
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ..database import get_async_db
 from ..models import User
 from ..schemas.user import User as UserSchema, UserUpdate
-from ..auth import get_current_active_user, get_password_hash
+from ..auth import get_current_active_user, get_password_hash_async
+from ..etags import not_modified, page_etag, weak_etag
+from ..pagination import paginate
+from ..responses import render, user_list_adapter
 
 security = HTTPBearer()
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=UserSchema)
-def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user)
+):
     """Get current user information."""
+    # The user row is already loaded (or cached) by authentication
+    etag = weak_etag(request.url.path, current_user.id, current_user.updated_at or current_user.created_at)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     return current_user
 
 @router.put("/me", response_model=UserSchema)
-def update_current_user(
+async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user information."""
     update_data = user_update.dict(exclude_unset=True)
     
     # Hash password if provided
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
     
     for field, value in update_data.items():
         setattr(current_user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     return current_user
 
 @router.get("/", response_model=list[UserSchema])
-def get_users(
-    skip: int = 0,
-    limit: int = 100,
+async def get_users(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all users (for project assignment purposes)."""
-    users = db.query(User).filter(User.is_active == True).offset(skip).limit(limit).all()
-    return users 
\ No newline at end of file
+    query = select(User).where(User.is_active == True)
+    etag = await page_etag(db, request, query, (User.id,), cursor=cursor, skip=skip, limit=limit)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    users = await paginate(db, query, (User.id,), response, cursor=cursor, skip=skip, limit=limit)
+    return render(request, response, user_list_adapter, users) 
\ No newline at end of file
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+from ..models import TaskStatus
+
+class SearchHit(BaseModel):
+    type: str  # task, project or comment
+    id: int
+    title: Optional[str] = None  # the start of the text for comments
+    project_id: Optional[int] = None
+    task_id: Optional[int] = None
+    status: Optional[TaskStatus] = None
+    assignee_id: Optional[int] = None
+    rank: float
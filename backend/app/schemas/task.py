@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from ..models import TaskStatus, TaskPriority
@@ -45,6 +45,31 @@ class Task(TaskBase):
     class Config:
         from_attributes = True
 
+# Bulk task schemas
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+class TaskBulkResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str  # created, updated, deleted, error
+    error: Optional[str] = None
+    task: Optional[Task] = None
+
+class TaskBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkResult]
+
 class TimeLogBase(BaseModel):
     hours: int
     description: Optional[str] = None
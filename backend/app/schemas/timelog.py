@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class TimeLogBase(BaseModel):
     hours: int
@@ -14,6 +14,15 @@ class TimeLogUpdate(BaseModel):
     hours: Optional[int] = None
     description: Optional[str] = None
     date: Optional[datetime] = None
+    task_id: Optional[int] = None
+
+    @field_validator("hours", "date", "task_id")
+    @classmethod
+    def not_null(cls, value):
+        """Leave a field out to keep it; hours, date and task cannot be cleared."""
+        if value is None:
+            raise ValueError("cannot be null")
+        return value
 
 class TimeLog(TimeLogBase):
     id: int
@@ -36,4 +45,29 @@ class TimeLogWithTask(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class TimeLogImportRow(TimeLogCreate):
+    # Project owners may import entries on behalf of another user
+    user_id: Optional[int] = None
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def allow_plain_date(cls, value):
+        """Exports from other trackers often carry a date without a time."""
+        if isinstance(value, str) and len(value) == 10:
+            return f"{value}T00:00:00"
+        return value
+
+class TimeLogImportError(BaseModel):
+    row: int
+    error: str
+
+class TimeLogImportResult(BaseModel):
+    imported: int
+    failed: int
+    total_hours: int
+    tasks_updated: int
+    dry_run: bool
+    errors: List[TimeLogImportError]
+    errors_truncated: bool
@@ -0,0 +1,163 @@
+"""
+Full-text search over tasks, projects and comments.
+
+PostgreSQL matches the weighted tsvector documents from ``models`` through
+their GIN indexes and ranks with ``ts_rank``; SQLite queries the FTS5 mirrors
+and ranks with ``bm25`` (titles count ten times descriptions). Every word of
+the query must match and the last one also matches as a prefix, so results
+follow a search box as the user types.
+
+Each type is ranked and limited in its own branch of one UNION ALL, so only
+the top rows of each leave the database.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Float, Integer, column, func, literal_column, null, select, table, type_coerce, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import (
+    Comment, Project, Task, TaskStatus, comment_search_vector, project_search_vector, task_search_vector,
+)
+
+SEARCH_TYPES = ("task", "project", "comment")
+SEARCH_MAX_LIMIT = 100
+SEARCH_MAX_TERMS = 8
+SEARCH_TITLE_CHARS = 200
+
+# bm25 column weights of each SQLite FTS5 mirror, in column order
+_SQLITE_WEIGHTS = {
+    "tasks": (10.0, 1.0),
+    "projects": (10.0, 1.0),
+    "comments": (1.0,),
+}
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of a query; punctuation and operators are dropped."""
+    return re.findall(r"\w+", q.lower())[:SEARCH_MAX_TERMS]
+
+
+def _match(dialect: str, model, vector, terms: List[str]):
+    """(FROM clause, WHERE clause, rank) matching ``terms`` against ``model``'s text index."""
+    if dialect == "sqlite":
+        fts_name = f"{model.__tablename__}_fts"
+        fts = table(fts_name, column("rowid"))
+        query = " ".join(f'"{term}"' for term in terms) + "*"
+        rank = -func.bm25(literal_column(fts_name), *_SQLITE_WEIGHTS[model.__tablename__])
+        return fts.join(model, model.id == fts.c.rowid), literal_column(fts_name).op("MATCH")(query), rank
+    tsquery = func.to_tsquery(literal_column("'english'::regconfig"), " & ".join(terms) + ":*")
+    return model.__table__, vector.op("@@")(tsquery), func.ts_rank(vector, tsquery)
+
+
+def _hit_columns(hit_type: str, id, title, project_id, task_id, status, assignee_id, rank) -> list:
+    """The columns every branch of the UNION returns, in order."""
+    return [
+        literal_column(f"'{hit_type}'").label("type"),
+        id.label("id"),
+        title.label("title"),
+        project_id.label("project_id"),
+        task_id.label("task_id"),
+        status.label("status"),
+        assignee_id.label("assignee_id"),
+        type_coerce(rank, Float).label("rank"),
+    ]
+
+
+def _task_filters(status: Optional[TaskStatus], assignee_id: Optional[int]) -> list:
+    filters = []
+    if status is not None:
+        filters.append(Task.status == status)
+    if assignee_id is not None:
+        filters.append(Task.assignee_id == assignee_id)
+    return filters
+
+
+def _task_branch(dialect, terms, project_id, status, assignee_id, top):
+    source, match, rank = _match(dialect, Task, task_search_vector, terms)
+    filters = _task_filters(status, assignee_id)
+    if project_id is not None:
+        filters.append(Task.project_id == project_id)
+    columns = _hit_columns(
+        "task", Task.id, Task.title, Task.project_id, Task.id, Task.status, Task.assignee_id, rank
+    )
+    return select(*columns).select_from(source).where(match, *filters).order_by(columns[-1].desc()).limit(top)
+
+
+def _project_branch(dialect, terms, project_id, top):
+    source, match, rank = _match(dialect, Project, project_search_vector, terms)
+    filters = [Project.id == project_id] if project_id is not None else []
+    columns = _hit_columns(
+        "project", Project.id, Project.title, Project.id,
+        type_coerce(null(), Integer), type_coerce(null(), Task.status.type), type_coerce(null(), Integer), rank,
+    )
+    return select(*columns).select_from(source).where(match, *filters).order_by(columns[-1].desc()).limit(top)
+
+
+def _comment_branch(dialect, terms, project_id, status, assignee_id, top):
+    source, match, rank = _match(dialect, Comment, comment_search_vector, terms)
+    comment_project_id = func.coalesce(Comment.project_id, Task.project_id)
+    # Task filters keep only comments on matching tasks
+    filters = _task_filters(status, assignee_id)
+    if project_id is not None:
+        filters.append(comment_project_id == project_id)
+    columns = _hit_columns(
+        "comment", Comment.id, func.substr(Comment.content, 1, SEARCH_TITLE_CHARS), comment_project_id,
+        Comment.task_id, Task.status, Task.assignee_id, rank,
+    )
+    return (
+        select(*columns)
+        .select_from(source.outerjoin(Task, Task.id == Comment.task_id))
+        .where(match, *filters)
+        .order_by(columns[-1].desc())
+        .limit(top)
+    )
+
+
+def parse_types(types: Optional[str]) -> List[str]:
+    """Validate a comma separated ``types`` filter (all types when empty)."""
+    if not types:
+        return list(SEARCH_TYPES)
+    selected = [name.strip() for name in types.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in SEARCH_TYPES]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"types must be a comma separated list of: {', '.join(SEARCH_TYPES)}")
+    return selected
+
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    types: Optional[str] = None,
+    project_id: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Dict]:
+    """Best matches for ``q`` across the selected types, highest rank first."""
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="q must contain at least one word")
+    selected = parse_types(types)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    skip = max(skip, 0)
+    top = skip + limit
+
+    dialect = db.get_bind().dialect.name
+    branches = []
+    if "task" in selected:
+        branches.append(_task_branch(dialect, terms, project_id, status, assignee_id, top))
+    # Projects have no status or assignee, so those filters leave them out
+    if "project" in selected and status is None and assignee_id is None:
+        branches.append(_project_branch(dialect, terms, project_id, top))
+    if "comment" in selected:
+        branches.append(_comment_branch(dialect, terms, project_id, status, assignee_id, top))
+    if not branches:
+        return []
+
+    hits = union_all(*(select(branch.subquery()) for branch in branches)).subquery()
+    stmt = select(hits).order_by(hits.c.rank.desc(), hits.c.type, hits.c.id).offset(skip).limit(limit)
+    return [dict(row) for row in (await db.execute(stmt)).mappings()]
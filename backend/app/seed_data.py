@@ -4,12 +4,27 @@ Seed Data Script for Project Management Dashboard
 Populates the database with sample projects and tasks for demonstration.
 """
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from .models import User, Project, Task, TimeLog, TaskStatus, TaskPriority
 from .auth import get_password_hash
+from .bulk_load import BulkLoader
+from .time_rollups import backfill
 from datetime import datetime, timedelta
 import random
 
+SAMPLE_TIME_LOG_TASKS = [
+    "Design User Interface",
+    "Implement User Authentication",
+    "Create Product Catalog",
+    "Payment Integration",
+    "Setup React Native Project",
+]
+
+def existing_titles(db: Session, model, titles):
+    """Return which of ``titles`` are already used by ``model`` rows, in one query."""
+    return set(db.scalars(select(model.title).where(model.title.in_(titles))))
+
 def create_sample_users(db: Session):
     """Create sample users for demonstration."""
     users_data = [
@@ -39,18 +54,18 @@ def create_sample_users(db: Session):
         }
     ]
     
-    for user_data in users_data:
-        # Check if user already exists
-        existing_user = db.query(User).filter(User.username == user_data["username"]).first()
-        if not existing_user:
-            hashed_password = get_password_hash(user_data["password"])
-            user = User(
-                username=user_data["username"],
-                email=user_data["email"],
-                full_name=user_data["full_name"],
-                hashed_password=hashed_password
-            )
-            db.add(user)
+    rows = [
+        {
+            "username": user_data["username"],
+            "email": user_data["email"],
+            "full_name": user_data["full_name"],
+            "hashed_password": get_password_hash(user_data["password"]),
+            "is_active": True
+        }
+        for user_data in users_data
+    ]
+    # Existing users (same username or email) are skipped
+    BulkLoader(db.connection()).load(User, rows, on_conflict="ignore")
     
     db.commit()
     print("✅ Sample users created successfully!")
@@ -78,12 +93,10 @@ def create_sample_projects(db: Session):
         }
     ]
     
-    for project_data in projects_data:
-        # Check if project already exists
-        existing_project = db.query(Project).filter(Project.title == project_data["title"]).first()
-        if not existing_project:
-            project = Project(**project_data)
-            db.add(project)
+    # Projects that already exist (same title) are skipped
+    existing = existing_titles(db, Project, [p["title"] for p in projects_data])
+    rows = [p for p in projects_data if p["title"] not in existing]
+    BulkLoader(db.connection()).load(Project, rows)
     
     db.commit()
     print("✅ Sample projects created successfully!")
@@ -95,10 +108,10 @@ def create_sample_tasks(db: Session):
         {
             "title": "Design User Interface",
             "description": "Create wireframes and mockups for the e-commerce platform",
-            "status": TaskStatus.COMPLETED,
+            "status": TaskStatus.CLOSED,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 16,
-            "project_id": 1,
+            "project": "E-Commerce Platform Development",
             "assignee_id": 1
         },
         {
@@ -107,25 +120,25 @@ def create_sample_tasks(db: Session):
             "status": TaskStatus.IN_PROGRESS,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 12,
-            "project_id": 1,
+            "project": "E-Commerce Platform Development",
             "assignee_id": 2
         },
         {
             "title": "Create Product Catalog",
             "description": "Build product listing and search functionality",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.MEDIUM,
             "estimated_hours": 20,
-            "project_id": 1,
+            "project": "E-Commerce Platform Development",
             "assignee_id": 3
         },
         {
             "title": "Payment Integration",
             "description": "Integrate Stripe payment gateway",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 24,
-            "project_id": 1,
+            "project": "E-Commerce Platform Development",
             "assignee_id": 4
         },
         
@@ -133,10 +146,10 @@ def create_sample_tasks(db: Session):
         {
             "title": "Setup React Native Project",
             "description": "Initialize React Native project with TypeScript",
-            "status": TaskStatus.COMPLETED,
+            "status": TaskStatus.CLOSED,
             "priority": TaskPriority.MEDIUM,
             "estimated_hours": 8,
-            "project_id": 2,
+            "project": "Mobile App for Task Management",
             "assignee_id": 1
         },
         {
@@ -145,25 +158,25 @@ def create_sample_tasks(db: Session):
             "status": TaskStatus.IN_PROGRESS,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 16,
-            "project_id": 2,
+            "project": "Mobile App for Task Management",
             "assignee_id": 2
         },
         {
             "title": "Implement Task CRUD Operations",
             "description": "Create task creation, editing, and deletion functionality",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 20,
-            "project_id": 2,
+            "project": "Mobile App for Task Management",
             "assignee_id": 3
         },
         {
             "title": "Add Push Notifications",
             "description": "Implement push notifications for task reminders",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.MEDIUM,
             "estimated_hours": 12,
-            "project_id": 2,
+            "project": "Mobile App for Task Management",
             "assignee_id": 4
         },
         
@@ -174,74 +187,89 @@ def create_sample_tasks(db: Session):
             "status": TaskStatus.IN_PROGRESS,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 24,
-            "project_id": 3,
+            "project": "AI-Powered Analytics Dashboard",
             "assignee_id": 1
         },
         {
             "title": "Design Dashboard Layout",
             "description": "Create responsive dashboard layout with charts and graphs",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.MEDIUM,
             "estimated_hours": 16,
-            "project_id": 3,
+            "project": "AI-Powered Analytics Dashboard",
             "assignee_id": 2
         },
         {
             "title": "Implement Data Processing Pipeline",
             "description": "Build ETL pipeline for data processing and analysis",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 32,
-            "project_id": 3,
+            "project": "AI-Powered Analytics Dashboard",
             "assignee_id": 3
         },
         {
             "title": "Create Predictive Models",
             "description": "Develop machine learning models for predictive analytics",
-            "status": TaskStatus.TO_DO,
+            "status": TaskStatus.TODO,
             "priority": TaskPriority.HIGH,
             "estimated_hours": 40,
-            "project_id": 3,
+            "project": "AI-Powered Analytics Dashboard",
             "assignee_id": 4
         }
     ]
     
+    # Tasks that already exist (same title) are skipped
+    existing = existing_titles(db, Task, [t["title"] for t in tasks_data])
+    project_titles = {t["project"] for t in tasks_data}
+    project_ids = dict(
+        db.execute(
+            select(Project.title, func.min(Project.id))
+            .where(Project.title.in_(project_titles))
+            .group_by(Project.title)
+        ).all()
+    )
+    rows = []
     for task_data in tasks_data:
-        # Check if task already exists
-        existing_task = db.query(Task).filter(Task.title == task_data["title"]).first()
-        if not existing_task:
-            task = Task(**task_data)
-            db.add(task)
+        if task_data["title"] in existing:
+            continue
+        row = dict(task_data)
+        row["project_id"] = project_ids.get(row.pop("project"))
+        rows.append(row)
+    BulkLoader(db.connection()).load(Task, rows)
     
     db.commit()
     print("✅ Sample tasks created successfully!")
 
 def create_sample_time_logs(db: Session):
     """Create sample time logs for demonstration."""
-    # Get some tasks to create time logs for
-    tasks = db.query(Task).limit(5).all()
+    # Log time against the seeded tasks, not whatever else is in the table
+    tasks = db.execute(
+        select(Task.id, Task.title, Task.assignee_id)
+        .where(Task.title.in_(SAMPLE_TIME_LOG_TASKS))
+        .order_by(Task.id)
+        .limit(len(SAMPLE_TIME_LOG_TASKS))
+    ).all()
     
+    rows = []
     for task in tasks:
         # Create 2-3 time logs per task
         for i in range(random.randint(2, 3)):
-            hours = random.randint(2, 8)
-            date = datetime.now() - timedelta(days=random.randint(1, 7))
-            
-            time_log = TimeLog(
-                task_id=task.id,
-                user_id=task.assignee_id or 1,
-                hours=hours,
-                description=f"Work on {task.title} - day {i+1}",
-                date=date
-            )
-            db.add(time_log)
+            rows.append({
+                "task_id": task.id,
+                "user_id": task.assignee_id or 1,
+                "hours": random.randint(2, 8),
+                "description": f"Work on {task.title} - day {i+1}",
+                "date": datetime.now() - timedelta(days=random.randint(1, 7))
+            })
+    BulkLoader(db.connection()).load(TimeLog, rows)
     
     db.commit()
     print("✅ Sample time logs created successfully!")
 
 def main():
     """Main function to seed the database."""
-    from .database import SessionLocal
+    from .database import SessionLocal, engine
     
     db = SessionLocal()
     try:
@@ -252,6 +280,10 @@ def main():
         create_sample_tasks(db)
         create_sample_time_logs(db)
         
+        # Bulk-loaded logs bypass the write path that maintains the rollups
+        with engine.connect() as connection:
+            backfill(connection, report=None)
+        
         print("🎉 Database seeding completed successfully!")
         
     except Exception as e:
@@ -0,0 +1,51 @@
+"""
+Task status histogram shared by summary and board views.
+
+A single GROUP BY over the filtered tasks returns per-status counts together
+with estimated and actual hour totals.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Task, TaskStatus
+
+
+async def task_status_histogram(
+    db: AsyncSession,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+) -> Dict:
+    """Count tasks per status and sum their hours for a project and/or assignee.
+
+    Returns ``{"counts": {status: n}, "total_tasks", "total_estimated_hours",
+    "total_actual_hours"}`` with every status present in ``counts``.
+    """
+    stmt = select(
+        Task.status,
+        func.count(Task.id),
+        func.coalesce(func.sum(Task.estimated_hours), 0),
+        func.coalesce(func.sum(Task.actual_hours), 0),
+    ).group_by(Task.status)
+    if project_id is not None:
+        stmt = stmt.where(Task.project_id == project_id)
+    if assignee_id is not None:
+        stmt = stmt.where(Task.assignee_id == assignee_id)
+
+    counts = {status.value: 0 for status in TaskStatus}
+    total_tasks = total_estimated_hours = total_actual_hours = 0
+    for status, count, estimated_hours, actual_hours in (await db.execute(stmt)).all():
+        if status is not None:
+            counts[TaskStatus(status).value] = count
+        total_tasks += count
+        total_estimated_hours += estimated_hours
+        total_actual_hours += actual_hours
+
+    return {
+        "counts": counts,
+        "total_tasks": total_tasks,
+        "total_estimated_hours": total_estimated_hours,
+        "total_actual_hours": total_actual_hours,
+    }
@@ -0,0 +1,161 @@
+"""
+Task.actual_hours bookkeeping.
+
+Every time log write adjusts its task with an atomic
+``actual_hours = actual_hours + :delta`` in the same transaction as the log
+row, instead of re-summing all of the task's logs after a separate commit.
+Concurrent writers cannot lose each other's updates and the cost of a write
+no longer grows with the number of logs on the task. The same change is
+applied to the daily reporting rollups (see ``time_rollups``).
+
+Writes made outside the API (manual SQL, restores, older code paths) can
+still leave the column out of step with the logs, so the module doubles as an
+offline reconcile command that reports drift and optionally repairs it::
+
+    python -m app.time_accounting            # report drifted tasks
+    python -m app.time_accounting --repair   # recompute them from the logs
+"""
+
+import argparse
+from collections import namedtuple
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Task, TimeLog
+from .time_rollups import RollupDeltas, apply_rollup_deltas
+
+RECONCILE_BATCH_SIZE = 1000
+
+_tasks = Task.__table__
+
+# A signed contribution of one time log to its task and daily rollup
+TimeLogChange = namedtuple("TimeLogChange", ["task_id", "user_id", "day", "hours", "log_count"])
+
+# One statement shared by single and batched adjustments (executemany)
+_ADD_HOURS = (
+    update(_tasks)
+    .where(_tasks.c.id == bindparam("b_task_id"))
+    .values(actual_hours=func.coalesce(_tasks.c.actual_hours, 0) + bindparam("b_delta"))
+)
+
+
+def log_change(time_log, sign: int = 1) -> TimeLogChange:
+    """The contribution of ``time_log`` as it stands now: ``sign=1`` adds it, ``-1`` removes it."""
+    day = time_log.date.date() if time_log.date is not None else None
+    return TimeLogChange(time_log.task_id, time_log.user_id, day, sign * (time_log.hours or 0), sign)
+
+
+async def apply_time_log_changes(db: AsyncSession, changes: Iterable[TimeLogChange]):
+    """Apply time log writes to task hours and daily rollups (the caller commits)."""
+    hours: Dict[int, int] = {}
+    rollups: RollupDeltas = {}
+    for change in changes:
+        if change.task_id is not None:
+            hours[change.task_id] = hours.get(change.task_id, 0) + change.hours
+        if change.user_id is not None and change.day is not None:
+            key = (change.user_id, change.task_id, change.day)
+            logged, count = rollups.get(key, (0, 0))
+            rollups[key] = (logged + change.hours, count + change.log_count)
+    await apply_hours_deltas(db, hours)
+    await apply_rollup_deltas(db, rollups)
+
+
+async def apply_hours_deltas(db: AsyncSession, deltas: Dict[int, int]):
+    """Add per-task hour deltas in one batched statement (the caller commits)."""
+    # Sorted so concurrent batches lock task rows in the same order
+    params = [
+        {"b_task_id": task_id, "b_delta": delta}
+        for task_id, delta in sorted(item for item in deltas.items() if item[0] is not None and item[1])
+    ]
+    if params:
+        await db.execute(_ADD_HOURS, params)
+
+
+def _logged_hours():
+    return (
+        select(func.coalesce(func.sum(TimeLog.hours), 0))
+        .where(TimeLog.task_id == _tasks.c.id)
+        .scalar_subquery()
+    )
+
+
+def find_drift(connection: Connection, task_ids: List[int]) -> List[Tuple[int, int, int]]:
+    """Return ``(task_id, actual_hours, logged_hours)`` for those of ``task_ids`` that drifted."""
+    logged = (
+        select(TimeLog.task_id, func.sum(TimeLog.hours).label("hours"))
+        .where(TimeLog.task_id.in_(task_ids))
+        .group_by(TimeLog.task_id)
+        .subquery()
+    )
+    logged_hours = func.coalesce(logged.c.hours, 0)
+    stmt = (
+        select(_tasks.c.id, _tasks.c.actual_hours, logged_hours)
+        .outerjoin(logged, logged.c.task_id == _tasks.c.id)
+        .where(_tasks.c.id.in_(task_ids))
+        .where(or_(_tasks.c.actual_hours.is_(None), _tasks.c.actual_hours != logged_hours))
+        .order_by(_tasks.c.id)
+    )
+    return [tuple(row) for row in connection.execute(stmt)]
+
+
+def repair_drift(connection: Connection, task_ids: Iterable[int]) -> int:
+    """Recompute actual_hours from the logs for ``task_ids``; returns rows updated."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    result = connection.execute(
+        update(_tasks).where(_tasks.c.id.in_(task_ids)).values(actual_hours=_logged_hours())
+    )
+    return result.rowcount
+
+
+def reconcile(connection: Connection, repair: bool = False, batch_size: int = RECONCILE_BATCH_SIZE, report=print) -> dict:
+    """Walk every task in id order, reporting (and optionally repairing) drift batch by batch."""
+    last_id = 0
+    checked = drifted = repaired = 0
+    while True:
+        task_ids = connection.scalars(
+            select(_tasks.c.id).where(_tasks.c.id > last_id).order_by(_tasks.c.id).limit(batch_size)
+        ).all()
+        if not task_ids:
+            break
+        checked += len(task_ids)
+        last_id = task_ids[-1]
+
+        drift = find_drift(connection, task_ids)
+        drifted += len(drift)
+        if report:
+            for task_id, actual_hours, logged_hours in drift:
+                report(f"task {task_id}: actual_hours={actual_hours} logged={logged_hours}")
+        if repair and drift:
+            repaired += repair_drift(connection, [task_id for task_id, _, _ in drift])
+        # End the batch's transaction so long runs do not hold locks or a snapshot
+        connection.commit()
+    return {"checked": checked, "drifted": drifted, "repaired": repaired}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect and repair Task.actual_hours drift from the logged time.")
+    parser.add_argument("--repair", action="store_true", help="recompute drifted tasks from their time logs")
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE, help="tasks checked per batch")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    from .database import engine
+
+    with engine.connect() as connection:
+        summary = reconcile(
+            connection,
+            repair=args.repair,
+            batch_size=args.batch_size,
+            report=None if args.quiet else print,
+        )
+    print(f"🔎 Checked {summary['checked']} tasks, {summary['drifted']} drifted", end="")
+    print(f", {summary['repaired']} repaired" if args.repair else "")
+
+
+if __name__ == "__main__":
+    main()
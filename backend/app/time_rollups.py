@@ -0,0 +1,228 @@
+"""
+Daily time log rollups.
+
+``time_log_daily_rollups`` holds the hours and log count per (user, task,
+day), with the task's project copied in. Every time log write applies its
+delta to the matching rollup row in the same transaction (see
+``time_accounting``), and task moves and deletions are mirrored, so summing
+rollups gives the same answer as summing the logs while touching one row
+per user, task and day instead of one per log.
+
+Reports read rollups for ranges longer than a day when
+``TIME_ROLLUP_REPORTS`` is enabled. The migration that creates the table
+fills it from the existing logs; whenever rollups may have drifted, rebuild
+them from the logs::
+
+    python -m app.time_rollups                                # everything
+    python -m app.time_rollups --start-date 2026-01-01        # from a day on
+"""
+
+import argparse
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import Date, Integer, bindparam, cast, delete, func, insert, literal_column, null, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Task, TimeLog, TimeLogDailyRollup
+
+load_dotenv()
+
+TIME_ROLLUP_REPORTS = os.getenv("TIME_ROLLUP_REPORTS", "true").lower() == "true"
+BACKFILL_CHUNK_DAYS = 31
+
+_rollups = TimeLogDailyRollup.__table__
+
+# The unique key, as indexed: rows of deleted tasks (task_id NULL) count as
+# task 0 so they still conflict with each other
+ROLLUP_KEY = (_rollups.c.user_id, func.coalesce(_rollups.c.task_id, literal_column("0")), _rollups.c.day)
+
+# (user_id, task_id, day) -> (hours, log_count)
+RollupDeltas = Dict[Tuple[int, Optional[int], date], Tuple[int, int]]
+
+
+def use_rollups(start_date: Optional[date], end_date: Optional[date]) -> bool:
+    """Whether a report over this range should read rollups instead of raw logs."""
+    if not TIME_ROLLUP_REPORTS:
+        return False
+    return not (start_date and end_date and end_date <= start_date)
+
+
+def log_day(dialect: str, column):
+    """SQL expression for the calendar day of a time log timestamp."""
+    if dialect == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+
+def _dialect_insert(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Time rollups are not supported on {dialect}")
+    return dialect_insert(_rollups)
+
+
+def _add_to_existing(stmt):
+    """Add to the row of the same (user, task, day) instead of inserting a second one."""
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            "hours": _rollups.c.hours + stmt.excluded.hours,
+            "log_count": _rollups.c.log_count + stmt.excluded.log_count,
+        },
+    )
+
+
+def _upsert(dialect: str):
+    task_project = select(Task.project_id).where(Task.id == bindparam("b_task_id")).scalar_subquery()
+    stmt = _dialect_insert(dialect).values(
+        user_id=bindparam("b_user_id", type_=Integer),
+        task_id=bindparam("b_task_id", type_=Integer),
+        project_id=task_project,
+        day=bindparam("b_day", type_=Date),
+        hours=bindparam("b_hours", type_=Integer),
+        log_count=bindparam("b_log_count", type_=Integer),
+    )
+    return _add_to_existing(stmt)
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: RollupDeltas):
+    """Add per (user, task, day) deltas in one batched upsert (the caller commits)."""
+    params = [
+        {"b_user_id": user_id, "b_task_id": task_id, "b_day": day, "b_hours": hours, "b_log_count": log_count}
+        for (user_id, task_id, day), (hours, log_count) in deltas.items()
+        if hours or log_count
+    ]
+    if params:
+        # Same order for every writer so concurrent upserts lock rows consistently
+        params.sort(key=lambda row: (row["b_user_id"], row["b_task_id"] or 0, row["b_day"]))
+        await db.execute(_upsert(db.get_bind().dialect.name), params)
+
+
+async def move_task_rollups(db: AsyncSession, task_projects: Dict[int, Optional[int]]):
+    """Follow tasks that moved to another project."""
+    for task_id, project_id in task_projects.items():
+        await db.execute(
+            update(_rollups).where(_rollups.c.task_id == task_id).values(project_id=project_id)
+        )
+
+
+async def detach_task_rollups(db: AsyncSession, task_ids: Iterable[int]):
+    """Mirror deleted tasks: their logs keep their hours but lose task and project.
+
+    The rows are merged into each user's row of detached hours for the day,
+    which earlier deletions may already have created.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    detached = (
+        select(
+            _rollups.c.user_id,
+            null(),
+            null(),
+            _rollups.c.day,
+            func.sum(_rollups.c.hours),
+            func.sum(_rollups.c.log_count),
+        )
+        .where(_rollups.c.task_id.in_(task_ids))
+        .group_by(_rollups.c.user_id, _rollups.c.day)
+    )
+    merge = _dialect_insert(db.get_bind().dialect.name).from_select(
+        ["user_id", "task_id", "project_id", "day", "hours", "log_count"], detached
+    )
+    await db.execute(_add_to_existing(merge))
+    await db.execute(delete(_rollups).where(_rollups.c.task_id.in_(task_ids)))
+
+
+async def detach_project_rollups(db: AsyncSession, project_id: int):
+    """Mirror a deleted project: its tasks are kept without a project."""
+    await db.execute(
+        update(_rollups).where(_rollups.c.project_id == project_id).values(project_id=None)
+    )
+
+
+def backfill(
+    connection: Connection,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    chunk_days: int = BACKFILL_CHUNK_DAYS,
+    report=print,
+) -> int:
+    """Rebuild rollups from time_logs for the range, one committed chunk of days at a time."""
+    dialect = connection.dialect.name
+    day = log_day(dialect, TimeLog.date)
+    if start_date is None or end_date is None:
+        first, last = connection.execute(select(func.min(TimeLog.date), func.max(TimeLog.date))).one()
+        if first is None:
+            return 0
+        # SQLite hands back timestamps as strings
+        start_date = start_date or date.fromisoformat(str(first)[:10])
+        end_date = end_date or date.fromisoformat(str(last)[:10])
+
+    written = 0
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        connection.execute(delete(_rollups).where(_rollups.c.day.between(chunk_start, chunk_end)))
+        logs = (
+            select(
+                TimeLog.user_id,
+                TimeLog.task_id,
+                Task.project_id,
+                day.label("day"),
+                func.sum(TimeLog.hours),
+                func.count(TimeLog.id),
+            )
+            .select_from(TimeLog)
+            .outerjoin(Task, Task.id == TimeLog.task_id)
+            .where(
+                TimeLog.user_id.isnot(None),
+                TimeLog.date >= datetime.combine(chunk_start, time.min),
+                TimeLog.date < datetime.combine(chunk_end + timedelta(days=1), time.min),
+            )
+            .group_by(TimeLog.user_id, TimeLog.task_id, Task.project_id, day)
+        )
+        result = connection.execute(
+            insert(_rollups).from_select(
+                ["user_id", "task_id", "project_id", "day", "hours", "log_count"], logs
+            )
+        )
+        connection.commit()
+        written += max(result.rowcount, 0)
+        if report:
+            report(f"   {chunk_start} .. {chunk_end}: {result.rowcount} rollup rows")
+        chunk_start = chunk_end + timedelta(days=1)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily time log rollups from the raw time logs.")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="first day to rebuild (default: oldest log)")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="last day to rebuild (default: newest log)")
+    parser.add_argument("--chunk-days", type=int, default=BACKFILL_CHUNK_DAYS, help="days rebuilt per transaction")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    from .database import engine
+
+    print("📦 Rebuilding time log rollups...")
+    with engine.connect() as connection:
+        written = backfill(
+            connection,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            chunk_days=args.chunk_days,
+            report=None if args.quiet else print,
+        )
+    print(f"✅ Wrote {written} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Per-user time summaries.
+
+A summary is a single GROUP BY over the user's daily rollups (or, for a
+single day or with rollups disabled, the raw time logs) in the requested
+date range, joined to task and project titles. The range is applied to the
+indexed day/date column, and the total is the sum of the groups, so it
+always matches the same period.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .metrics import _as_date
+from .models import Project, Task, TimeLog, TimeLogDailyRollup
+from .time_rollups import use_rollups
+
+SUMMARY_GROUPINGS = ("task", "project", "day", "week")
+
+
+def date_range_filters(column, start_date: Optional[date], end_date: Optional[date]) -> list:
+    """Index-friendly ``start_date <= column < end_date + 1 day`` predicates."""
+    filters = []
+    if start_date:
+        filters.append(column >= datetime.combine(start_date, time.min))
+    if end_date:
+        filters.append(column < datetime.combine(end_date + timedelta(days=1), time.min))
+    return filters
+
+
+def week_start(dialect: str, column):
+    """SQL expression for the Monday that starts the ISO week of ``column``."""
+    if dialect == "sqlite":
+        return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    return func.date(func.date_trunc(literal_column("'week'"), column))
+
+
+def _summary_statement(dialect: str, group_by: str, user_id: int, start_date, end_date, rollups: bool):
+    if rollups:
+        source = TimeLogDailyRollup
+        task_id, project_id, day, hours = (
+            TimeLogDailyRollup.task_id, TimeLogDailyRollup.project_id, TimeLogDailyRollup.day, TimeLogDailyRollup.hours
+        )
+        filters = [TimeLogDailyRollup.user_id == user_id]
+        if start_date:
+            filters.append(TimeLogDailyRollup.day >= start_date)
+        if end_date:
+            filters.append(TimeLogDailyRollup.day <= end_date)
+    else:
+        source = TimeLog
+        task_id, project_id, day, hours = TimeLog.task_id, Task.project_id, func.date(TimeLog.date), TimeLog.hours
+        filters = [TimeLog.user_id == user_id, *date_range_filters(TimeLog.date, start_date, end_date)]
+
+    if group_by == "task":
+        columns = [
+            task_id.label("task_id"),
+            Task.title.label("task_title"),
+            project_id.label("project_id"),
+            Project.title.label("project_title"),
+        ]
+    elif group_by == "project":
+        columns = [project_id.label("project_id"), Project.title.label("project_title")]
+    elif group_by == "day":
+        columns = [day.label("day")]
+    else:
+        columns = [week_start(dialect, day).label("week")]
+
+    stmt = (
+        select(*columns, func.sum(hours).label("total_hours"))
+        .select_from(source)
+        .outerjoin(Task, Task.id == task_id)
+        .outerjoin(Project, Project.id == project_id)
+        .where(*filters)
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+    if rollups:
+        # Rows whose logs were all deleted or moved stay behind with zero logs
+        stmt = stmt.having(func.sum(TimeLogDailyRollup.log_count) > 0)
+    return stmt
+
+
+async def summarize_user_time(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = "task",
+) -> Dict:
+    """Hours logged by ``user_id`` in the period, grouped by task, project, day or week."""
+    if group_by not in SUMMARY_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(SUMMARY_GROUPINGS)}")
+
+    stmt = _summary_statement(
+        db.get_bind().dialect.name, group_by, user_id, start_date, end_date,
+        rollups=use_rollups(start_date, end_date),
+    )
+
+    groups: List[Dict] = []
+    for row in (await db.execute(stmt)).mappings():
+        group = dict(row)
+        group["total_hours"] = int(group["total_hours"] or 0)
+        if group_by in ("day", "week") and group[group_by] is not None:
+            group[group_by] = _as_date(group[group_by])
+        groups.append(group)
+
+    return {
+        "user_id": user_id,
+        "total_hours": sum(group["total_hours"] for group in groups),
+        "group_by": group_by,
+        f"{group_by}_summary": groups,
+        "period": {
+            "start_date": start_date,
+            "end_date": end_date
+        }
+    }
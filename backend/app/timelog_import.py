@@ -0,0 +1,237 @@
+"""
+Streaming time log import from CSV or NDJSON request bodies.
+
+The body is decoded and split into records as chunks arrive, so the upload is
+never held in memory. Records are validated and authorised a batch at a
+time (one task/user lookup per batch) and bulk-inserted; each batch's hours
+are added to the affected tasks' actual_hours and the daily rollups with
+batched statements in the same transaction. Rows that fail
+validation are reported with their line number and skipped.
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .bulk_load import BULK_LOAD_BATCH_SIZE, BulkLoader
+from .models import Project, Task, TimeLog, User
+from .schemas.timelog import TimeLogImportRow
+from .time_accounting import TimeLogChange, apply_time_log_changes
+
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+}
+CSV_REQUIRED_COLUMNS = {"task_id", "hours", "date"}
+TIMELOG_IMPORT_MAX_ERRORS = 1000
+
+
+def import_format(format: Optional[str], content_type: Optional[str]) -> str:
+    """Pick csv/ndjson from an explicit ``format`` or the request Content-Type."""
+    if format:
+        if format not in ("csv", "ndjson"):
+            raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+        return format
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in IMPORT_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+        )
+    return IMPORT_CONTENT_TYPES[media_type]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream into lines (keeping their newline) as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import body must be UTF-8 encoded")
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Union[dict, str]]]:
+    """Yield ``(line_number, row)`` or ``(line_number, error)`` from CSV lines with a header."""
+    header = None
+    record = ""
+    start = line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        record += line
+        # A quoted field may span lines; wait until the quotes balance
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            missing = CSV_REQUIRED_COLUMNS - set(header)
+            if missing:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"CSV header is missing columns: {', '.join(sorted(missing))}"
+                )
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+    if record:
+        yield start, "Unterminated quoted field"
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Union[dict, str]]]:
+    """Yield ``(line_number, row)`` or ``(line_number, error)`` from NDJSON lines."""
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Each line must be a JSON object"
+            continue
+        yield line_number, row
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+class TimeLogImporter:
+    """Validates and loads streamed time log rows for one user in one transaction."""
+
+    def __init__(self, db: AsyncSession, current_user: User, batch_size: int = BULK_LOAD_BATCH_SIZE, dry_run: bool = False):
+        self.db = db
+        self.current_user = current_user
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self._tasks: Dict[int, Optional[tuple]] = {}  # task id -> (assignee_id, owner_id), None if missing
+        self._users: Dict[int, bool] = {}
+        self.imported = 0
+        self.failed = 0
+        self.total_hours = 0
+        self.affected_tasks = set()
+        self.errors = []
+
+    def _reject(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < TIMELOG_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+    async def _lookup(self, items: List[Tuple[int, TimeLogImportRow]]):
+        """Fetch access info for tasks and users not seen in earlier batches."""
+        task_ids = {item.task_id for _, item in items} - self._tasks.keys()
+        if task_ids:
+            rows = await self.db.execute(
+                select(Task.id, Task.assignee_id, Project.owner_id)
+                .join(Project, Project.id == Task.project_id, isouter=True)
+                .where(Task.id.in_(task_ids))
+            )
+            found = {task_id: (assignee_id, owner_id) for task_id, assignee_id, owner_id in rows}
+            for task_id in task_ids:
+                self._tasks[task_id] = found.get(task_id)
+
+        user_ids = {item.user_id for _, item in items if item.user_id is not None} - self._users.keys()
+        if user_ids:
+            found = set((await self.db.scalars(select(User.id).where(User.id.in_(user_ids)))).all())
+            for user_id in user_ids:
+                self._users[user_id] = user_id in found
+
+    async def _flush(self, items: List[Tuple[int, TimeLogImportRow]]):
+        await self._lookup(items)
+        rows = []
+        for row_number, item in items:
+            access = self._tasks.get(item.task_id)
+            if access is None:
+                self._reject(row_number, "Task not found")
+                continue
+            assignee_id, owner_id = access
+            is_owner = owner_id == self.current_user.id
+            if assignee_id != self.current_user.id and not is_owner:
+                self._reject(row_number, "Not authorized to log time for this task")
+                continue
+            user_id = item.user_id or self.current_user.id
+            if user_id != self.current_user.id:
+                if not is_owner:
+                    self._reject(row_number, "Only the project owner can import time for other users")
+                    continue
+                if not self._users.get(user_id):
+                    self._reject(row_number, "User not found")
+                    continue
+            rows.append({
+                "task_id": item.task_id,
+                "user_id": user_id,
+                "hours": item.hours,
+                "description": item.description or "",
+                "date": item.date,
+            })
+            self.total_hours += item.hours
+            self.affected_tasks.add(item.task_id)
+
+        if rows and not self.dry_run:
+            await self.db.run_sync(
+                lambda session: BulkLoader(session.connection(), batch_size=len(rows), progress=None).load(TimeLog, rows)
+            )
+            await apply_time_log_changes(self.db, (
+                TimeLogChange(row["task_id"], row["user_id"], row["date"].date(), row["hours"], 1) for row in rows
+            ))
+        self.imported += len(rows)
+
+    async def run(self, records: AsyncIterator[Tuple[int, Union[dict, str]]]) -> dict:
+        """Consume parsed records and return the import summary (the caller commits)."""
+        batch = []
+        async for row_number, record in records:
+            if isinstance(record, str):
+                self._reject(row_number, record)
+                continue
+            try:
+                batch.append((row_number, TimeLogImportRow(**record)))
+            except ValidationError as e:
+                self._reject(row_number, _validation_message(e))
+                continue
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+
+        self.errors.sort(key=lambda error: error["row"])
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "total_hours": self.total_hours,
+            "tasks_updated": 0 if self.dry_run else len(self.affected_tasks),
+            "dry_run": self.dry_run,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
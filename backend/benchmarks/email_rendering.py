@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Email Rendering Benchmark
+Measures CPU cost per notification for the precompiled email templates:
+template rendering alone and the full MIME message handed to SMTP.
+
+Usage: python -m benchmarks.email_rendering --messages 20000
+"""
+
+import argparse
+import time
+
+from app.email_service import build_email_message
+from app.email_templates import EMAIL_KINDS, email_templates
+
+SAMPLE_CONTEXTS = {
+    "task_assignment": {
+        "user_name": "Alice <Admin>",
+        "task_title": "Fix login & signup flow",
+        "project_name": "Website",
+        "assigned_by": "Bob",
+    },
+    "task_update": {
+        "user_name": "Alice",
+        "task_title": "Fix login & signup flow",
+        "project_name": "Website",
+        "update_type": "Priority to high Updated",
+        "updated_by": "Bob",
+    },
+    "task_completion": {
+        "user_name": "Alice",
+        "task_title": "Fix login & signup flow",
+        "project_name": "Website",
+        "completed_by": "Bob",
+    },
+    "task_digest": {
+        "user_name": "Alice",
+        "summary": "3 task(s) updated",
+        "changed_by": "Bob",
+        "items": [
+            {"task_title": f"Fix login & signup flow #{n}", "project_name": "Website", "change": "Status to closed"}
+            for n in range(3)
+        ],
+        "more": 0,
+    },
+}
+
+
+def measure(func, messages: int) -> float:
+    """Return microseconds per call of ``func(i)`` over ``messages`` calls."""
+    started = time.perf_counter()
+    for i in range(messages):
+        func(i)
+    return (time.perf_counter() - started) / messages * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"✉️  Email rendering cost ({args.messages} messages per kind)")
+    print(f"{'kind':<16} {'render µs':>10} {'MIME µs':>9} {'html bytes':>11}")
+    for kind in EMAIL_KINDS:
+        context = dict(SAMPLE_CONTEXTS[kind])
+
+        def render(i):
+            context["user_name"] = f"User {i}"
+            return email_templates.render(kind, context)
+
+        def build(i):
+            context["user_name"] = f"User {i}"
+            return build_email_message(kind, f"user{i}@example.com", context)
+
+        render_us = measure(render, args.messages)
+        mime_us = measure(build, max(args.messages // 10, 1))
+        html_bytes = len(email_templates.render(kind, context)[1].encode())
+        print(f"{kind:<16} {render_us:>10.1f} {mime_us:>9.1f} {html_bytes:>11}")
+
+
+if __name__ == "__main__":
+    main()
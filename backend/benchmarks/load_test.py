@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+API Load Test
+Drives the API with a weighted mix of read endpoints and reports throughput
+and p50/p95/p99 latency per endpoint. Runs the app in-process through httpx's
+ASGI transport by default, or against a running server with --base-url.
+Results are written as JSON (tagged with the git commit) so runs can be
+compared across commits with --compare.
+
+Populate the database first with benchmarks.synthetic_data; the load test
+logs in as one of its users.
+
+Usage: python -m benchmarks.load_test --requests 2000 --concurrency 32
+       python -m benchmarks.load_test --base-url http://localhost:8000 --duration 60
+       python -m benchmarks.load_test --compare benchmarks/results/<earlier>.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.synthetic_data import LOADTEST_PASSWORD
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+# Endpoint mix: (name, weight, path builder). Path builders get the RNG and
+# the id ranges discovered at startup.
+def _scenarios():
+    return [
+        ("GET /tasks/", 20, lambda rng, ids: "/tasks/?limit=50"),
+        ("GET /tasks/{id}", 20, lambda rng, ids: f"/tasks/{rng.randint(*ids['tasks'])}"),
+        ("GET /projects/", 10, lambda rng, ids: "/projects/?limit=50"),
+        ("GET /projects/{id}", 5, lambda rng, ids: f"/projects/{rng.randint(*ids['projects'])}"),
+        ("GET /projects/{id}/tasks", 10, lambda rng, ids: f"/projects/{rng.randint(*ids['projects'])}/tasks?limit=50"),
+        ("GET /projects/{id}/summary", 5, lambda rng, ids: f"/projects/{rng.randint(*ids['projects'])}/summary"),
+        ("GET /tasks/{id}/comments", 8, lambda rng, ids: f"/tasks/{rng.randint(*ids['tasks'])}/comments"),
+        ("GET /tasks/{id}/time-logs", 5, lambda rng, ids: f"/tasks/{rng.randint(*ids['tasks'])}/time-logs"),
+        ("GET /tasks/my-tasks/stats", 5, lambda rng, ids: "/tasks/my-tasks/stats"),
+        ("GET /timelog/", 5, lambda rng, ids: "/timelog/"),
+        ("GET /users/me", 5, lambda rng, ids: "/users/me"),
+        ("GET /performance-metrics", 2, lambda rng, ids: "/performance-metrics"),
+    ]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: dict, errors: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for name in sorted(set(latencies) | set(errors)):
+        values = sorted(latencies.get(name, []))
+        endpoints[name] = {
+            "requests": len(values) + errors.get(name, 0),
+            "errors": errors.get(name, 0),
+            "throughput_rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        }
+    all_values = sorted(v for values in latencies.values() for v in values)
+    total_errors = sum(errors.values())
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": {
+            "requests": len(all_values) + total_errors,
+            "errors": total_errors,
+            "throughput_rps": round(len(all_values) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(all_values, 50) * 1000, 2),
+            "p95_ms": round(percentile(all_values, 95) * 1000, 2),
+            "p99_ms": round(percentile(all_values, 99) * 1000, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+async def _discover_ids(client: httpx.AsyncClient, headers: dict) -> dict:
+    """Find usable id ranges from the first page of each list endpoint."""
+    ids = {}
+    for key, path in (("tasks", "/tasks/?limit=1000"), ("projects", "/projects/?limit=1000")):
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        found = [row["id"] for row in response.json()]
+        if not found:
+            raise SystemExit(f"No {key} found; populate the database with benchmarks.synthetic_data first")
+        ids[key] = (min(found), max(found))
+    return ids
+
+
+async def run_load(client: httpx.AsyncClient, args) -> dict:
+    login = await client.post("/auth/login", data={"username": args.username, "password": args.password})
+    if login.status_code != 200:
+        raise SystemExit(f"Login as {args.username} failed ({login.status_code}): {login.text}")
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    ids = await _discover_ids(client, headers)
+
+    scenarios = _scenarios()
+    if args.endpoints:
+        scenarios = [s for s in scenarios if s[0] in args.endpoints]
+    rng = random.Random(args.seed)
+    weights = [weight for _, weight, _ in scenarios]
+
+    latencies = {}
+    errors = {}
+    issued = 0
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def next_request():
+        nonlocal issued
+        if deadline is None and issued >= args.requests:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        issued += 1
+        name, _, build_path = rng.choices(scenarios, weights=weights)[0]
+        return name, build_path(rng, ids)
+
+    async def worker():
+        while (request := next_request()) is not None:
+            name, path = request
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                ok = response.status_code < 400 or response.status_code == 404
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.setdefault(name, []).append(time.perf_counter() - started)
+            else:
+                errors[name] = errors.get(name, 0) + 1
+
+    # Warm up pools and caches before measuring
+    for name, _, build_path in scenarios:
+        await client.get(build_path(rng, ids), headers=headers)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(result: dict, baseline: dict = None):
+    print(f"{'endpoint':<30} {'req':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for name, stats in rows:
+        line = (
+            f"{name:<30} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}"
+        )
+        if baseline:
+            before = baseline["total"] if name == "TOTAL" else baseline["endpoints"].get(name)
+            if before and before["p95_ms"]:
+                change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+                line += f"   p95 {change:+.1f}% vs {baseline['commit']}"
+        print(line)
+
+
+async def _run(args) -> dict:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout, limits=limits) as client:
+            return await run_load(client, args)
+
+    from app.main import app, start_background_jobs, stop_background_jobs
+
+    await start_background_jobs()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            return await run_load(client, args)
+    finally:
+        await stop_background_jobs()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of a fixed count")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--username", default="loaduser1")
+    parser.add_argument("--password", default=LOADTEST_PASSWORD)
+    parser.add_argument("--endpoints", nargs="+", help="only run these endpoint names")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare p95 latency against")
+    args = parser.parse_args()
+
+    target = args.base_url or "in-process app"
+    print(f"🚀 Load testing {target} with {args.concurrency} concurrent clients")
+    summary = asyncio.run(_run(args))
+
+    commit = _git_commit()
+    timestamp = datetime.now(timezone.utc)
+    result = {
+        "commit": commit,
+        "timestamp": timestamp.isoformat(),
+        "target": target,
+        "config": {
+            "requests": args.requests,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        **summary,
+    }
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(result, baseline)
+
+    output = args.output or RESULTS_DIR / f"{timestamp:%Y%m%dT%H%M%S}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"📄 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Password Hashing Benchmark
+Measures login throughput (bcrypt verifications per second) through the
+dedicated hashing pool at different bcrypt cost factors.
+
+Usage: python -m benchmarks.password_hashing --rounds 10 11 12 --logins 64
+"""
+
+import argparse
+import asyncio
+import time
+
+from passlib.context import CryptContext
+
+from app.auth import PASSWORD_HASH_WORKERS, PasswordHashExecutor
+
+
+async def measure_logins(rounds: int, logins: int, concurrency: int, workers: int) -> dict:
+    """Verify ``logins`` passwords ``concurrency`` at a time and report throughput."""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("benchmark-password")
+    hasher = PasswordHashExecutor(workers=workers, max_pending=max(concurrency, workers))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            return await hasher.run(context.verify, "benchmark-password", hashed)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    assert all(results)
+
+    stats = hasher.stats()
+    return {
+        "rounds": rounds,
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(logins / elapsed, 1),
+        "avg_hash_ms": stats["avg_hash_ms"],
+        "avg_queue_wait_ms": stats["avg_queue_wait_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=PASSWORD_HASH_WORKERS)
+    args = parser.parse_args()
+
+    print(f"🔐 bcrypt login throughput ({args.workers} hashing workers, {args.concurrency} concurrent logins)")
+    print(f"{'rounds':>6} {'logins/s':>10} {'hash ms':>9} {'queue ms':>9}")
+    for rounds in args.rounds:
+        result = asyncio.run(measure_logins(rounds, args.logins, args.concurrency, args.workers))
+        print(
+            f"{result['rounds']:>6} {result['logins_per_second']:>10} "
+            f"{result['avg_hash_ms']:>9} {result['avg_queue_wait_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
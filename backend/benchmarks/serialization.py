@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Benchmark
+Measures CPU cost per response for a task list page: FastAPI's default
+response_model path (validate, serialize, json.dumps), the same with orjson,
+and the prebuilt TypeAdapter path used by the hot endpoints (JSON and
+MessagePack).
+
+Usage: python -m benchmarks.serialization --tasks 100 --iterations 2000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.requests import Request
+
+from app.models import Task, TaskPriority, TaskStatus
+from app.responses import render, task_list_adapter
+from app.schemas.task import Task as TaskSchema
+
+
+def sample_tasks(count: int) -> List[Task]:
+    """Build detached ORM tasks shaped like a ``GET /tasks/`` page."""
+    started = datetime(2026, 1, 1, 9, 0)
+    tasks = []
+    for i in range(1, count + 1):
+        task = Task(
+            id=i,
+            title=f"Implement feature #{i}",
+            description=f"Description of task {i} with a little more text to serialize",
+            status=list(TaskStatus)[i % len(TaskStatus)],
+            priority=list(TaskPriority)[i % len(TaskPriority)],
+            estimated_hours=8,
+            actual_hours=i % 13,
+            project_id=i % 7 + 1,
+            assignee_id=i % 11 + 1,
+            created_at=started + timedelta(hours=i),
+            updated_at=started + timedelta(hours=i, minutes=30),
+        )
+        task.assignee_name = f"User {i % 11 + 1}"
+        task.assignee_username = f"user{i % 11 + 1}"
+        tasks.append(task)
+    return tasks
+
+
+def fake_request(accept: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/tasks/", "headers": [(b"accept", accept.encode())]})
+
+
+async def measure(func, iterations: int) -> float:
+    """Return microseconds per call of ``await func()`` over ``iterations`` calls."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def run(task_count: int, iterations: int):
+    tasks = sample_tasks(task_count)
+    field = create_response_field(name="Response_get_tasks", type_=List[TaskSchema])
+    json_request = fake_request("application/json")
+    msgpack_request = fake_request("application/msgpack")
+    headers_only = JSONResponse(content=None)
+
+    async def default_json():
+        content = await serialize_response(field=field, response_content=tasks)
+        return JSONResponse(content).body
+
+    async def default_orjson():
+        content = await serialize_response(field=field, response_content=tasks)
+        return ORJSONResponse(content).body
+
+    async def adapter_json():
+        return render(json_request, headers_only, task_list_adapter, tasks).body
+
+    async def adapter_msgpack():
+        return render(msgpack_request, headers_only, task_list_adapter, tasks).body
+
+    print(f"📦 Serialization cost per response ({task_count} tasks, {iterations} iterations)")
+    print(f"{'path':<28} {'µs/response':>12} {'vs default':>11} {'bytes':>8}")
+    baseline = None
+    for label, func in (
+        ("response_model + json", default_json),
+        ("response_model + orjson", default_orjson),
+        ("TypeAdapter dump_json", adapter_json),
+        ("TypeAdapter msgpack", adapter_msgpack),
+    ):
+        await func()  # warm up
+        micros = await measure(func, iterations)
+        baseline = baseline or micros
+        size = len(await func())
+        print(f"{label:<28} {micros:>12.1f} {baseline / micros:>10.2f}x {size:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100, help="tasks per response")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.tasks, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+Fills the database with production-sized, realistically skewed data for
+load testing: a few users own most projects, a few projects hold most tasks,
+most time is logged on tasks that have left TODO, and task actual_hours match
+their time logs exactly.
+
+All generated users share the password ``loadtest-password`` and are named
+``loaduser<n>``. Rows are streamed in batches, so memory use does not grow
+with the requested volume.
+
+Usage: python -m benchmarks.synthetic_data --scale small
+       python -m benchmarks.synthetic_data --scale production --tasks 1000000
+"""
+
+import argparse
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.auth import get_password_hash
+from app.bulk_load import BULK_LOAD_BATCH_SIZE, BulkLoader, reset_id_sequences
+from app.database import engine
+from app.models import Comment, Project, Task, TaskPriority, TaskStatus, TimeLog, User
+from app.time_rollups import backfill
+
+LOADTEST_PASSWORD = "loadtest-password"
+
+SCALES = {
+    "tiny": {"users": 20, "projects": 50, "tasks": 2_000, "time_logs": 8_000, "comments": 4_000},
+    "small": {"users": 500, "projects": 2_500, "tasks": 100_000, "time_logs": 400_000, "comments": 200_000},
+    "medium": {"users": 2_000, "projects": 10_000, "tasks": 1_000_000, "time_logs": 4_000_000, "comments": 2_000_000},
+    "production": {"users": 10_000, "projects": 50_000, "tasks": 5_000_000, "time_logs": 20_000_000, "comments": 10_000_000},
+}
+
+# Share of tasks per status and priority
+STATUS_WEIGHTS = {
+    TaskStatus.TODO: 25,
+    TaskStatus.IN_PROGRESS: 20,
+    TaskStatus.REVIEW: 8,
+    TaskStatus.READY_TO_TEST: 5,
+    TaskStatus.IN_TEST: 7,
+    TaskStatus.CLOSED: 35,
+}
+PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 20,
+    TaskPriority.MEDIUM: 50,
+    TaskPriority.HIGH: 25,
+    TaskPriority.URGENT: 5,
+}
+PROJECT_STATUS_WEIGHTS = {"active": 70, "completed": 15, "on_hold": 10, "cancelled": 5}
+
+# Share of comments attached to a task rather than a project
+TASK_COMMENT_SHARE = 0.8
+
+HISTORY_DAYS = 365
+
+WORDS = (
+    "api auth billing board cache checkout dashboard deploy docs export feed form import "
+    "invoice login mobile onboarding payment profile report search settings signup sync "
+    "timeline upload webhook widget"
+).split()
+VERBS = "Add Build Fix Refactor Review Test Document Migrate Optimize Design".split()
+
+
+def zipf_cum_weights(count: int, skew: float = 1.1) -> list:
+    """Cumulative weights for picking ids 1..count with a Zipf-like skew."""
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+class WeightedPicker:
+    """Draws ids (or values) in chunks to keep per-row overhead low."""
+
+    def __init__(self, rng: random.Random, population, weights=None, cum_weights=None, chunk: int = 4096):
+        self.rng = rng
+        self.population = list(population)
+        self.weights = weights
+        self.cum_weights = cum_weights
+        self.chunk = chunk
+        self._buffer = []
+
+    def __call__(self):
+        if not self._buffer:
+            self._buffer = self.rng.choices(
+                self.population, weights=self.weights, cum_weights=self.cum_weights, k=self.chunk
+            )
+        return self._buffer.pop()
+
+
+def _phrase(rng: random.Random) -> str:
+    return f"{rng.choice(VERBS)} {rng.choice(WORDS)} {rng.choice(WORDS)}"
+
+
+def _next_id(connection, model) -> int:
+    return (connection.execute(select(func.coalesce(func.max(model.id), 0))).scalar() or 0) + 1
+
+
+class SyntheticDataGenerator:
+    """Streams synthetic users, projects, tasks, time logs and comments into the database."""
+
+    def __init__(self, counts: dict, seed: int = 42, batch_size: int = BULK_LOAD_BATCH_SIZE, now: datetime = None):
+        self.counts = counts
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.now = now or datetime.utcnow()
+
+    def _random_datetime(self, earliest: datetime) -> datetime:
+        span = max((self.now - earliest).total_seconds(), 1)
+        return earliest + timedelta(seconds=self.rng.random() * span)
+
+    def generate_users(self, first_id: int):
+        hashed_password = get_password_hash(LOADTEST_PASSWORD)
+        start = self.now - timedelta(days=HISTORY_DAYS)
+        for user_id in range(first_id, first_id + self.counts["users"]):
+            yield {
+                "id": user_id,
+                "username": f"loaduser{user_id}",
+                "email": f"loaduser{user_id}@example.com",
+                "full_name": f"Load User {user_id}",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "created_at": self._random_datetime(start),
+            }
+
+    def generate_projects(self, first_id: int, user_ids: range):
+        pick_owner = WeightedPicker(self.rng, user_ids, cum_weights=zipf_cum_weights(len(user_ids)))
+        pick_status = WeightedPicker(self.rng, PROJECT_STATUS_WEIGHTS, weights=list(PROJECT_STATUS_WEIGHTS.values()))
+        start = self.now - timedelta(days=HISTORY_DAYS)
+        for project_id in range(first_id, first_id + self.counts["projects"]):
+            created_at = self._random_datetime(start)
+            yield {
+                "id": project_id,
+                "title": f"{self.rng.choice(WORDS).title()} {self.rng.choice(WORDS)} #{project_id}",
+                "description": f"Synthetic project {project_id}",
+                "status": pick_status(),
+                "start_date": created_at,
+                "end_date": created_at + timedelta(days=self.rng.randint(14, 180)),
+                "owner_id": pick_owner(),
+                "created_at": created_at,
+            }
+
+    def generate_tasks_and_time_logs(self, first_task_id: int, first_log_id: int, user_ids: range, project_ids: range):
+        """Yield ``(task, [time_log, ...])`` with actual_hours equal to the logged total."""
+        pick_project = WeightedPicker(self.rng, project_ids, cum_weights=zipf_cum_weights(len(project_ids), skew=0.9))
+        pick_assignee = WeightedPicker(self.rng, user_ids, cum_weights=zipf_cum_weights(len(user_ids), skew=0.7))
+        pick_status = WeightedPicker(self.rng, STATUS_WEIGHTS, weights=list(STATUS_WEIGHTS.values()))
+        pick_priority = WeightedPicker(self.rng, PRIORITY_WEIGHTS, weights=list(PRIORITY_WEIGHTS.values()))
+
+        task_count = self.counts["tasks"]
+        logs_remaining = self.counts["time_logs"]
+        # Time is only logged on tasks that have started; spread the target evenly over them
+        started_share = 1 - STATUS_WEIGHTS[TaskStatus.TODO] / sum(STATUS_WEIGHTS.values())
+        logs_per_started_task = self.counts["time_logs"] / max(task_count * started_share, 1)
+
+        start = self.now - timedelta(days=HISTORY_DAYS)
+        log_id = first_log_id
+        for task_id in range(first_task_id, first_task_id + task_count):
+            status = pick_status()
+            assignee_id = pick_assignee() if self.rng.random() < 0.9 else None
+            created_at = self._random_datetime(start)
+            updated_at = self._random_datetime(created_at) if status != TaskStatus.TODO else None
+            estimated_hours = self.rng.choice((2, 4, 8, 8, 16, 24, 40))
+
+            logs = []
+            if status != TaskStatus.TODO and logs_remaining > 0:
+                count = min(int(self.rng.expovariate(1 / logs_per_started_task) + 0.5), logs_remaining)
+                logs_remaining -= count
+                for _ in range(count):
+                    logged_at = self._random_datetime(created_at)
+                    logs.append({
+                        "id": log_id,
+                        "task_id": task_id,
+                        "user_id": assignee_id or pick_assignee(),
+                        "hours": self.rng.randint(1, 8),
+                        "description": f"Work on task {task_id}",
+                        "date": logged_at,
+                        "created_at": logged_at,
+                    })
+                    log_id += 1
+
+            yield {
+                "id": task_id,
+                "title": f"{_phrase(self.rng)} #{task_id}",
+                "description": f"Synthetic task {task_id}",
+                "status": status,
+                "priority": pick_priority(),
+                "estimated_hours": estimated_hours,
+                "actual_hours": sum(log["hours"] for log in logs),
+                "project_id": pick_project(),
+                "assignee_id": assignee_id,
+                "created_at": created_at,
+                "updated_at": updated_at,
+            }, logs
+
+    def generate_comments(self, first_id: int, user_ids: range, project_ids: range, task_ids: range):
+        pick_user = WeightedPicker(self.rng, user_ids, cum_weights=zipf_cum_weights(len(user_ids), skew=0.8))
+        pick_task = WeightedPicker(self.rng, task_ids, cum_weights=zipf_cum_weights(len(task_ids), skew=0.6))
+        pick_project = WeightedPicker(self.rng, project_ids, cum_weights=zipf_cum_weights(len(project_ids), skew=0.9))
+        start = self.now - timedelta(days=HISTORY_DAYS)
+        for comment_id in range(first_id, first_id + self.counts["comments"]):
+            on_task = self.rng.random() < TASK_COMMENT_SHARE
+            yield {
+                "id": comment_id,
+                "content": f"{_phrase(self.rng)} looks good, see {self.rng.choice(WORDS)}",
+                "user_id": pick_user(),
+                "task_id": pick_task() if on_task else None,
+                "project_id": None if on_task else pick_project(),
+                "created_at": self._random_datetime(start),
+            }
+
+    def run(self):
+        """Generate every table in dependency order inside one transaction."""
+        with engine.begin() as connection:
+            loader = BulkLoader(connection, batch_size=self.batch_size)
+            first_user = _next_id(connection, User)
+            first_project = _next_id(connection, Project)
+            first_task = _next_id(connection, Task)
+            first_log = _next_id(connection, TimeLog)
+            first_comment = _next_id(connection, Comment)
+            user_ids = range(first_user, first_user + self.counts["users"])
+            project_ids = range(first_project, first_project + self.counts["projects"])
+            task_ids = range(first_task, first_task + self.counts["tasks"])
+
+            loader.load(User, self.generate_users(first_user))
+            loader.load(Project, self.generate_projects(first_project, user_ids))
+
+            # Time logs are generated alongside their tasks; buffer them per task
+            # batch and load them once the tasks they reference are in place
+            pending_logs = []
+
+            def tasks():
+                for task, logs in self.generate_tasks_and_time_logs(first_task, first_log, user_ids, project_ids):
+                    pending_logs.extend(logs)
+                    yield task
+
+            task_rows = tasks()
+            loaded_tasks = loaded_logs = 0
+            while True:
+                chunk = list(itertools.islice(task_rows, self.batch_size * 20))
+                if not chunk:
+                    break
+                loaded_tasks += loader.load(Task, chunk)
+                loaded_logs += loader.load(TimeLog, pending_logs, label="time_logs")
+                pending_logs.clear()
+            print(f"   total: {loaded_tasks:,} tasks, {loaded_logs:,} time logs")
+
+            loader.load(Comment, self.generate_comments(first_comment, user_ids, project_ids, task_ids))
+            reset_id_sequences(connection, User, Project, Task, TimeLog, Comment)
+
+        # Bulk-loaded logs bypass the write path that maintains the rollups
+        print("   rebuilding daily time log rollups")
+        with engine.connect() as connection:
+            backfill(connection, report=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="tiny")
+    for table in ("users", "projects", "tasks", "time_logs", "comments"):
+        parser.add_argument(f"--{table.replace('_', '-')}", dest=table, type=int, help=f"override the {table} count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=BULK_LOAD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    counts = dict(SCALES[args.scale])
+    for table in counts:
+        if getattr(args, table) is not None:
+            counts[table] = getattr(args, table)
+
+    print(f"🌱 Generating synthetic data ({args.scale}): " + ", ".join(f"{n:,} {t}" for t, n in counts.items()))
+    started = time.perf_counter()
+    SyntheticDataGenerator(counts, seed=args.seed, batch_size=args.batch_size).run()
+    print(f"🎉 Done in {time.perf_counter() - started:.1f}s (login as loaduser<n> / {LOADTEST_PASSWORD})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+
+from alembic import context
+
+from app.database import DATABASE_URL
+from app.models import Base, SQLITE_SEARCH_COLUMNS
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# FTS5 mirrors and their shadow tables (<table>_fts, <table>_fts_data, ...)
+_SEARCH_TABLES = tuple(f"{table}_fts" for table in SQLITE_SEARCH_COLUMNS)
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Leave the SQLite full-text search tables out of autogenerate."""
+    if type_ == "table":
+        return not any(name == fts or name.startswith(f"{fts}_") for fts in _SEARCH_TABLES)
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode, emitting SQL to the script output."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode against DATABASE_URL."""
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
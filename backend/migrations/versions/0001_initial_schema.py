@@ -0,0 +1,117 @@
+"""Initial schema
+
+Creates the tables that were previously built by ``Base.metadata.create_all``.
+Tables that already exist are left untouched, so databases created before
+migrations were introduced can be upgraded in place.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_initial_schema"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_status = sa.Enum(
+    "TODO", "IN_PROGRESS", "REVIEW", "READY_TO_TEST", "IN_TEST", "CLOSED", name="taskstatus"
+)
+task_priority = sa.Enum("LOW", "MEDIUM", "HIGH", "URGENT", name="taskpriority")
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String()),
+            sa.Column("username", sa.String()),
+            sa.Column("full_name", sa.String()),
+            sa.Column("hashed_password", sa.String()),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    if "projects" not in existing:
+        op.create_table(
+            "projects",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String()),
+            sa.Column("description", sa.Text()),
+            sa.Column("status", sa.String()),
+            sa.Column("start_date", sa.DateTime()),
+            sa.Column("end_date", sa.DateTime()),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_projects_id", "projects", ["id"])
+        op.create_index("ix_projects_title", "projects", ["title"])
+
+    if "tasks" not in existing:
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String()),
+            sa.Column("description", sa.Text()),
+            sa.Column("status", task_status),
+            sa.Column("priority", task_priority),
+            sa.Column("estimated_hours", sa.Integer()),
+            sa.Column("actual_hours", sa.Integer()),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id")),
+            sa.Column("assignee_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+        op.create_index("ix_tasks_title", "tasks", ["title"])
+
+    if "time_logs" not in existing:
+        op.create_table(
+            "time_logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id")),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("hours", sa.Integer()),
+            sa.Column("description", sa.Text()),
+            sa.Column("date", sa.DateTime()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_time_logs_id", "time_logs", ["id"])
+
+    if "comments" not in existing:
+        op.create_table(
+            "comments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id"), nullable=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_comments_id", "comments", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("comments")
+    op.drop_table("time_logs")
+    op.drop_table("tasks")
+    op.drop_table("projects")
+    op.drop_table("users")
+    task_priority.drop(op.get_bind(), checkfirst=True)
+    task_status.drop(op.get_bind(), checkfirst=True)
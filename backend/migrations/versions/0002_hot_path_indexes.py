@@ -0,0 +1,39 @@
+"""Composite indexes for hot filter paths
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_hot_path_indexes"
+down_revision: Union[str, None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); kept in sync with __table_args__ in app/models.py
+INDEXES = [
+    ("ix_projects_owner_id", "projects", ["owner_id"]),
+    ("ix_tasks_project_id_status", "tasks", ["project_id", "status"]),
+    ("ix_tasks_assignee_id_status", "tasks", ["assignee_id", "status"]),
+    ("ix_tasks_status_updated_at", "tasks", ["status", "updated_at"]),
+    ("ix_time_logs_task_id_date", "time_logs", ["task_id", "date"]),
+    ("ix_time_logs_user_id_date", "time_logs", ["user_id", "date"]),
+    ("ix_comments_task_id_created_at", "comments", ["task_id", "created_at"]),
+    ("ix_comments_project_id_created_at", "comments", ["project_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
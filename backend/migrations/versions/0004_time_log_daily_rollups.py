@@ -0,0 +1,57 @@
+"""Daily time log rollups
+
+Revision ID: 0004_time_log_daily_rollups
+Revises: 0003_email_outbox
+Create Date: 2026-10-18 00:00:03
+
+The table is filled from the existing time logs with one INSERT ... SELECT
+... GROUP BY, so reports that read rollups are right as soon as the upgrade
+finishes. ``python -m app.time_rollups`` rebuilds them later if needed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_time_log_daily_rollups"
+down_revision: Union[str, None] = "0003_email_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "time_log_daily_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer()),
+        sa.Column("project_id", sa.Integer()),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("hours", sa.Integer(), nullable=False),
+        sa.Column("log_count", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ux_time_log_daily_rollups_user_task_day", "time_log_daily_rollups", ["user_id", "task_id", "day"], unique=True
+    )
+    op.create_index("ix_time_log_daily_rollups_user_id_day", "time_log_daily_rollups", ["user_id", "day"])
+    op.create_index("ix_time_log_daily_rollups_project_id_day", "time_log_daily_rollups", ["project_id", "day"])
+    op.create_index("ix_time_log_daily_rollups_day", "time_log_daily_rollups", ["day"])
+
+    # Same grouping as app.time_rollups.backfill
+    day = "date(l.date)" if op.get_bind().dialect.name == "sqlite" else "CAST(l.date AS DATE)"
+    op.execute(
+        f"""
+        INSERT INTO time_log_daily_rollups (user_id, task_id, project_id, day, hours, log_count)
+        SELECT l.user_id, l.task_id, t.project_id, {day}, sum(l.hours), count(l.id)
+        FROM time_logs l
+        LEFT JOIN tasks t ON t.id = l.task_id
+        WHERE l.user_id IS NOT NULL
+        GROUP BY l.user_id, l.task_id, t.project_id, {day}
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("time_log_daily_rollups")
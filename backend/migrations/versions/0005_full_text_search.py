@@ -0,0 +1,77 @@
+"""Full-text search indexes
+
+Revision ID: 0005_full_text_search
+Revises: 0004_time_log_daily_rollups
+Create Date: 2026-10-18 00:00:04
+
+PostgreSQL gets GIN indexes over weighted tsvector documents, built
+CONCURRENTLY so writes continue while large tables are indexed. SQLite gets
+FTS5 tables mirroring the same columns, kept in sync by triggers and filled
+from the existing rows.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_full_text_search"
+down_revision: Union[str, None] = "0004_time_log_daily_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, [(column, weight)]); kept in sync with search_vector() in app/models.py
+SEARCH_DOCUMENTS = [
+    ("ix_tasks_search", "tasks", [("title", "A"), ("description", "B")]),
+    ("ix_projects_search", "projects", [("title", "A"), ("description", "B")]),
+    ("ix_comments_search", "comments", [("content", "B")]),
+]
+
+
+def _tsvector(weighted_columns) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('english'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def _sqlite_ddl(table: str, columns) -> list:
+    # Same statements as sqlite_search_ddl() in app/models.py
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    remove = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    add = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {add} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {remove} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {remove} {add} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, weighted_columns in SEARCH_DOCUMENTS:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin (({_tsvector(weighted_columns)}))"
+                )
+    elif dialect == "sqlite":
+        for _, table, weighted_columns in SEARCH_DOCUMENTS:
+            for statement in _sqlite_ddl(table, [column for column, _ in weighted_columns]):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for name, table, _ in reversed(SEARCH_DOCUMENTS):
+        if dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        elif dialect == "sqlite":
+            for trigger in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
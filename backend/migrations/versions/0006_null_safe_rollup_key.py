@@ -0,0 +1,55 @@
+"""NULL-safe unique key for daily time log rollups
+
+Revision ID: 0006_null_safe_rollup_key
+Revises: 0005_full_text_search
+Create Date: 2026-10-18 00:00:05
+
+Rollups of deleted tasks have a NULL task_id, and NULLs never conflict in a
+unique index, so such rows were inserted again instead of being added to.
+Duplicates are merged and the key indexes coalesce(task_id, 0) instead.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_null_safe_rollup_key"
+down_revision: Union[str, None] = "0005_full_text_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ux_time_log_daily_rollups_user_task_day"
+TABLE = "time_log_daily_rollups"
+
+
+def upgrade() -> None:
+    # Fold every (user, NULL task, day) group into its oldest row
+    for column in ("hours", "log_count"):
+        op.execute(
+            f"""
+            UPDATE {TABLE} SET {column} = (
+                SELECT sum(d.{column}) FROM {TABLE} d
+                WHERE d.task_id IS NULL AND d.user_id = {TABLE}.user_id AND d.day = {TABLE}.day
+            )
+            WHERE task_id IS NULL AND id IN (
+                SELECT min(id) FROM {TABLE} WHERE task_id IS NULL GROUP BY user_id, day HAVING count(*) > 1
+            )
+            """
+        )
+    op.execute(
+        f"""
+        DELETE FROM {TABLE}
+        WHERE task_id IS NULL AND id NOT IN (
+            SELECT min(id) FROM {TABLE} WHERE task_id IS NULL GROUP BY user_id, day
+        )
+        """
+    )
+    op.drop_index(INDEX, table_name=TABLE)
+    op.create_index(INDEX, TABLE, ["user_id", sa.text("coalesce(task_id, 0)"), "day"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name=TABLE)
+    op.create_index(INDEX, TABLE, ["user_id", "task_id", "day"], unique=True)
@@ -0,0 +1,77 @@
+"""
+Shared test fixtures.
+
+Each test gets its own SQLite file database with the full schema, so tests
+neither need a running server database nor see each other's rows. The
+``client`` fixture serves the app from that database; authenticate requests
+with ``factories.auth_headers(user)``.
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import export
+from app import models  # noqa: F401  (registers the tables on Base)
+from app.auth import user_cache
+from app.database import Base, get_async_db, get_db
+from app.main import app
+from app.metrics_store import metrics_store
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest_asyncio.fixture
+async def db_engine(db_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    # Same options as app.database.AsyncSessionLocal
+    return async_sessionmaker(db_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def sync_session_factory(db_engine, db_path):
+    """Sync sessions on the same database, for code that runs on app.database.SessionLocal."""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(session_factory, sync_session_factory, monkeypatch):
+    async def test_async_db():
+        async with session_factory() as db:
+            yield db
+
+    def test_db():
+        db = sync_session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # Process-wide caches must not carry rows over from another test's database
+    user_cache.clear()
+    metrics_store.invalidate()
+    app.dependency_overrides[get_async_db] = test_async_db
+    app.dependency_overrides[get_db] = test_db
+    # Streaming exports open their own session once the endpoint has returned
+    monkeypatch.setattr(export, "AsyncSessionLocal", session_factory)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+    user_cache.clear()
+    metrics_store.invalidate()
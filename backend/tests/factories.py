@@ -0,0 +1,49 @@
+"""
+Row factories and request helpers for tests.
+
+Factories add and flush, so ids are set; the caller commits.
+"""
+
+from datetime import datetime
+
+from app.auth import create_access_token
+from app.models import Project, Task, TimeLog, User
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.username})}"}
+
+
+async def create_user(db, username: str, **fields) -> User:
+    user = User(
+        email=f"{username}@example.com",
+        username=username,
+        full_name=username.title(),
+        hashed_password="x",
+        **fields,
+    )
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def create_project(db, owner: User, title: str = "Website", **fields) -> Project:
+    project = Project(title=title, owner_id=owner.id, **fields)
+    db.add(project)
+    await db.flush()
+    return project
+
+
+async def create_task(db, project: Project, title: str = "Task", **fields) -> Task:
+    task = Task(title=title, project_id=project.id, **fields)
+    db.add(task)
+    await db.flush()
+    return task
+
+
+async def create_time_log(db, task: Task, user: User, hours: int, date: datetime, **fields) -> TimeLog:
+    """Insert the row only: unlike the API, this leaves actual_hours and rollups alone."""
+    time_log = TimeLog(task_id=task.id, user_id=user.id, hours=hours, date=date, **fields)
+    db.add(time_log)
+    await db.flush()
+    return time_log
@@ -0,0 +1,89 @@
+"""
+The authenticated-user cache: what it keeps and when it lets go.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.auth import user_cache
+from app.models import User
+
+from .factories import auth_headers, create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def alice(session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        await db.commit()
+    return alice
+
+
+async def _me(client, user):
+    return await client.get("/users/me", headers=auth_headers(user))
+
+
+async def _update_alice(session_factory, **values):
+    async with session_factory() as db:
+        user = (await db.execute(select(User).where(User.username == "alice"))).scalar_one()
+        for field, value in values.items():
+            setattr(user, field, value)
+        await db.commit()
+
+
+async def test_cached_user_has_no_credentials(client, alice):
+    assert (await _me(client, alice)).status_code == 200
+    cached = user_cache.get("alice")
+    assert cached["id"] == alice.id
+    assert "hashed_password" not in cached
+
+
+async def test_cache_hit_user_can_still_be_updated(client, session_factory, alice):
+    await _me(client, alice)
+    response = await client.put("/users/me", json={"full_name": "Alice Liddell"}, headers=auth_headers(alice))
+    assert response.status_code == 200
+    async with session_factory() as db:
+        user = await db.get(User, alice.id)
+        assert (user.full_name, user.hashed_password) == ("Alice Liddell", "x")
+
+
+async def test_deactivated_user_is_evicted(client, session_factory, alice):
+    await _me(client, alice)
+    assert user_cache.get("alice") is not None
+
+    await _update_alice(session_factory, is_active=False)
+
+    assert user_cache.get("alice") is None
+    assert (await _me(client, alice)).status_code == 400
+
+
+async def test_password_change_evicts_user(client, session_factory, alice):
+    await _me(client, alice)
+    await _update_alice(session_factory, hashed_password="changed")
+    assert user_cache.get("alice") is None
+
+    # The same through the API, on a cache hit
+    await _me(client, alice)
+    response = await client.put("/users/me", json={"password": "n3w-secret"}, headers=auth_headers(alice))
+    assert response.status_code == 200
+    assert user_cache.get("alice") is None
+
+
+async def test_renamed_user_is_evicted_under_the_old_name(client, session_factory, alice):
+    await _me(client, alice)
+    await _update_alice(session_factory, username="alice2")
+    assert user_cache.get("alice") is None
+    assert (await _me(client, alice)).status_code == 401
+
+
+async def test_rolled_back_change_keeps_the_entry(client, session_factory, alice):
+    await _me(client, alice)
+    async with session_factory() as db:
+        user = await db.get(User, alice.id)
+        user.is_active = False
+        await db.flush()
+        await db.rollback()
+    assert user_cache.get("alice")["is_active"] is True
@@ -0,0 +1,156 @@
+"""
+Email outbox delivery against a local SMTP server (aiosmtpd).
+"""
+
+import socket
+from datetime import datetime, timedelta
+from email import message_from_bytes
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select, update
+
+from app.email_outbox import OUTBOX_RETRY_BASE_SECONDS, OutboxDispatcher, enqueue_email
+from app.models import EmailOutbox, Project, Task, User
+
+pytestmark = pytest.mark.asyncio
+
+ASSIGNMENT = {
+    "user_name": "Alice",
+    "task_title": "Fix login & signup flow",
+    "project_name": "Website",
+    "assigned_by": "Bob",
+}
+
+
+class RecordingHandler:
+    """Accepts messages, or answers 451 while ``failures`` is above zero."""
+
+    def __init__(self):
+        self.messages = []
+        self.failures = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.failures:
+            self.failures -= 1
+            return "451 Try again later"
+        self.messages.append(message_from_bytes(envelope.content))
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+@pytest.fixture
+def dispatcher(session_factory, smtp_server):
+    _, port = smtp_server
+    return OutboxDispatcher(
+        session_factory=session_factory,
+        smtp_factory=lambda: aiosmtplib.SMTP(hostname="127.0.0.1", port=port, start_tls=False),
+        max_attempts=3,
+    )
+
+
+async def _outbox(session_factory):
+    async with session_factory() as db:
+        return (await db.execute(select(EmailOutbox).order_by(EmailOutbox.id))).scalars().all()
+
+
+async def _make_due(session_factory):
+    """Pretend the retry delay has passed."""
+    async with session_factory() as db:
+        await db.execute(update(EmailOutbox).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+        await db.commit()
+
+
+async def _enqueue(session_factory, recipient="alice@example.com"):
+    async with session_factory() as db:
+        enqueue_email(db, "task_assignment", recipient, **ASSIGNMENT)
+        await db.commit()
+
+
+async def test_email_is_queued_with_the_change_and_delivered(session_factory, smtp_server, dispatcher):
+    handler, _ = smtp_server
+    async with session_factory() as db:
+        alice = User(email="alice@example.com", username="alice", full_name="Alice", hashed_password="x")
+        db.add(alice)
+        await db.flush()
+        project = Project(title="Website", owner_id=alice.id)
+        db.add(project)
+        await db.flush()
+        db.add(Task(title="Fix login & signup flow", project_id=project.id, assignee_id=alice.id))
+        enqueue_email(db, "task_assignment", alice.email, **ASSIGNMENT)
+        await db.commit()
+
+    # A rolled back change leaves no email behind
+    async with session_factory() as db:
+        db.add(Task(title="Never saved", project_id=project.id))
+        enqueue_email(db, "task_assignment", "bob@example.com", **ASSIGNMENT)
+        await db.rollback()
+
+    assert await dispatcher.dispatch_once() == 1
+
+    [message] = await _outbox(session_factory)
+    assert (message.status, message.attempts) == ("sent", 1)
+    assert message.sent_at is not None
+    [email] = handler.messages
+    assert email["To"] == "alice@example.com"
+    assert email.get_content_type() == "multipart/alternative"
+    assert [part.get_content_type() for part in email.get_payload()] == ["text/plain", "text/html"]
+    assert await dispatcher.dispatch_once() == 0
+
+
+async def test_failed_email_is_retried_with_backoff(session_factory, smtp_server, dispatcher):
+    handler, _ = smtp_server
+    handler.failures = 2
+    await _enqueue(session_factory)
+
+    for attempt in (1, 2):
+        started = datetime.utcnow()
+        assert await dispatcher.dispatch_once() == 1
+        [message] = await _outbox(session_factory)
+        assert (message.status, message.attempts) == ("pending", attempt)
+        assert "451" in message.last_error
+        delay = (message.next_attempt_at - started).total_seconds()
+        expected = OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+        assert expected - 1 <= delay <= expected + 5
+        # Not due again before the delay has passed
+        assert await dispatcher.dispatch_once() == 0
+        await _make_due(session_factory)
+
+    assert await dispatcher.dispatch_once() == 1
+    [message] = await _outbox(session_factory)
+    assert (message.status, message.attempts) == ("sent", 3)
+    assert len(handler.messages) == 1
+    assert (dispatcher.failed, dispatcher.sent) == (2, 1)
+
+
+async def test_email_is_dead_lettered_after_max_attempts(session_factory, smtp_server, dispatcher):
+    handler, _ = smtp_server
+    handler.failures = 100
+    await _enqueue(session_factory)
+
+    for _ in range(dispatcher.max_attempts):
+        assert await dispatcher.dispatch_once() == 1
+        await _make_due(session_factory)
+
+    [message] = await _outbox(session_factory)
+    assert (message.status, message.attempts) == ("dead", dispatcher.max_attempts)
+    assert "451" in message.last_error
+    assert dispatcher.dead == 1
+    assert handler.messages == []
+    # Dead letters are never picked up again
+    assert await dispatcher.dispatch_once() == 0
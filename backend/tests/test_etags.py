@@ -0,0 +1,42 @@
+"""
+Conditional GET validators depend on the negotiated representation.
+"""
+
+from fastapi import Request, Response
+
+from app.etags import not_modified, weak_etag
+from app.responses import MSGPACK_MEDIA_TYPE
+
+VERSION = weak_etag("/tasks/1", "2026-01-05 10:00:00")
+
+
+def _request(accept: str = "application/json", if_none_match: str = None) -> Request:
+    headers = [(b"accept", accept.encode())]
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/tasks/1", "query_string": b"", "headers": headers})
+
+
+def _etag(accept: str) -> str:
+    response = Response()
+    assert not_modified(_request(accept), response, VERSION) is None
+    return response.headers["etag"]
+
+
+def test_json_and_msgpack_have_different_etags():
+    assert _etag("application/json") != _etag(MSGPACK_MEDIA_TYPE)
+    assert _etag("application/json") == _etag("*/*")
+
+
+def test_matching_etag_gets_304_with_vary():
+    etag = _etag(MSGPACK_MEDIA_TYPE)
+    unchanged = not_modified(_request(MSGPACK_MEDIA_TYPE, etag), Response(), VERSION)
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+    assert unchanged.headers["vary"] == "Accept"
+
+
+def test_etag_of_other_media_type_is_not_a_match():
+    response = Response()
+    assert not_modified(_request("application/json", _etag(MSGPACK_MEDIA_TYPE)), response, VERSION) is None
+    assert response.headers["etag"] == _etag("application/json")
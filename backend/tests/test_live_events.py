@@ -0,0 +1,61 @@
+"""
+Live event subscriptions: who gets an event, and what a slow client gets.
+"""
+
+import asyncio
+
+import pytest
+
+from app.live_events import RESYNC, LiveEventBroadcaster, Subscription, live_event
+
+
+def test_wants_events_of_subscribed_projects():
+    subscription = Subscription({1, 2}, None)
+    assert subscription.wants(live_event("task.updated", 1))
+    assert subscription.wants(live_event("task.updated", 2, user_ids=[9]))
+    assert not subscription.wants(live_event("task.updated", 3, user_ids=[9]))
+    # A task moved out of a subscribed project is still announced there
+    assert subscription.wants(live_event("task.updated", 3, previous_project_id=2))
+
+
+def test_wants_events_for_own_user():
+    subscription = Subscription(set(), 7)
+    assert subscription.wants(live_event("comment.created", 3, user_ids=[5, 7]))
+    assert not subscription.wants(live_event("comment.created", 3, user_ids=[5]))
+    assert not subscription.wants(live_event("task.updated", None))
+    assert not Subscription(set(), None).wants(live_event("task.updated", None, user_ids=[7]))
+
+
+def test_every_subscription_wants_resync():
+    assert Subscription(set(), None).wants(RESYNC)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_replaced_by_resync():
+    subscription = Subscription({1}, None, queue_size=3)
+    events = [live_event("task.updated", 1, task_id=n) for n in range(4)]
+
+    assert [subscription.offer(event) for event in events[:3]] == [True, True, True]
+    assert subscription.offer(events[3]) is False
+    assert subscription.lagged
+    # The backlog is dropped: the client only gets the resync marker
+    assert await subscription.next(timeout=0.1) is RESYNC
+    assert await subscription.next(timeout=0.01) is None
+    assert subscription.offer(events[0]) is False
+    assert subscription.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_drops_lagged_clients():
+    broadcaster = LiveEventBroadcaster(queue_size=2)
+    with broadcaster.subscribe([1]) as slow, broadcaster.subscribe([2]) as other:
+        broadcaster.publish(*(live_event("task.updated", 1, task_id=n) for n in range(3)))
+        broadcaster.publish(live_event("task.updated", 2))
+
+        assert broadcaster.stats()["lagged_clients"] == 1
+        assert broadcaster.stats()["subscribers"] == 1
+        assert await slow.next(timeout=0.1) is RESYNC
+        assert (await other.next(timeout=0.1))["project_id"] == 2
+        # Later events no longer reach the dropped client
+        broadcaster.publish(live_event("task.updated", 1))
+        assert await asyncio.wait_for(slow.next(timeout=0.01), 1) is None
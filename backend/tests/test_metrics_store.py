@@ -0,0 +1,105 @@
+"""
+The in-memory dashboard metrics follow API writes and agree with a fresh
+load from the database.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.metrics import build_performance_metrics, load_metrics_snapshot
+from app.metrics_store import DashboardMetricsStore, TaskState
+from app.models import TaskStatus
+
+from .factories import auth_headers, create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _metrics(client, headers):
+    response = await client.get("/performance-metrics", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _reloaded(sync_session_factory):
+    with sync_session_factory() as db:
+        return build_performance_metrics(load_metrics_snapshot(db))
+
+
+async def test_writes_keep_metrics_in_step_with_the_database(client, session_factory, sync_session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        await db.commit()
+    headers = auth_headers(alice)
+    # Load the store before the writes so they are applied as deltas
+    await _metrics(client, headers)
+
+    website = (await client.post("/projects/", json={"title": "Website"}, headers=headers)).json()
+    mobile = (await client.post("/projects/", json={"title": "Mobile"}, headers=headers)).json()
+    tasks = [
+        (await client.post("/tasks/", json={"title": f"Task {n}", "project_id": project["id"]}, headers=headers)).json()
+        for n, project in enumerate([website, website, mobile, mobile])
+    ]
+    await client.put(f"/tasks/{tasks[0]['id']}", json={"status": "closed"}, headers=headers)
+    await client.put(f"/tasks/{tasks[2]['id']}", json={"status": "closed"}, headers=headers)
+    await client.delete(f"/tasks/{tasks[1]['id']}", headers=headers)
+
+    logs = [
+        (await client.post(
+            "/timelog/", json={"task_id": task["id"], "hours": hours, "date": "2026-01-05T09:00:00"}, headers=headers
+        )).json()
+        for task, hours in [(tasks[0], 3), (tasks[2], 5), (tasks[3], 2)]
+    ]
+    await client.put(f"/timelog/{logs[0]['id']}", json={"hours": 4}, headers=headers)
+    await client.delete(f"/timelog/{logs[2]['id']}", headers=headers)
+
+    # The project's tasks are kept without a project
+    await client.delete(f"/projects/{mobile['id']}", headers=headers)
+
+    metrics = await _metrics(client, headers)
+    assert metrics == _reloaded(sync_session_factory)
+    assert metrics["total_logged_hours"] == 9
+    assert [project["project_title"] for project in metrics["project_health"]] == ["Website"]
+
+
+def _snapshot():
+    return {
+        "total_tasks": 0,
+        "closed_tasks": 0,
+        "completion_days_sum": 0,
+        "completion_count": 0,
+        "total_logged_hours": 0,
+        "projects": {1: {"title": "Website", "total_tasks": 0, "closed_tasks": 0}},
+        "daily_completions": {},
+    }
+
+
+def test_task_and_hours_hooks_apply_deltas():
+    store = DashboardMetricsStore()
+    store._snapshot = _snapshot()
+    created = datetime(2026, 1, 1, 9)
+    todo = TaskState(1, TaskStatus.TODO, created, None)
+    closed = TaskState(1, TaskStatus.CLOSED, created, datetime(2026, 1, 4, 10))
+
+    store.task_changed(None, todo)
+    store.task_changed(todo, closed)
+    store.hours_logged(5)
+    store.hours_logged(-2)
+    assert store._snapshot["total_tasks"] == 1
+    assert store._snapshot["closed_tasks"] == 1
+    assert (store._snapshot["completion_days_sum"], store._snapshot["completion_count"]) == (3, 1)
+    assert store._snapshot["projects"][1] == {"title": "Website", "total_tasks": 1, "closed_tasks": 1}
+    assert store._snapshot["daily_completions"] == {date(2026, 1, 4): 1}
+    assert store._snapshot["total_logged_hours"] == 3
+
+    store.task_changed(closed, None)
+    assert store._snapshot["total_tasks"] == 0
+    assert store._snapshot["daily_completions"] == {}
+
+
+def test_hooks_wait_for_the_first_load():
+    store = DashboardMetricsStore()
+    store.task_changed(None, TaskState(1, TaskStatus.TODO, None, None))
+    store.hours_logged(5)
+    assert not store.loaded
@@ -0,0 +1,105 @@
+"""
+Migrations that fill or maintain derived tables, run with alembic against a
+scratch SQLite database.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def _upgrade(db_path, revision: str = "head"):
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", revision],
+        cwd=BACKEND,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"},
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    yield engine
+    engine.dispose()
+
+
+def test_rollup_table_is_filled_from_existing_logs(db_path, engine):
+    _upgrade(db_path, "0003_email_outbox")
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, username) VALUES (1, 'alice'), (2, 'bob')"))
+        connection.execute(text("INSERT INTO projects (id, title, owner_id) VALUES (7, 'Website', 1)"))
+        connection.execute(text("INSERT INTO tasks (id, title, project_id) VALUES (3, 'Login', 7)"))
+        connection.execute(text(
+            """
+            INSERT INTO time_logs (task_id, user_id, hours, date) VALUES
+                (3, 1, 2, '2026-01-05 09:00:00'),
+                (3, 1, 3, '2026-01-05 17:30:00'),
+                (3, 2, 1, '2026-01-05 10:00:00'),
+                (3, 1, 4, '2026-01-06 00:00:00'),
+                (NULL, 1, 5, '2026-01-06 12:00:00')
+            """
+        ))
+
+    _upgrade(db_path)
+
+    with engine.connect() as connection:
+        rollups = connection.execute(text(
+            "SELECT user_id, task_id, project_id, day, hours, log_count FROM time_log_daily_rollups"
+            " ORDER BY user_id, day, task_id"
+        )).all()
+    assert [tuple(row) for row in rollups] == [
+        (1, 3, 7, "2026-01-05", 5, 2),
+        (1, None, None, "2026-01-06", 5, 1),
+        (1, 3, 7, "2026-01-06", 4, 1),
+        (2, 3, 7, "2026-01-05", 1, 1),
+    ]
+
+
+def _fts_rowids(connection, table: str, query: str) -> list:
+    return connection.execute(
+        text(f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH :query ORDER BY rowid"), {"query": query}
+    ).scalars().all()
+
+
+def test_search_mirrors_are_filled_and_kept_in_sync(db_path, engine):
+    _upgrade(db_path, "0004_time_log_daily_rollups")
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, username) VALUES (1, 'alice')"))
+        connection.execute(text("INSERT INTO projects (id, title, owner_id) VALUES (1, 'Billing', 1)"))
+        connection.execute(text(
+            "INSERT INTO tasks (id, title, description, project_id) VALUES"
+            " (1, 'Invoice export', 'CSV download', 1), (2, 'Login form', NULL, 1)"
+        ))
+        connection.execute(text("INSERT INTO comments (id, content, user_id, task_id) VALUES (1, 'Invoices look off', 1, 1)"))
+
+    _upgrade(db_path)
+
+    with engine.begin() as connection:
+        # Existing rows are indexed by the migration
+        assert _fts_rowids(connection, "tasks", "invoice") == [1]
+        assert _fts_rowids(connection, "projects", "billing") == [1]
+        assert _fts_rowids(connection, "comments", "invoice") == [1]
+
+        connection.execute(text("INSERT INTO tasks (id, title, project_id) VALUES (3, 'Invoice emails', 1)"))
+        connection.execute(text("UPDATE tasks SET title = 'Receipt export' WHERE id = 1"))
+        connection.execute(text("UPDATE tasks SET description = 'Invoice link' WHERE id = 2"))
+        connection.execute(text("UPDATE projects SET title = 'Payments' WHERE id = 1"))
+        connection.execute(text("DELETE FROM comments WHERE id = 1"))
+
+        assert _fts_rowids(connection, "tasks", "invoice") == [2, 3]
+        assert _fts_rowids(connection, "tasks", "receipt") == [1]
+        assert _fts_rowids(connection, "tasks", "csv") == [1]
+        assert _fts_rowids(connection, "projects", "billing") == []
+        assert _fts_rowids(connection, "projects", "payments") == [1]
+        assert _fts_rowids(connection, "comments", "invoice") == []
+
+        connection.execute(text("DELETE FROM tasks WHERE id = 3"))
+        assert _fts_rowids(connection, "tasks", "invoice") == [2]
@@ -0,0 +1,111 @@
+"""
+Keyset pagination: cursor tokens, their validation and paging through a list
+endpoint with ``X-Next-Cursor``.
+"""
+
+import base64
+import json
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app import pagination
+from app.models import Task, User
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+from .factories import auth_headers, create_project, create_task, create_user
+
+TASK_KEYS = (Task.id,)
+
+
+def _token(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    token = encode_cursor([42, "alice"])
+    assert "=" not in token
+    assert decode_cursor(token, (User.id, User.username)) == [42, "alice"]
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"{not json").decode(),
+        _token({"id": 1}),
+        _token([]),
+        _token([1, 2]),
+        _token(["1"]),
+        _token([1.5]),
+        _token([True]),
+        _token([None]),
+    ],
+)
+def test_tampered_or_mistyped_cursor_is_rejected(token):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(token, TASK_KEYS)
+    assert error.value.status_code == 400
+
+
+def test_string_keys_take_strings_only():
+    assert decode_cursor(_token(["alice", 3]), (User.username, User.id)) == ["alice", 3]
+    with pytest.raises(HTTPException):
+        decode_cursor(_token([3, 3]), (User.username, User.id))
+
+
+@pytest_asyncio.fixture
+async def owner(session_factory):
+    async with session_factory() as db:
+        owner = await create_user(db, "owner")
+        project = await create_project(db, owner)
+        for n in range(7):
+            await create_task(db, project, f"Task {n}")
+        await db.commit()
+    return owner
+
+
+async def _walk(client, owner, limit: int):
+    """Follow X-Next-Cursor from the first page; returns the ids of each page."""
+    pages, params = [], {"limit": limit}
+    while True:
+        response = await client.get("/tasks/", params=params, headers=auth_headers(owner))
+        assert response.status_code == 200
+        pages.append([task["id"] for task in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_row_once(client, owner):
+    pages = await _walk(client, owner, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    ids = [task_id for page in pages for task_id in page]
+    assert ids == sorted(set(ids)) and len(ids) == 7
+    # An exact fit needs no further page
+    assert [len(page) for page in await _walk(client, owner, limit=7)] == [7]
+
+
+@pytest.mark.asyncio
+async def test_limit_above_the_maximum_is_clamped(client, owner, monkeypatch):
+    monkeypatch.setattr(pagination, "MAX_PAGE_SIZE", 4)
+    response = await client.get("/tasks/", params={"limit": 1000}, headers=auth_headers(owner))
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+    assert NEXT_CURSOR_HEADER in response.headers
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"skip": -1}])
+async def test_non_positive_limit_and_negative_skip_are_rejected(client, owner, params):
+    response = await client.get("/tasks/", params=params, headers=auth_headers(owner))
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bad_cursor_is_a_400(client, owner):
+    response = await client.get("/tasks/", params={"cursor": _token(["1"])}, headers=auth_headers(owner))
+    assert response.status_code == 400
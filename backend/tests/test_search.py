@@ -0,0 +1,124 @@
+"""
+GET /search/ against the SQLite FTS5 mirrors: matching, prefixes, filters
+and ranking.
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.models import Comment, TaskStatus
+
+from .factories import auth_headers, create_project, create_task, create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def data(session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        billing = await create_project(db, alice, "Billing", description="Invoices and payments")
+        website = await create_project(db, alice, "Website", description="Marketing pages")
+        tasks = {
+            "title": await create_task(
+                db, billing, "Invoice export", description="CSV download", assignee_id=alice.id, status=TaskStatus.TODO
+            ),
+            "description": await create_task(
+                db, website, "Footer links", description="Link to the invoice page", assignee_id=bob.id,
+                status=TaskStatus.CLOSED,
+            ),
+            "other": await create_task(db, website, "Login form", description="Password reset", assignee_id=bob.id),
+        }
+        comment = Comment(content="Invoices are rounded to cents", task_id=tasks["other"].id, user_id=bob.id)
+        db.add(comment)
+        await db.commit()
+    return alice, bob, billing, website, tasks, comment
+
+
+async def _search(client, user, **params):
+    response = await client.get("/search/", params=params, headers=auth_headers(user))
+    assert response.status_code == 200
+    return [(hit["type"], hit["id"]) for hit in response.json()]
+
+
+async def test_matches_every_type_best_first(client, data):
+    alice, _, billing, _, tasks, comment = data
+
+    hits = await _search(client, alice, q="invoice")
+
+    # Title matches outrank description matches; stemming matches "Invoices"
+    assert hits[0] == ("task", tasks["title"].id)
+    assert set(hits) == {
+        ("task", tasks["title"].id),
+        ("task", tasks["description"].id),
+        ("project", billing.id),
+        ("comment", comment.id),
+    }
+    assert hits.index(("task", tasks["title"].id)) < hits.index(("task", tasks["description"].id))
+
+
+async def test_every_word_must_match(client, data):
+    alice, _, _, _, tasks, _ = data
+
+    assert await _search(client, alice, q="invoice csv") == [("task", tasks["title"].id)]
+    assert await _search(client, alice, q="invoice password") == []
+
+
+async def test_last_word_matches_as_a_prefix(client, data):
+    alice, _, _, website, tasks, _ = data
+
+    assert await _search(client, alice, q="login fo", types="task") == [("task", tasks["other"].id)]
+    assert await _search(client, alice, q="market") == [("project", website.id)]
+    # Only the last word is a prefix
+    assert await _search(client, alice, q="logi form") == []
+
+
+async def test_type_filter(client, data):
+    alice, _, billing, _, _, comment = data
+
+    assert await _search(client, alice, q="invoice", types="project") == [("project", billing.id)]
+    assert await _search(client, alice, q="invoice", types="comment") == [("comment", comment.id)]
+
+    response = await client.get("/search/", params={"q": "invoice", "types": "file"}, headers=auth_headers(alice))
+    assert response.status_code == 400
+
+
+async def test_status_and_assignee_filters(client, data):
+    alice, bob, _, _, tasks, comment = data
+
+    # Projects have neither, so these filters leave them out
+    assert await _search(client, alice, q="invoice", status="closed") == [("task", tasks["description"].id)]
+    assert set(await _search(client, alice, q="invoice", assignee_id=bob.id)) == {
+        ("task", tasks["description"].id),
+        ("comment", comment.id),
+    }
+
+
+async def test_project_filter(client, data):
+    alice, _, billing, _, tasks, _ = data
+
+    assert set(await _search(client, alice, q="invoice", project_id=billing.id)) == {
+        ("task", tasks["title"].id),
+        ("project", billing.id),
+    }
+
+
+async def test_index_follows_api_writes(client, data):
+    alice, _, _, _, tasks, _ = data
+    headers = auth_headers(alice)
+
+    await client.put(f"/tasks/{tasks['other'].id}", json={"title": "Receipt printer"}, headers=headers)
+    await client.delete(f"/tasks/{tasks['description'].id}", headers=headers)
+
+    assert await _search(client, alice, q="receipt") == [("task", tasks["other"].id)]
+    assert await _search(client, alice, q="login") == []
+    assert ("task", tasks["description"].id) not in await _search(client, alice, q="invoice")
+
+
+async def test_query_without_words_is_rejected(client, data):
+    alice, *_ = data
+
+    response = await client.get("/search/", params={"q": "?!"}, headers=auth_headers(alice))
+
+    assert response.status_code == 400
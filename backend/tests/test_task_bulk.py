@@ -0,0 +1,160 @@
+"""
+Bulk task create/update/delete: per-item results, partial failures and
+one digest email per recipient.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Comment, EmailOutbox, Task, TimeLog
+
+from .factories import auth_headers, create_project, create_task, create_time_log, create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _digests(session_factory):
+    async with session_factory() as db:
+        rows = (await db.scalars(select(EmailOutbox).order_by(EmailOutbox.id))).all()
+    return [(row.kind, row.recipient, json.loads(row.payload)) for row in rows]
+
+
+async def test_bulk_create_reports_each_item_and_sends_one_digest_per_assignee(client, session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        website = await create_project(db, alice)
+        await db.commit()
+
+    response = await client.post(
+        "/tasks/bulk",
+        json={"tasks": [
+            {"title": "Mine", "project_id": website.id},
+            {"title": "Orphan", "project_id": 999},
+            {"title": "For Bob", "project_id": website.id, "assignee_id": bob.id},
+            {"title": "Nobody", "project_id": website.id, "assignee_id": 999},
+            {"title": "Also for Bob", "project_id": website.id, "assignee_id": bob.id},
+        ]},
+        headers=auth_headers(alice),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (3, 2)
+    assert [(r["index"], r["status"], r["error"]) for r in body["results"]] == [
+        (0, "created", None),
+        (1, "error", "Project not found"),
+        (2, "created", None),
+        (3, "error", "Assignee not found"),
+        (4, "created", None),
+    ]
+    assert body["results"][0]["task"]["assignee_id"] == alice.id
+    assert body["results"][2]["task"]["assignee_username"] == "bob"
+
+    async with session_factory() as db:
+        titles = (await db.scalars(select(Task.title).order_by(Task.id))).all()
+    assert titles == ["Mine", "For Bob", "Also for Bob"]
+
+    # The caller is not emailed about their own tasks; Bob gets one digest for both
+    [(kind, recipient, payload)] = await _digests(session_factory)
+    assert (kind, recipient) == ("task_digest", "bob@example.com")
+    assert [item["task_title"] for item in payload["items"]] == ["For Bob", "Also for Bob"]
+
+
+async def test_bulk_update_applies_valid_items_and_bumps_updated_at(client, session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        website = await create_project(db, alice)
+        first = await create_task(db, website, "First", assignee_id=alice.id)
+        second = await create_task(db, website, "Second", assignee_id=alice.id)
+        untouched = await create_task(db, website, "Untouched", assignee_id=alice.id)
+        await db.commit()
+
+    response = await client.patch(
+        "/tasks/bulk",
+        json={"tasks": [
+            {"id": first.id, "status": "in_progress"},
+            {"id": 999, "status": "closed"},
+            {"id": second.id, "assignee_id": bob.id},
+            {"id": first.id, "title": "Twice"},
+            {"id": untouched.id, "project_id": 999},
+        ]},
+        headers=auth_headers(alice),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    assert [(r["index"], r["id"], r["status"], r["error"]) for r in body["results"]] == [
+        (0, first.id, "updated", None),
+        (1, 999, "error", "Task not found"),
+        (2, second.id, "updated", None),
+        (3, first.id, "error", "Task appears more than once in the batch"),
+        (4, untouched.id, "error", "Project not found"),
+    ]
+
+    async with session_factory() as db:
+        tasks = {task.id: task for task in (await db.scalars(select(Task))).all()}
+    assert (tasks[first.id].title, tasks[first.id].status.value) == ("First", "in_progress")
+    assert tasks[second.id].assignee_id == bob.id
+    assert tasks[first.id].updated_at is not None
+    assert tasks[second.id].updated_at is not None
+    assert tasks[untouched.id].updated_at is None
+
+    # One digest of all changes for the caller, one for the new assignee
+    digests = await _digests(session_factory)
+    assert [(kind, recipient) for kind, recipient, _ in digests] == [
+        ("task_digest", "alice@example.com"),
+        ("task_digest", "bob@example.com"),
+    ]
+    assert [item["task_title"] for item in digests[0][2]["items"]] == ["First", "Second"]
+    assert [item["task_title"] for item in digests[1][2]["items"]] == ["Second"]
+
+
+async def test_bulk_delete_checks_ownership_per_item(client, session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        alices = await create_project(db, alice)
+        bobs = await create_project(db, bob, "Bob's")
+        doomed = await create_task(db, alices, "Doomed")
+        kept = await create_task(db, bobs, "Kept")
+        log = await create_time_log(db, doomed, alice, 2, doomed.created_at)
+        db.add(Comment(content="Note", task_id=doomed.id, user_id=alice.id))
+        await db.commit()
+
+    response = await client.post(
+        "/tasks/bulk/delete",
+        json={"ids": [doomed.id, kept.id, 999, doomed.id]},
+        headers=auth_headers(alice),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 3)
+    assert [(r["index"], r["status"], r["error"]) for r in body["results"]] == [
+        (0, "deleted", None),
+        (1, "error", "You don't have permission to delete this task"),
+        (2, "error", "Task not found"),
+        (3, "error", "Task appears more than once in the batch"),
+    ]
+
+    async with session_factory() as db:
+        assert (await db.scalars(select(Task.id))).all() == [kept.id]
+        # Dependent rows are detached, as with a single delete
+        assert (await db.get(TimeLog, log.id)).task_id is None
+        assert (await db.scalars(select(Comment.task_id))).all() == [None]
+
+
+async def test_bulk_requests_over_the_limit_are_rejected(client, session_factory, monkeypatch):
+    monkeypatch.setattr("app.routers.tasks.TASK_BULK_MAX_ITEMS", 2)
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        await db.commit()
+
+    response = await client.post("/tasks/bulk/delete", json={"ids": [1, 2, 3]}, headers=auth_headers(alice))
+
+    assert response.status_code == 413
@@ -0,0 +1,116 @@
+"""
+Task.actual_hours follows every time log write path, and the reconcile
+command finds and repairs drift left by writes outside the API.
+"""
+
+import sys
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app import database, time_accounting
+from app.models import Task
+
+from .factories import auth_headers, create_project, create_task, create_time_log, create_user
+
+pytestmark = pytest.mark.asyncio
+
+DAY = "2026-01-05T09:00:00"
+
+
+async def _actual_hours(session_factory, *tasks):
+    async with session_factory() as db:
+        return [(await db.get(Task, task.id)).actual_hours for task in tasks]
+
+
+async def test_actual_hours_follow_each_write(client, session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        website = await create_project(db, alice)
+        login = await create_task(db, website, "Login", assignee_id=alice.id)
+        signup = await create_task(db, website, "Signup", assignee_id=alice.id)
+        await db.commit()
+    headers = auth_headers(alice)
+
+    first = (await client.post("/timelog/", json={"task_id": login.id, "hours": 3, "date": DAY}, headers=headers)).json()
+    second = (await client.post("/timelog/", json={"task_id": login.id, "hours": 2, "date": DAY}, headers=headers)).json()
+    assert await _actual_hours(session_factory, login, signup) == [5, 0]
+
+    await client.put(f"/timelog/{first['id']}", json={"hours": 4}, headers=headers)
+    assert await _actual_hours(session_factory, login, signup) == [6, 0]
+
+    moved = await client.put(f"/timelog/{second['id']}", json={"task_id": signup.id, "hours": 1}, headers=headers)
+    assert moved.status_code == 200
+    assert moved.json()["task_id"] == signup.id
+    assert await _actual_hours(session_factory, login, signup) == [4, 1]
+
+    await client.delete(f"/timelog/{first['id']}", headers=headers)
+    assert await _actual_hours(session_factory, login, signup) == [0, 1]
+
+
+async def test_moving_a_log_needs_access_to_the_new_task(client, session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        login = await create_task(db, await create_project(db, alice), "Login", assignee_id=alice.id)
+        other = await create_task(db, await create_project(db, bob, "Bob's"), "Bob's", assignee_id=bob.id)
+        await db.commit()
+    headers = auth_headers(alice)
+    log = (await client.post("/timelog/", json={"task_id": login.id, "hours": 3, "date": DAY}, headers=headers)).json()
+
+    forbidden = await client.put(f"/timelog/{log['id']}", json={"task_id": other.id}, headers=headers)
+    missing = await client.put(f"/timelog/{log['id']}", json={"task_id": 999}, headers=headers)
+
+    assert (forbidden.status_code, missing.status_code) == (403, 404)
+    assert await _actual_hours(session_factory, login, other) == [3, 0]
+
+
+@pytest_asyncio.fixture
+async def drifted(session_factory):
+    """Tasks whose actual_hours were written behind the API's back."""
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        website = await create_project(db, alice)
+        in_step = await create_task(db, website, "In step", actual_hours=3)
+        too_high = await create_task(db, website, "Too high", actual_hours=10)
+        unset = await create_task(db, website, "Unset")
+        await create_time_log(db, in_step, alice, 3, datetime(2026, 1, 5))
+        await create_time_log(db, too_high, alice, 2, datetime(2026, 1, 5))
+        await create_time_log(db, unset, alice, 4, datetime(2026, 1, 6))
+        await db.execute(update(Task).where(Task.id == unset.id).values(actual_hours=None))
+        await db.commit()
+    return in_step, too_high, unset
+
+
+async def test_find_and_repair_drift(sync_session_factory, session_factory, drifted):
+    in_step, too_high, unset = drifted
+    task_ids = [in_step.id, too_high.id, unset.id]
+
+    with sync_session_factory() as db:
+        connection = db.connection()
+        assert time_accounting.find_drift(connection, task_ids) == [(too_high.id, 10, 2), (unset.id, None, 4)]
+        assert time_accounting.repair_drift(connection, [too_high.id, unset.id]) == 2
+        assert time_accounting.find_drift(connection, task_ids) == []
+        db.commit()
+
+    assert await _actual_hours(session_factory, in_step, too_high, unset) == [3, 2, 4]
+
+
+@pytest.mark.parametrize("repair", [False, True])
+async def test_reconcile_command(sync_session_factory, session_factory, drifted, monkeypatch, capsys, repair):
+    in_step, too_high, unset = drifted
+    monkeypatch.setattr(database, "engine", sync_session_factory.kw["bind"])
+    monkeypatch.setattr(sys, "argv", ["time_accounting", "--batch-size", "2"] + (["--repair"] if repair else []))
+
+    time_accounting.main()
+
+    output = capsys.readouterr().out.splitlines()
+    assert output[:2] == [f"task {too_high.id}: actual_hours=10 logged=2", f"task {unset.id}: actual_hours=None logged=4"]
+    if repair:
+        assert output[2].endswith("Checked 3 tasks, 2 drifted, 2 repaired")
+        assert await _actual_hours(session_factory, in_step, too_high, unset) == [3, 2, 4]
+    else:
+        assert output[2].endswith("Checked 3 tasks, 2 drifted")
+        assert await _actual_hours(session_factory, in_step, too_high, unset) == [3, 10, None]
@@ -0,0 +1,71 @@
+"""
+Daily rollups keep one row per (user, task, day), including the detached
+rows of deleted tasks.
+"""
+
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.models import Project, Task, TimeLogDailyRollup, User
+from app.schemas.timelog import TimeLogUpdate
+from app.time_accounting import TimeLogChange, apply_time_log_changes
+from app.time_rollups import detach_task_rollups
+
+DAY = date(2026, 1, 5)
+
+
+async def _rollups(db):
+    rows = await db.execute(
+        select(
+            TimeLogDailyRollup.user_id,
+            TimeLogDailyRollup.task_id,
+            TimeLogDailyRollup.project_id,
+            TimeLogDailyRollup.day,
+            TimeLogDailyRollup.hours,
+            TimeLogDailyRollup.log_count,
+        ).order_by(TimeLogDailyRollup.id)
+    )
+    return [tuple(row) for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_detached_rollups_are_merged(session_factory):
+    async with session_factory() as db:
+        user = User(email="alice@example.com", username="alice", full_name="Alice", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        project = Project(title="Website", owner_id=user.id)
+        db.add(project)
+        await db.flush()
+        tasks = [Task(title=f"Task {n}", project_id=project.id) for n in range(3)]
+        db.add_all(tasks)
+        await db.flush()
+        await apply_time_log_changes(db, [
+            TimeLogChange(tasks[0].id, user.id, DAY, 2, 1),
+            TimeLogChange(tasks[1].id, user.id, DAY, 3, 1),
+            TimeLogChange(tasks[1].id, user.id, DAY, 4, 1),
+            TimeLogChange(tasks[2].id, user.id, DAY, 5, 1),
+        ])
+
+        # Tasks deleted one after the other land in the same detached row
+        await detach_task_rollups(db, [tasks[0].id])
+        await detach_task_rollups(db, [tasks[1].id])
+        # Later writes to logs of deleted tasks add to it too
+        await apply_time_log_changes(db, [TimeLogChange(None, user.id, DAY, 1, 1)])
+        await apply_time_log_changes(db, [TimeLogChange(None, user.id, DAY, -3, -1)])
+        await db.commit()
+
+        assert sorted(await _rollups(db), key=lambda row: row[1] or 0) == [
+            (user.id, None, None, DAY, 7, 3),
+            (user.id, tasks[2].id, project.id, DAY, 5, 1),
+        ]
+
+
+def test_time_log_update_rejects_null_hours_and_date():
+    assert TimeLogUpdate(description="Reviewed").model_dump(exclude_unset=True) == {"description": "Reviewed"}
+    for field in ("hours", "date"):
+        with pytest.raises(ValidationError):
+            TimeLogUpdate(**{field: None})
@@ -0,0 +1,161 @@
+"""
+GET /timelog/summary/user/{id}: one GROUP BY per grouping, with the same
+answer from the daily rollups and from the raw logs.
+"""
+
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app import time_rollups
+from app.models import Task, TimeLog
+
+from .factories import auth_headers, create_project, create_task, create_user
+
+pytestmark = pytest.mark.asyncio
+
+# (task, hours, date); 2026-01-05 is a Monday
+LOGS = [
+    ("Login", 2, "2026-01-04T09:00:00"),
+    ("Login", 3, "2026-01-05T09:00:00"),
+    ("Login", 1, "2026-01-05T17:30:00"),
+    ("Signup", 4, "2026-01-06T10:00:00"),
+    ("Charts", 5, "2026-01-12T23:59:59"),
+]
+
+
+@pytest.fixture(params=[True, False], ids=["rollups", "raw_logs"])
+def rollups(request, monkeypatch):
+    monkeypatch.setattr(time_rollups, "TIME_ROLLUP_REPORTS", request.param)
+    return request.param
+
+
+@pytest_asyncio.fixture
+async def alice(client, session_factory):
+    """A user with logs on three tasks in two projects, written through the API."""
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        website = await create_project(db, alice)
+        dashboard = await create_project(db, alice, "Dashboard")
+        tasks = {
+            "Login": await create_task(db, website, "Login", assignee_id=alice.id),
+            "Signup": await create_task(db, website, "Signup", assignee_id=alice.id),
+            "Charts": await create_task(db, dashboard, "Charts", assignee_id=alice.id),
+        }
+        await db.commit()
+    for title, hours, day in LOGS:
+        response = await client.post(
+            "/timelog/", json={"task_id": tasks[title].id, "hours": hours, "date": day}, headers=auth_headers(alice)
+        )
+        assert response.status_code == 200
+    # Someone else's time is never counted
+    await client.post(
+        "/timelog/", json={"task_id": tasks["Login"].id, "hours": 7, "date": LOGS[1][2]}, headers=auth_headers(bob)
+    )
+    return alice
+
+
+async def _summary(client, user, **params):
+    response = await client.get(f"/timelog/summary/user/{user.id}", params=params, headers=auth_headers(user))
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _old_task_summary(session_factory, user_id, start=None, end=None):
+    """The per-task rows as the summary used to build them, one log at a time."""
+    async with session_factory() as db:
+        logs = (await db.scalars(
+            select(TimeLog)
+            .where(TimeLog.user_id == user_id)
+            .options(selectinload(TimeLog.task).selectinload(Task.project))
+            .order_by(TimeLog.id)
+        )).all()
+    summary = {}
+    for log in logs:
+        if (start and log.date.date() < start) or (end and log.date.date() > end):
+            continue
+        row = summary.setdefault(
+            log.task_id, {"task_title": log.task.title, "project_title": log.task.project.title, "total_hours": 0}
+        )
+        row["total_hours"] += log.hours
+    return sorted(summary.values(), key=lambda row: row["task_title"])
+
+
+@pytest.mark.parametrize("start, end", [
+    (None, None),
+    ("2026-01-05", "2026-01-06"),
+    ("2026-01-05", "2026-01-05"),
+])
+async def test_task_rows_match_the_old_summary(client, session_factory, alice, rollups, start, end):
+    params = {name: value for name, value in [("start_date", start), ("end_date", end)] if value}
+
+    summary = await _summary(client, alice, **params)
+
+    expected = await _old_task_summary(
+        session_factory, alice.id,
+        datetime.fromisoformat(start).date() if start else None,
+        datetime.fromisoformat(end).date() if end else None,
+    )
+    rows = [
+        {key: row[key] for key in ("task_title", "project_title", "total_hours")}
+        for row in sorted(summary["task_summary"], key=lambda row: row["task_title"])
+    ]
+    assert rows == expected
+    assert summary["total_hours"] == sum(row["total_hours"] for row in expected)
+    assert summary["group_by"] == "task"
+
+
+async def test_group_by_project(client, alice, rollups):
+    summary = await _summary(client, alice, group_by="project")
+
+    assert [(row["project_title"], row["total_hours"]) for row in summary["project_summary"]] == [
+        ("Website", 10),
+        ("Dashboard", 5),
+    ]
+    assert summary["total_hours"] == 15
+
+
+async def test_group_by_day(client, alice, rollups):
+    summary = await _summary(client, alice, group_by="day", start_date="2026-01-05")
+
+    assert [(row["day"], row["total_hours"]) for row in summary["day_summary"]] == [
+        ("2026-01-05", 4),
+        ("2026-01-06", 4),
+        ("2026-01-12", 5),
+    ]
+    assert summary["total_hours"] == 13
+
+
+async def test_group_by_week(client, alice, rollups):
+    summary = await _summary(client, alice, group_by="week")
+
+    assert [(row["week"], row["total_hours"]) for row in summary["week_summary"]] == [
+        ("2025-12-29", 2),
+        ("2026-01-05", 8),
+        ("2026-01-12", 5),
+    ]
+
+
+async def test_deleted_logs_drop_out_of_the_summary(client, alice, rollups):
+    headers = auth_headers(alice)
+    logs = (await client.get("/timelog/", params={"user_id": alice.id}, headers=headers)).json()
+    for log in logs:
+        if log["task_title"] == "Charts":
+            await client.delete(f"/timelog/{log['id']}", headers=headers)
+
+    summary = await _summary(client, alice, group_by="project")
+
+    assert [row["project_title"] for row in summary["project_summary"]] == ["Website"]
+
+
+async def test_invalid_group_by_is_rejected(client, alice):
+    response = await client.get(
+        f"/timelog/summary/user/{alice.id}", params={"group_by": "month"}, headers=auth_headers(alice)
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "group_by must be one of: task, project, day, week"
@@ -0,0 +1,109 @@
+"""
+GET /timelog/export streams the same rows as the list endpoint, as CSV or
+NDJSON.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from .factories import auth_headers, create_project, create_task, create_time_log, create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def logs(session_factory):
+    """Logs at the start and end of each day, so date bounds are checked to the second."""
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        website = await create_project(db, alice)
+        task = await create_task(db, website, "Login", assignee_id=alice.id)
+        other = await create_task(db, website, "Signup", assignee_id=bob.id)
+        for day in (4, 5, 6, 7):
+            await create_time_log(db, task, alice, day, datetime(2026, 1, day, 0, 0), description=f"Early {day}")
+            await create_time_log(db, other, bob, 1, datetime(2026, 1, day, 23, 59, 59), description=f"Late {day}")
+        await db.commit()
+    return alice, bob, task
+
+
+def _csv(response):
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_csv_export(client, logs):
+    alice, _, task = logs
+
+    response = await client.get("/timelog/export", params={"task_id": task.id}, headers=auth_headers(alice))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="time_logs.csv"'
+    rows = _csv(response)
+    assert [row["description"] for row in rows] == ["Early 4", "Early 5", "Early 6", "Early 7"]
+    assert rows[0]["task_title"] == "Login"
+    assert rows[0]["project_title"] == "Website"
+    assert rows[0]["date"] == "2026-01-04T00:00:00"
+
+
+async def test_ndjson_export(client, logs):
+    alice, bob, _ = logs
+
+    response = await client.get(
+        "/timelog/export", params={"format": "ndjson", "user_id": bob.id}, headers=auth_headers(alice)
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = _ndjson(response)
+    assert [row["description"] for row in rows] == ["Late 4", "Late 5", "Late 6", "Late 7"]
+    assert {row["user_id"] for row in rows} == {bob.id}
+    assert rows[0]["hours"] == 1
+
+
+async def test_unknown_format_is_rejected(client, logs):
+    alice, _, _ = logs
+
+    response = await client.get("/timelog/export", params={"format": "xlsx"}, headers=auth_headers(alice))
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"start_date": "2026-01-05"},
+    {"end_date": "2026-01-05"},
+    {"start_date": "2026-01-05", "end_date": "2026-01-06"},
+    {"start_date": "2026-01-05", "end_date": "2026-01-05", "user_id": "bob"},
+])
+async def test_export_matches_the_list(client, logs, params):
+    alice, bob, _ = logs
+    params = {name: bob.id if value == "bob" else value for name, value in params.items()}
+    headers = auth_headers(alice)
+
+    listed = await client.get("/timelog/", params={**params, "limit": 1000}, headers=headers)
+    exported = await client.get("/timelog/export", params={**params, "format": "ndjson"}, headers=headers)
+
+    assert listed.status_code == exported.status_code == 200
+    assert [row["id"] for row in _ndjson(exported)] == sorted(row["id"] for row in listed.json())
+
+
+async def test_end_date_includes_the_whole_day(client, logs):
+    alice, _, _ = logs
+
+    response = await client.get(
+        "/timelog/export",
+        params={"format": "ndjson", "start_date": "2026-01-05", "end_date": "2026-01-06"},
+        headers=auth_headers(alice),
+    )
+
+    assert [row["description"] for row in _ndjson(response)] == ["Early 5", "Late 5", "Early 6", "Late 6"]
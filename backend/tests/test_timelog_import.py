@@ -0,0 +1,159 @@
+"""
+Streaming CSV/NDJSON time log import: parsing across chunk boundaries,
+per-row errors, dry runs and batched actual_hours updates.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Task, TimeLog, TimeLogDailyRollup
+from app.timelog_import import TimeLogImporter, iter_csv_records, iter_lines, iter_ndjson_records
+
+from .factories import auth_headers, create_project, create_task, create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _records(parse, *chunks: bytes):
+    return [record async for record in parse(iter_lines(_chunks(*chunks)))]
+
+
+async def _setup(session_factory):
+    async with session_factory() as db:
+        alice = await create_user(db, "alice")
+        bob = await create_user(db, "bob")
+        website = await create_project(db, alice)
+        mine = await create_task(db, website, "Mine", assignee_id=alice.id)
+        other = await create_task(db, await create_project(db, bob, "Bob's"), "Bob's", assignee_id=bob.id)
+        await db.commit()
+    return alice, bob, mine, other
+
+
+async def _actual_hours(session_factory, task_id):
+    async with session_factory() as db:
+        return (await db.get(Task, task_id)).actual_hours
+
+
+async def test_csv_records_span_chunks_and_lines():
+    body = 'task_id,hours,date,description\r\n1,2,2026-01-05,"Fixed ""login""\nand signup"\r\n\r\n1,3,2026-01-06,\r\n'.encode()
+    # Split inside the BOM and inside the quoted field
+    bom = "\ufeff".encode()
+    split = body.index(b"and signup")
+    records = await _records(iter_csv_records, bom[:2], bom[2:] + body[:split], body[split:])
+
+    assert records == [
+        (2, {"task_id": "1", "hours": "2", "date": "2026-01-05", "description": 'Fixed "login"\nand signup'}),
+        (5, {"task_id": "1", "hours": "3", "date": "2026-01-06"}),
+    ]
+
+
+async def test_csv_reports_bad_rows_and_unterminated_quotes():
+    body = b'task_id,hours,date\n1,2\n1,2,2026-01-05,extra\n1,2,"2026-01-05\n'
+
+    assert await _records(iter_csv_records, body) == [
+        (2, "Expected 3 columns, got 2"),
+        (3, "Expected 3 columns, got 4"),
+        (4, "Unterminated quoted field"),
+    ]
+
+
+async def test_ndjson_reports_parse_errors_per_line():
+    body = b'{"task_id": 1, "hours": 2, "date": "2026-01-05"}\n\n{"task_id": 1,\n[1, 2]\n'
+
+    records = await _records(iter_ndjson_records, body)
+
+    assert records[0] == (1, {"task_id": 1, "hours": 2, "date": "2026-01-05"})
+    assert records[1][0] == 3 and records[1][1].startswith("Invalid JSON")
+    assert records[2] == (4, "Each line must be a JSON object")
+
+
+async def test_import_loads_valid_rows_and_reports_the_rest(client, session_factory):
+    alice, bob, mine, other = await _setup(session_factory)
+    body = (
+        "task_id,hours,date,user_id\n"
+        f"{mine.id},2,2026-01-05,\n"
+        f"{mine.id},3,2026-01-05T14:00:00,{bob.id}\n"
+        f"{other.id},1,2026-01-05,\n"
+        "999,1,2026-01-05,\n"
+        f"{mine.id},lots,2026-01-05,\n"
+        f"{mine.id},4,2026-01-06,999\n"
+    )
+
+    response = await client.post(
+        "/timelog/import", content=body.encode(), headers={**auth_headers(alice), "Content-Type": "text/csv"}
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"], result["total_hours"], result["tasks_updated"]) == (2, 4, 5, 1)
+    errors = [(error["row"], error["error"]) for error in result["errors"]]
+    assert [row for row, _ in errors] == [4, 5, 6, 7]
+    assert errors[0][1] == "Not authorized to log time for this task"
+    assert errors[1][1] == "Task not found"
+    assert errors[2][1].startswith("hours: ")
+    assert errors[3][1] == "User not found"
+    assert await _actual_hours(session_factory, mine.id) == 5
+    async with session_factory() as db:
+        rollups = (await db.execute(
+            select(TimeLogDailyRollup.user_id, TimeLogDailyRollup.day, TimeLogDailyRollup.hours)
+            .order_by(TimeLogDailyRollup.user_id)
+        )).all()
+    assert rollups == [(alice.id, date(2026, 1, 5), 2), (bob.id, date(2026, 1, 5), 3)]
+
+
+async def test_dry_run_validates_without_writing(client, session_factory):
+    alice, _, mine, _ = await _setup(session_factory)
+    body = f'{{"task_id": {mine.id}, "hours": 2, "date": "2026-01-05"}}\nnot json\n'
+
+    response = await client.post(
+        "/timelog/import?format=ndjson&dry_run=true", content=body.encode(), headers=auth_headers(alice)
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"], result["tasks_updated"], result["dry_run"]) == (1, 1, 0, True)
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count(TimeLog.id))) == 0
+        assert await db.scalar(select(func.count(TimeLogDailyRollup.id))) == 0
+    assert await _actual_hours(session_factory, mine.id) == 0
+
+
+async def test_import_rejects_unknown_formats_and_missing_columns(client, session_factory):
+    alice, *_ = await _setup(session_factory)
+    headers = auth_headers(alice)
+
+    unknown = await client.post("/timelog/import", content=b"x", headers={**headers, "Content-Type": "text/plain"})
+    bad_format = await client.post("/timelog/import?format=xml", content=b"x", headers=headers)
+    no_hours = await client.post("/timelog/import?format=csv", content=b"task_id,date\n1,2026-01-05\n", headers=headers)
+
+    assert unknown.status_code == 415
+    assert bad_format.status_code == 400
+    assert no_hours.status_code == 400
+    assert no_hours.json()["detail"] == "CSV header is missing columns: hours"
+
+
+async def test_batches_accumulate_hours_across_boundaries(session_factory):
+    alice, _, mine, _ = await _setup(session_factory)
+    records = [(n, {"task_id": mine.id, "hours": n, "date": f"2026-01-0{n}"}) for n in range(1, 6)]
+
+    async def stream():
+        for record in records:
+            yield record
+
+    async with session_factory() as db:
+        # Five rows in batches of two: two full batches and a remainder
+        result = await TimeLogImporter(db, alice, batch_size=2).run(stream())
+        await db.commit()
+
+    assert (result["imported"], result["total_hours"], result["tasks_updated"]) == (5, 15, 1)
+    assert await _actual_hours(session_factory, mine.id) == 15
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count(TimeLog.id))) == 5
+        assert await db.scalar(select(func.sum(TimeLogDailyRollup.hours))) == 15
@@ -0,0 +1,128 @@
+"""
+Query count of GET /timelog/: a page is one projected join, however many
+logs, tasks and users there are.
+"""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from app.auth import get_current_user
+from app.database import get_async_db
+from app.main import app
+from app.models import Project, Task, TimeLog, User
+
+pytestmark = pytest.mark.asyncio
+
+USERS = 3
+TASKS = 4
+PAGE_SIZE = 20
+
+
+@pytest_asyncio.fixture
+async def client(session_factory):
+    async with session_factory() as db:
+        admin = User(email="admin@example.com", username="admin", full_name="Admin", hashed_password="x")
+        db.add(admin)
+        await db.commit()
+
+    async def test_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = test_db
+    app.dependency_overrides[get_current_user] = lambda: admin
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def statements(db_engine):
+    """SQL statements executed on the test database."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest_asyncio.fixture
+async def tasks(session_factory):
+    """Tasks assigned round-robin to several users, all in one project."""
+    async with session_factory() as db:
+        users = [
+            User(email=f"user{n}@example.com", username=f"user{n}", full_name=f"User {n}", hashed_password="x")
+            for n in range(USERS)
+        ]
+        db.add_all(users)
+        await db.flush()
+        project = Project(title="Website", owner_id=users[0].id)
+        db.add(project)
+        await db.flush()
+        tasks = [Task(title=f"Task {n}", project_id=project.id, assignee_id=users[n % USERS].id) for n in range(TASKS)]
+        db.add_all(tasks)
+        await db.commit()
+    return tasks
+
+
+async def _add_logs(session_factory, tasks, log_count: int):
+    """Log time on every task, spread over the users and a month."""
+    async with session_factory() as db:
+        db.add_all(
+            TimeLog(
+                task_id=tasks[n % TASKS].id,
+                user_id=tasks[n % USERS].assignee_id,
+                hours=1 + n % 8,
+                description=f"Log {n}",
+                date=datetime(2026, 1, 1) + timedelta(days=n % 30),
+            )
+            for n in range(log_count)
+        )
+        await db.commit()
+
+
+async def _queries_per_page(client, statements, **params) -> tuple:
+    """(statements for the first page, statements for the next page, rows on the first page)"""
+    statements.clear()
+    first = await client.get("/timelog/", params={"limit": PAGE_SIZE, **params})
+    assert first.status_code == 200
+    first_page_queries = len(statements)
+
+    statements.clear()
+    cursor = first.headers["X-Next-Cursor"]
+    second = await client.get("/timelog/", params={"limit": PAGE_SIZE, "cursor": cursor, **params})
+    assert second.status_code == 200
+    return first_page_queries, len(statements), first.json()
+
+
+@pytest.mark.parametrize("log_count", [PAGE_SIZE * 2, PAGE_SIZE * 25])
+async def test_page_costs_one_query(client, session_factory, statements, tasks, log_count):
+    await _add_logs(session_factory, tasks, log_count)
+
+    first, second, rows = await _queries_per_page(client, statements)
+
+    assert (first, second) == (1, 1)
+    assert len(rows) == PAGE_SIZE
+    assert {row["task_title"] for row in rows} == {f"Task {n}" for n in range(TASKS)}
+    assert {row["project_title"] for row in rows} == {"Website"}
+
+
+async def test_query_count_does_not_grow_with_logs(client, session_factory, statements, tasks):
+    filters = {"user_id": tasks[0].assignee_id, "start_date": "2026-01-01"}
+    await _add_logs(session_factory, tasks, PAGE_SIZE * USERS * 2)
+    small = await _queries_per_page(client, statements)
+    filtered_small = await _queries_per_page(client, statements, **filters)
+
+    await _add_logs(session_factory, tasks, PAGE_SIZE * 40)
+    large = await _queries_per_page(client, statements)
+    filtered_large = await _queries_per_page(client, statements, **filters)
+
+    assert small[:2] == large[:2]
+    assert filtered_small[:2] == filtered_large[:2]